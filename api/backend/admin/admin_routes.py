@@ -2,22 +2,123 @@ from flask import Blueprint, jsonify, request
 from backend.db_connection import db
 from mysql.connector import Error
 from flask import current_app
+from datetime import datetime, timedelta
+from backend.admin.partitions import list_partitions, maintain_partitions, RETENTION_POLICY
+from backend.pagination import encode_cursor, decode_cursor, get_page_limit
+from backend.exports import export_format, stream_query
+from backend.admin.metrics_store import metric_history, METRIC_DEFINITIONS
+from backend.admin.ingest import ingest_buffer, INGEST_MAX_BUFFERED
+from backend.admin.alert_engine import evaluate_alerts
+from backend.push import push_bus
 
 admin_routes = Blueprint('admin_routes', __name__)
 
 
 
+# Filters shared by the audit log endpoints:
+#   severity, status, serverID  - exact matches (covered by idx_eventlog_filters)
+#   from, to                    - ISO timestamps; lets MySQL prune EventLog partitions
+#   days                        - shorthand for from = now - N days
+#   q                           - full-text search over the log message (EventLog_Search)
+def _audit_log_filters():
+    """
+    Build the WHERE conditions and params for the audit log filters in the
+    query string. Returns (conditions, params, join, error_message).
+    """
+    conditions = []
+    params = []
+    join = ""
+
+    for arg, column in (('severity', 'el.severity'), ('status', 'el.status'), ('serverID', 'el.serverID')):
+        value = request.args.get(arg)
+        if value:
+            conditions.append(f"{column} = %s")
+            params.append(value)
+
+    try:
+        start = request.args.get('from')
+        end = request.args.get('to')
+        days = request.args.get('days', type=int)
+        if days:
+            conditions.append("el.logTimestamp >= %s")
+            params.append(datetime.now() - timedelta(days=days))
+        if start:
+            conditions.append("el.logTimestamp >= %s")
+            params.append(datetime.fromisoformat(start))
+        if end:
+            conditions.append("el.logTimestamp < %s")
+            params.append(datetime.fromisoformat(end))
+    except ValueError:
+        return None, None, None, "from/to must be ISO timestamps"
+
+    search = _fulltext_terms(request.args.get('q', ''))
+    if search:
+        join = """
+            JOIN EventLog_Search els
+                ON els.logID = el.logID AND els.logTimestamp = el.logTimestamp
+        """
+        conditions.append("MATCH(els.message) AGAINST (%s IN BOOLEAN MODE)")
+        params.append(search)
+
+    return conditions, params, join, None
+
+
+def _fulltext_terms(text):
+    """Turn free text into a BOOLEAN MODE query where every word must prefix-match."""
+    words = []
+    for word in text.split():
+        word = ''.join(ch for ch in word if ch.isalnum() or ch in "_-.")
+        if word:
+            words.append(f"+{word}*")
+    return ' '.join(words)
+
+
+
 # GET /admin/audit-logs
 @admin_routes.route('/audit-logs', methods=['GET'])
 def get_audit_logs():
     """
     Return audit logs for authentication, event activity, and system actions.
     Uses EventLog + Servers tables.
+
+    Keyset paginated on (logTimestamp, logID), newest first:
+      ?limit=N (default 100, max 500)
+      ?cursor=<next_cursor from the previous page>
+    plus the filters described above _audit_log_filters.
+
+    The first page (no cursor) also carries the total number of matching
+    rows; without a text search that count is answered from
+    idx_eventlog_filters alone.
     """
     cursor = None
     try:
+        conditions, params, join, error = _audit_log_filters()
+        if error:
+            return jsonify({"error": error}), 400
+
+        limit = get_page_limit(default=100, maximum=500)
+        token = request.args.get('cursor')
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if token:
+            position = decode_cursor(token)
+            if not position or len(position) != 2:
+                return jsonify({"error": "Invalid cursor"}), 400
+            page_conditions.append(
+                "(el.logTimestamp < %s OR (el.logTimestamp = %s AND el.logID < %s))"
+            )
+            page_params.extend([position[0], position[0], position[1]])
+
         cursor = db.cursor(dictionary=True)
-        query = """
+
+        total = None
+        if not token:
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor.execute(f"SELECT COUNT(*) AS total FROM EventLog el {join} {where}", params)
+            total = cursor.fetchone()["total"]
+
+        where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+        query = f"""
             SELECT 
                 el.logID,
                 el.logTimestamp,
@@ -28,13 +129,26 @@ def get_audit_logs():
                 s.status AS serverStatus,
                 s.lastUpdated AS serverLastUpdated
             FROM EventLog el
+            {join}
             LEFT JOIN Servers s ON el.serverID = s.serverID
-            ORDER BY el.logTimestamp DESC
-            LIMIT 500
+            {where}
+            ORDER BY el.logTimestamp DESC, el.logID DESC
+            LIMIT %s
         """
-        cursor.execute(query)
+        cursor.execute(query, page_params + [limit + 1])
         logs = cursor.fetchall()
-        return jsonify(logs), 200
+
+        next_cursor = None
+        if len(logs) > limit:
+            logs = logs[:limit]
+            last = logs[-1]
+            next_cursor = encode_cursor(last["logTimestamp"], last["logID"])
+
+        return jsonify({
+            "logs": logs,
+            "next_cursor": next_cursor,
+            "total": total,
+        }), 200
     except Error as e:
         current_app.logger.error(f"Error fetching audit logs: {e}")
         return jsonify({"error": "Error fetching audit logs"}), 500
@@ -44,17 +158,151 @@ def get_audit_logs():
 
 
 
+# GET /admin/audit-logs/export
+@admin_routes.route('/audit-logs/export', methods=['GET'])
+def export_audit_logs():
+    """
+    Stream every audit log matching the /admin/audit-logs filters as
+    ?format=csv (default) or ?format=ndjson, newest first, without paging.
+    """
+    try:
+        conditions, params, join, error = _audit_log_filters()
+        if error:
+            return jsonify({"error": error}), 400
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"""
+            SELECT 
+                el.logID,
+                el.logTimestamp,
+                el.status,
+                el.severity,
+                el.serverID,
+                s.ipAddress,
+                s.status AS serverStatus,
+                s.lastUpdated AS serverLastUpdated
+            FROM EventLog el
+            {join}
+            LEFT JOIN Servers s ON el.serverID = s.serverID
+            {where}
+            ORDER BY el.logTimestamp DESC, el.logID DESC
+        """
+        return stream_query(query, params, export_format() or "csv", "audit_logs")
+    except Error as e:
+        current_app.logger.error(f"Error exporting audit logs: {e}")
+        return jsonify({"error": "Error exporting audit logs"}), 500
+
+
+
+# GET /admin/audit-logs/facets
+@admin_routes.route('/audit-logs/facets', methods=['GET'])
+def get_audit_log_facets():
+    """
+    Return the distinct severities, statuses and servers in EventLog with
+    their row counts, for the filter dropdowns. Accepts the same time range
+    filters as /admin/audit-logs.
+    """
+    cursor = None
+    try:
+        conditions, params, join, error = _audit_log_filters()
+        if error:
+            return jsonify({"error": error}), 400
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor = db.cursor(dictionary=True)
+        facets = {}
+        for name, column in (('severity', 'el.severity'), ('status', 'el.status'), ('serverID', 'el.serverID')):
+            cursor.execute(f"""
+                SELECT {column} AS value, COUNT(*) AS count
+                FROM EventLog el
+                {join}
+                {where}
+                GROUP BY {column}
+                ORDER BY {column}
+            """, params)
+            facets[name] = cursor.fetchall()
+        return jsonify(facets), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching audit log facets: {e}")
+        return jsonify({"error": "Error fetching audit log facets"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
+# GET /admin/servers
+@admin_routes.route('/servers', methods=['GET'])
+def get_servers():
+    """
+    Return every server with its current status and total log count.
+    The per-server counts come from idx_eventlog_server.
+    """
+    cursor = None
+    try:
+        cursor = db.cursor(dictionary=True)
+        query = """
+            SELECT
+                s.serverID,
+                s.ipAddress,
+                s.status,
+                s.lastUpdated,
+                COALESCE(lc.log_count, 0) AS log_count
+            FROM Servers s
+            LEFT JOIN (
+                SELECT serverID, COUNT(*) AS log_count
+                FROM EventLog
+                GROUP BY serverID
+            ) lc ON lc.serverID = s.serverID
+            ORDER BY s.serverID
+        """
+        cursor.execute(query)
+        servers = cursor.fetchall()
+        return jsonify(servers), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching servers: {e}")
+        return jsonify({"error": "Error fetching servers"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
 # GET /admin/alerts
 @admin_routes.route('/alerts', methods=['GET'])
 def get_unresolved_alerts():
     """
-    Return unresolved alerts (isSolved = FALSE).
+    Return unresolved alerts (isSolved = FALSE), newest first.
     Uses Alerts table.
+
+    Optional filters: ?alertType=, ?eventID=, ?studentID=
+    Keyset paginated on alertID: ?limit=N (default 100, max 500), ?cursor=
+    The first page also carries the total and per-type counts of the
+    matching unresolved alerts, both read from the isSolved-led indexes.
     """
     cursor = None
     try:
+        conditions = ["isSolved = FALSE"]
+        params = []
+        for arg in ('alertType', 'eventID', 'studentID'):
+            value = request.args.get(arg)
+            if value:
+                conditions.append(f"{arg} = %s")
+                params.append(value)
+
+        limit = get_page_limit(default=100, maximum=500)
+        token = request.args.get('cursor')
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if token:
+            position = decode_cursor(token)
+            if not position:
+                return jsonify({"error": "Invalid cursor"}), 400
+            page_conditions.append("alertID < %s")
+            page_params.append(position[0])
+
         cursor = db.cursor(dictionary=True)
-        query = """
+        query = f"""
             SELECT 
                 alertID,
                 eventID,
@@ -63,12 +311,37 @@ def get_unresolved_alerts():
                 isSolved,
                 description
             FROM Alerts
-            WHERE isSolved = FALSE
+            WHERE {' AND '.join(page_conditions)}
             ORDER BY alertID DESC
+            LIMIT %s
         """
-        cursor.execute(query)
+        cursor.execute(query, page_params + [limit + 1])
         alerts = cursor.fetchall()
-        return jsonify(alerts), 200
+
+        next_cursor = None
+        if len(alerts) > limit:
+            alerts = alerts[:limit]
+            next_cursor = encode_cursor(alerts[-1]["alertID"])
+
+        total = None
+        counts_by_type = None
+        if not token:
+            cursor.execute(f"""
+                SELECT alertType, COUNT(*) AS count
+                FROM Alerts
+                WHERE {' AND '.join(conditions)}
+                GROUP BY alertType
+                ORDER BY count DESC
+            """, params)
+            counts_by_type = cursor.fetchall()
+            total = sum(row["count"] for row in counts_by_type)
+
+        return jsonify({
+            "alerts": alerts,
+            "next_cursor": next_cursor,
+            "total": total,
+            "counts_by_type": counts_by_type,
+        }), 200
     except Error as e:
         current_app.logger.error(f"Error fetching alerts: {e}")
         return jsonify({"error": "Error fetching alerts"}), 500
@@ -78,6 +351,77 @@ def get_unresolved_alerts():
 
 
 
+# POST /admin/alerts/resolve
+@admin_routes.route('/alerts/resolve', methods=['POST'])
+def resolve_alerts_bulk():
+    """
+    Resolve many alerts with a single UPDATE, either by ID list
+      {"alert_ids": [1, 2, 3]}
+    or by filter (at least one of alertType, eventID, studentID)
+      {"filter": {"alertType": "room_change", "eventID": 70000001}}
+    """
+    cursor = None
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Body must be a JSON object"}), 400
+        alert_ids = data.get("alert_ids")
+        filters = data.get("filter") or {}
+        if not isinstance(filters, dict):
+            return jsonify({"error": "filter must be an object"}), 400
+
+        if alert_ids:
+            if not isinstance(alert_ids, list):
+                return jsonify({"error": "alert_ids must be a list"}), 400
+            conditions = [f"a.alertID IN ({', '.join(['%s'] * len(alert_ids))})"]
+            params = [int(alert_id) for alert_id in alert_ids]
+        else:
+            conditions = []
+            params = []
+            for field in ('alertType', 'eventID', 'studentID'):
+                if filters.get(field) is not None:
+                    conditions.append(f"a.{field} = %s")
+                    params.append(filters[field])
+            if not conditions:
+                return jsonify({"error": "Provide alert_ids or a filter"}), 400
+
+        cursor = db.cursor(dictionary=True)
+        # Alert engine mirrors: close their System_Alerts row in the same transaction
+        cursor.execute(f"""
+            UPDATE System_Alerts sa
+            JOIN Alerts a ON a.systemAlertID = sa.alertID
+            SET sa.resolved = TRUE, sa.resolvedAt = NOW()
+            WHERE sa.resolved = FALSE
+              AND a.isSolved = FALSE
+              AND {' AND '.join(conditions)}
+        """, params)
+        system_resolved = cursor.rowcount
+
+        cursor.execute(f"""
+            UPDATE Alerts a
+            SET a.isSolved = TRUE
+            WHERE a.isSolved = FALSE
+              AND {' AND '.join(conditions)}
+        """, params)
+        resolved = cursor.rowcount
+        db.commit()
+
+        if resolved:
+            push_bus.publish("alerts")
+        if system_resolved:
+            push_bus.publish("system-alerts")
+        return jsonify({"resolved": resolved}), 200
+    except (ValueError, TypeError):
+        return jsonify({"error": "alert_ids must be integers"}), 400
+    except Error as e:
+        current_app.logger.error(f"Error resolving alerts: {e}")
+        return jsonify({"error": "Error resolving alerts"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
 # PUT /admin/alerts/<alert_id>
 @admin_routes.route('/alerts/<int:alert_id>', methods=['PUT'])
 def resolve_alert(alert_id):
@@ -87,6 +431,16 @@ def resolve_alert(alert_id):
     cursor = None
     try:
         cursor = db.cursor(dictionary=True)
+        # An alert engine mirror also closes its System_Alerts row
+        cursor.execute("""
+            UPDATE System_Alerts sa
+            JOIN Alerts a ON a.systemAlertID = sa.alertID
+            SET sa.resolved = TRUE, sa.resolvedAt = NOW()
+            WHERE a.alertID = %s
+              AND sa.resolved = FALSE
+        """, (alert_id,))
+        system_resolved = cursor.rowcount
+
         query = """
             UPDATE Alerts
             SET isSolved = TRUE
@@ -98,6 +452,9 @@ def resolve_alert(alert_id):
         if cursor.rowcount == 0:
             return jsonify({"error": "Alert not found"}), 404
 
+        push_bus.publish("alerts")
+        if system_resolved:
+            push_bus.publish("system-alerts")
         return jsonify({"message": "Alert resolved successfully"}), 200
     except Error as e:
         current_app.logger.error(f"Error resolving alert {alert_id}: {e}")
@@ -164,14 +521,15 @@ def get_system_metrics():
         server_stats = cursor.fetchone() or {}
 
         # 2) Log stats for the last hour
+        # (bound computed here as a constant so EventLog partitions get pruned)
         logs_query = """
             SELECT 
                 COUNT(*) AS total_logs_last_hour,
                 SUM(CASE WHEN severity = 'ERROR' THEN 1 ELSE 0 END) AS error_logs_last_hour
             FROM EventLog
-            WHERE logTimestamp >= NOW() - INTERVAL 1 HOUR
+            WHERE logTimestamp >= %s
         """
-        cursor.execute(logs_query)
+        cursor.execute(logs_query, (datetime.now() - timedelta(hours=1),))
         log_stats = cursor.fetchone() or {}
 
         total_logs = log_stats.get("total_logs_last_hour") or 0
@@ -197,4 +555,254 @@ def get_system_metrics():
         return jsonify({"error": "Error fetching system metrics"}), 500
     finally:
         if cursor:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+
+
+
+# GET /admin/partitions
+@admin_routes.route('/partitions', methods=['GET'])
+def get_partitions():
+    """
+    Return the monthly partitions of every log table managed by the
+    retention policy, with MySQL's row estimate for each one.
+    """
+    cursor = None
+    try:
+        cursor = db.cursor(dictionary=True)
+        result = {}
+        for table, (column, retain_months, archive) in RETENTION_POLICY.items():
+            result[table] = {
+                "partition_column": column,
+                "retain_months": retain_months,
+                "archived": archive,
+                "partitions": list_partitions(cursor, table),
+            }
+        return jsonify(result), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching partitions: {e}")
+        return jsonify({"error": "Error fetching partitions"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
+# POST /admin/partitions/maintain
+@admin_routes.route('/partitions/maintain', methods=['POST'])
+def run_partition_maintenance():
+    """
+    Create upcoming monthly partitions and drop/archive expired ones.
+    Pass ?retention=false to only create partitions.
+    """
+    try:
+        apply_retention = request.args.get('retention', 'true').lower() == 'true'
+        summary = maintain_partitions(apply_retention=apply_retention)
+        return jsonify(summary), 200
+    except Error as e:
+        current_app.logger.error(f"Error running partition maintenance: {e}")
+        return jsonify({"error": "Error running partition maintenance"}), 500
+
+
+
+# GET /admin/metrics/history
+@admin_routes.route('/metrics/history', methods=['GET'])
+def get_metric_history():
+    """
+    Return a time series for one metric from the cheapest storage tier
+    (raw System_Metrics or the 1m/1h/1d rollups) that covers the range.
+      ?metric=<name>  required
+      ?from=, ?to=    ISO timestamps (default: the last hour)
+      ?step=<seconds> point spacing (default: about 300 points over the range)
+    """
+    cursor = None
+    try:
+        metric = request.args.get('metric')
+        if not metric:
+            return jsonify({
+                "error": "metric is required",
+                "metrics": sorted(METRIC_DEFINITIONS.keys()),
+            }), 400
+
+        try:
+            end = datetime.fromisoformat(request.args['to']) if request.args.get('to') else datetime.now()
+            start = datetime.fromisoformat(request.args['from']) if request.args.get('from') else end - timedelta(hours=1)
+        except ValueError:
+            return jsonify({"error": "from/to must be ISO timestamps"}), 400
+        if start >= end:
+            return jsonify({"error": "from must be before to"}), 400
+
+        step = request.args.get('step', type=int)
+        if not step or step <= 0:
+            step = max(1, int((end - start).total_seconds() // 300))
+
+        cursor = db.cursor(dictionary=True)
+        tier, step, points = metric_history(cursor, metric, start, end, step)
+
+        unit = METRIC_DEFINITIONS.get(metric, (None,))[0]
+        return jsonify({
+            "metric": metric,
+            "unit": unit,
+            "tier": tier,
+            "step": step,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "points": points,
+        }), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching metric history: {e}")
+        return jsonify({"error": "Error fetching metric history"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
+# Longest accepted value per ingested column (Servers / EventLog sizes), so
+# one bad item is refused with its request instead of failing a whole flush
+INGEST_FIELD_LIMITS = {"status": 50, "severity": 50, "ipAddress": 45}
+
+
+def _ingest_string(item, field, kind, default=None):
+    """item[field] as a string within INGEST_FIELD_LIMITS, or default when absent."""
+    value = item.get(field)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{field} in {kind} must be a string")
+    if len(value) > INGEST_FIELD_LIMITS[field]:
+        raise ValueError(f"{field} in {kind} must be at most {INGEST_FIELD_LIMITS[field]} characters")
+    return value
+
+
+def _parse_ingest_items(items, kind):
+    """
+    Validate heartbeats/log entries from an ingest batch and normalise them
+    to the column names used by the buffer. Raises ValueError on bad input.
+    """
+    if not isinstance(items, list):
+        raise ValueError(f"{kind} must be a list")
+
+    now = datetime.now().replace(microsecond=0)
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or "serverID" not in item:
+            raise ValueError(f"every item in {kind} needs a serverID")
+        if isinstance(item["serverID"], bool) or not isinstance(item["serverID"], (int, str)):
+            raise ValueError(f"serverID in {kind} must be an integer")
+        if item.get("timestamp") is not None and not isinstance(item["timestamp"], str):
+            raise ValueError(f"timestamp in {kind} must be an ISO string")
+        timestamp = datetime.fromisoformat(item["timestamp"]) if item.get("timestamp") else now
+        if kind == "heartbeats":
+            parsed.append({
+                "serverID": int(item["serverID"]),
+                "status": _ingest_string(item, "status", kind, default="active"),
+                "ipAddress": _ingest_string(item, "ipAddress", kind),
+                "lastUpdated": timestamp,
+            })
+        else:
+            if not item.get("status") and item.get("message") is not None:
+                item = {**item, "status": item["message"]}
+            parsed.append({
+                "serverID": int(item["serverID"]),
+                "status": _ingest_string(item, "status", kind),
+                "severity": _ingest_string(item, "severity", kind, default="info"),
+                "logTimestamp": timestamp,
+            })
+    return parsed
+
+
+
+# POST /admin/ingest
+@admin_routes.route('/ingest', methods=['POST'])
+def ingest_server_events():
+    """
+    Accept a batch of heartbeats and/or log entries from servers:
+      {"heartbeats": [{"serverID", "status", "ipAddress", "timestamp"}],
+       "logs": [{"serverID", "status", "severity", "timestamp"}]}
+    Items are buffered and written in the background (202). When the
+    buffer is full the whole batch is refused with 429 and Retry-After.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        heartbeats = _parse_ingest_items(data.get("heartbeats", []), "heartbeats")
+        logs = _parse_ingest_items(data.get("logs", []), "logs")
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not heartbeats and not logs:
+        return jsonify({"error": "Nothing to ingest"}), 400
+
+    if not ingest_buffer.offer(heartbeats, logs):
+        response = jsonify({"error": "Ingest buffer full, retry later"})
+        response.headers["Retry-After"] = "1"
+        return response, 429
+
+    return jsonify({
+        "accepted_heartbeats": len(heartbeats),
+        "accepted_logs": len(logs),
+    }), 202
+
+
+
+# GET /admin/ingest/stats
+@admin_routes.route('/ingest/stats', methods=['GET'])
+def get_ingest_stats():
+    """Return counters for the ingest buffer (accepted / rejected / flushed / dropped)."""
+    return jsonify({
+        **ingest_buffer.stats,
+        "buffered": ingest_buffer.buffered(),
+        "capacity": INGEST_MAX_BUFFERED,
+    }), 200
+
+
+
+# GET /admin/system-alerts
+@admin_routes.route('/system-alerts', methods=['GET'])
+def get_system_alerts():
+    """
+    Return alerts raised by the alert engine (System_Alerts).
+    ?resolved=true to list resolved ones instead of open ones.
+    """
+    cursor = None
+    try:
+        resolved = request.args.get('resolved', 'false').lower() == 'true'
+        cursor = db.cursor(dictionary=True)
+        query = """
+            SELECT
+                alertID,
+                alertType,
+                alertKey,
+                eventID,
+                severity,
+                message,
+                triggeredAt,
+                resolved,
+                resolvedAt
+            FROM System_Alerts
+            WHERE resolved = %s
+            ORDER BY triggeredAt DESC
+            LIMIT 500
+        """
+        cursor.execute(query, (resolved,))
+        alerts = cursor.fetchall()
+        return jsonify(alerts), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching system alerts: {e}")
+        return jsonify({"error": "Error fetching system alerts"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+
+# POST /admin/system-alerts/evaluate
+@admin_routes.route('/system-alerts/evaluate', methods=['POST'])
+def run_alert_evaluation():
+    """Run the alert rules now instead of waiting for the next scheduled pass."""
+    try:
+        # Waits for a scheduled pass that is already running, then runs again
+        evaluate_alerts(wait=True)
+        return jsonify({"message": "Alert rules evaluated"}), 200
+    except Error as e:
+        current_app.logger.error(f"Error evaluating alerts: {e}")
+        return jsonify({"error": "Error evaluating alerts"}), 500
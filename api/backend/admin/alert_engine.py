@@ -0,0 +1,366 @@
+#------------------------------------------------------------
+# Incremental rule evaluation feeding System_Alerts (and Alerts
+# for the event-related rules)
+#------------------------------------------------------------
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from backend.db_connection import db
+from backend.push import push_bus
+
+
+# Seconds between two evaluation runs
+ALERT_INTERVAL = int(os.getenv("ALERT_INTERVAL_SECONDS", "5"))
+
+# Error rate over EventLog entries in a sliding window
+ERROR_RATE_WINDOW = timedelta(minutes=5)
+ERROR_RATE_MIN_LOGS = 20
+ERROR_RATE_WARNING = 0.10
+ERROR_RATE_CRITICAL = 0.25
+
+# How far back the metric rule looks on its very first run
+METRICS_BOOTSTRAP_WINDOW = timedelta(minutes=10)
+
+# System_Metrics.status -> System_Alerts.severity
+METRIC_SEVERITY = {"warning": "medium", "critical": "critical"}
+
+# (logTimestamp, is_error) for the EventLog rows inside ERROR_RATE_WINDOW
+_error_window = deque()
+_error_window_loaded = False
+
+# Push topics touched by the current rule, published once it commits
+_changed_topics = set()
+
+# Held for a whole evaluation run, so the scheduled job and
+# POST /admin/system-alerts/evaluate never read the same watermarks twice
+_evaluate_lock = threading.Lock()
+
+
+def _get_watermark(cursor, source):
+    cursor.execute(
+        "SELECT lastID, lastTimestamp FROM Alert_Watermarks WHERE source = %s",
+        (source,),
+    )
+    return cursor.fetchone()
+
+
+def _set_watermark(cursor, source, last_id=None, last_timestamp=None):
+    cursor.execute("""
+        INSERT INTO Alert_Watermarks (source, lastID, lastTimestamp)
+        VALUES (%s, %s, %s) AS new
+        ON DUPLICATE KEY UPDATE
+            lastID = new.lastID,
+            lastTimestamp = new.lastTimestamp
+    """, (source, last_id, last_timestamp))
+
+
+def raise_alert(cursor, key, alert_type, severity, message, event_id=None):
+    """
+    Open an alert for `key`, or refresh the severity/message of the one
+    already open. Event-related alerts are mirrored into Alerts the first
+    time they open so they show up in /admin/alerts.
+    """
+    cursor.execute("""
+        INSERT INTO System_Alerts (alertType, alertKey, eventID, severity, message, triggeredAt)
+        VALUES (%s, %s, %s, %s, %s, NOW()) AS new
+        ON DUPLICATE KEY UPDATE
+            severity = new.severity,
+            message = new.message
+    """, (alert_type, key, event_id, severity, message))
+    opened = cursor.rowcount == 1
+    if cursor.rowcount:
+        _changed_topics.add("system-alerts")
+
+    if opened and event_id is not None:
+        cursor.execute("""
+            INSERT INTO Alerts (eventID, alertType, isSolved, description, systemAlertID)
+            VALUES (%s, %s, FALSE, %s, %s)
+        """, (event_id, alert_type, message, cursor.lastrowid))
+        _changed_topics.add("alerts")
+    return opened
+
+
+def resolve_alert_keys(cursor, keys):
+    """Close the open alerts for these keys (and their Alerts mirror rows)."""
+    if not keys:
+        return 0
+    placeholders = ', '.join(['%s'] * len(keys))
+    cursor.execute(f"""
+        SELECT alertID
+        FROM System_Alerts
+        WHERE openKey IN ({placeholders})
+          AND eventID IS NOT NULL
+    """, list(keys))
+    mirrored = [row["alertID"] for row in cursor.fetchall()]
+
+    cursor.execute(f"""
+        UPDATE System_Alerts
+        SET resolved = TRUE, resolvedAt = NOW()
+        WHERE openKey IN ({placeholders})
+    """, list(keys))
+    resolved = cursor.rowcount
+    if resolved:
+        _changed_topics.add("system-alerts")
+
+    if mirrored:
+        cursor.execute(f"""
+            UPDATE Alerts
+            SET isSolved = TRUE
+            WHERE systemAlertID IN ({', '.join(['%s'] * len(mirrored))})
+              AND isSolved = FALSE
+        """, mirrored)
+        if cursor.rowcount:
+            _changed_topics.add("alerts")
+    return resolved
+
+
+def _open_alerts(cursor, alert_type):
+    cursor.execute("""
+        SELECT alertKey, eventID
+        FROM System_Alerts
+        WHERE alertType = %s AND resolved = FALSE
+    """, (alert_type,))
+    return cursor.fetchall()
+
+
+def evaluate_metric_thresholds(cursor, now):
+    """Alert on the latest sample of every metric that crossed its thresholds."""
+    watermark = _get_watermark(cursor, "System_Metrics")
+    last_id = watermark["lastID"] if watermark else 0
+
+    cursor.execute("""
+        SELECT metricID, metricName, metricValue, status, thresholdWarning, thresholdCritical
+        FROM System_Metrics
+        WHERE timestamp >= %s
+          AND metricID > %s
+        ORDER BY metricID
+    """, (now - METRICS_BOOTSTRAP_WINDOW, last_id))
+    rows = cursor.fetchall()
+    if not rows:
+        return
+
+    latest = {}
+    for row in rows:
+        latest[row["metricName"]] = row
+
+    recovered = []
+    for name, row in latest.items():
+        key = f"metric:{name}"
+        if row["status"] in METRIC_SEVERITY:
+            threshold = row["thresholdCritical"] if row["status"] == "critical" else row["thresholdWarning"]
+            raise_alert(
+                cursor, key, "metric_threshold", METRIC_SEVERITY[row["status"]],
+                f"{name} is {row['metricValue']} (threshold {threshold})",
+            )
+        else:
+            recovered.append(key)
+    resolve_alert_keys(cursor, recovered)
+
+    _set_watermark(cursor, "System_Metrics", last_id=rows[-1]["metricID"])
+
+
+def evaluate_error_rate(cursor, now):
+    """Alert when the share of error logs in the sliding window gets too high."""
+    global _error_window_loaded
+    window_start = now - ERROR_RATE_WINDOW
+
+    watermark = _get_watermark(cursor, "EventLog")
+    # After a restart the in-memory window is empty, so reload the whole window once
+    last_id = watermark["lastID"] if watermark and _error_window_loaded else 0
+
+    cursor.execute("""
+        SELECT logID, logTimestamp, severity
+        FROM EventLog
+        WHERE logTimestamp >= %s
+          AND logID > %s
+        ORDER BY logID
+    """, (window_start, last_id))
+    rows = cursor.fetchall()
+    _error_window_loaded = True
+
+    for row in rows:
+        _error_window.append((row["logTimestamp"], (row["severity"] or "").lower() == "error"))
+    while _error_window and _error_window[0][0] < window_start:
+        _error_window.popleft()
+
+    total = len(_error_window)
+    errors = sum(1 for _, is_error in _error_window if is_error)
+    rate = errors / total if total else 0.0
+
+    if total >= ERROR_RATE_MIN_LOGS and rate >= ERROR_RATE_WARNING:
+        severity = "critical" if rate >= ERROR_RATE_CRITICAL else "medium"
+        raise_alert(
+            cursor, "error_rate", "error_rate", severity,
+            f"{errors} of {total} log entries in the last "
+            f"{int(ERROR_RATE_WINDOW.total_seconds() // 60)} minutes are errors ({rate:.0%})",
+        )
+    else:
+        resolve_alert_keys(cursor, ["error_rate"])
+
+    if rows:
+        _set_watermark(cursor, "EventLog", last_id=rows[-1]["logID"])
+
+
+def evaluate_capacity(cursor, now):
+    """
+    Alert on events with more confirmed RSVPs than capacity. Only events
+    whose RSVPs were added or changed status since the last run
+    (RSVPs.lastUpdated), events that were edited (Events.lastUpdated, which
+    covers capacity changes) and events with an open alert are recounted.
+    """
+    watermark = _get_watermark(cursor, "capacity")
+    open_alerts = _open_alerts(cursor, "over_capacity")
+
+    if watermark is None:
+        cursor.execute("""
+            SELECT eventID, lastUpdated FROM Events WHERE capacity IS NOT NULL
+            UNION ALL
+            SELECT eventID, MAX(lastUpdated) FROM RSVPs GROUP BY eventID
+        """)
+    else:
+        cursor.execute("""
+            SELECT eventID, lastUpdated FROM Events WHERE lastUpdated >= %s
+            UNION ALL
+            SELECT eventID, lastUpdated FROM RSVPs WHERE lastUpdated >= %s
+        """, (watermark["lastTimestamp"], watermark["lastTimestamp"]))
+    changed = cursor.fetchall()
+    last_updated = max((row["lastUpdated"] for row in changed if row["lastUpdated"]),
+                       default=watermark["lastTimestamp"] if watermark else None)
+
+    event_ids = {row["eventID"] for row in changed}
+    event_ids |= {row["eventID"] for row in open_alerts if row["eventID"]}
+
+    if event_ids:
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        cursor.execute(f"""
+            SELECT e.eventID, e.name, e.capacity, COALESCE(r.confirmed, 0) AS confirmed
+            FROM Events e
+            LEFT JOIN (
+                SELECT eventID, COUNT(*) AS confirmed
+                FROM RSVPs
+                WHERE status = 'confirmed'
+                  AND eventID IN ({placeholders})
+                GROUP BY eventID
+            ) r ON r.eventID = e.eventID
+            WHERE e.eventID IN ({placeholders})
+        """, list(event_ids) * 2)
+        counts = {row["eventID"]: row for row in cursor.fetchall()}
+
+        recovered = []
+        for event_id in event_ids:
+            key = f"capacity:{event_id}"
+            row = counts.get(event_id)
+            if row and row["capacity"] is not None and row["confirmed"] > row["capacity"]:
+                raise_alert(
+                    cursor, key, "over_capacity", "high",
+                    f"{row['name']} has {row['confirmed']} confirmed RSVPs for {row['capacity']} spots",
+                    event_id=event_id,
+                )
+            else:
+                recovered.append(key)
+        resolve_alert_keys(cursor, recovered)
+
+    if last_updated is not None:
+        _set_watermark(cursor, "capacity", last_timestamp=last_updated)
+
+
+def evaluate_room_conflicts(cursor, now):
+    """
+    Alert on upcoming events booked into the same room at overlapping
+    times. Only events changed since the last run (Events.lastUpdated), and
+    those in an open conflict, are checked.
+    """
+    watermark = _get_watermark(cursor, "Events")
+    open_alerts = _open_alerts(cursor, "room_conflict")
+
+    if watermark is None:
+        cursor.execute("SELECT eventID, lastUpdated FROM Events WHERE endDateTime >= %s", (now,))
+    else:
+        cursor.execute(
+            "SELECT eventID, lastUpdated FROM Events WHERE lastUpdated >= %s",
+            (watermark["lastTimestamp"],),
+        )
+    changed = cursor.fetchall()
+    last_updated = max((row["lastUpdated"] for row in changed if row["lastUpdated"]),
+                       default=watermark["lastTimestamp"] if watermark else None)
+
+    event_ids = {row["eventID"] for row in changed}
+    for alert in open_alerts:
+        event_ids.update(int(part) for part in alert["alertKey"].split(":")[1:])
+
+    if event_ids:
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        cursor.execute(f"""
+            SELECT
+                e1.eventID AS event1_id,
+                e1.name AS event1_name,
+                e2.eventID AS event2_id,
+                e2.name AS event2_name,
+                e1.buildingName,
+                e1.roomNumber
+            FROM Events e1
+            JOIN Events e2
+                ON e2.buildingName = e1.buildingName
+                AND e2.roomNumber = e1.roomNumber
+                AND e2.eventID != e1.eventID
+                AND e2.startDateTime < e1.endDateTime
+                AND e2.endDateTime > e1.startDateTime
+            WHERE e1.eventID IN ({placeholders})
+              AND e1.endDateTime >= %s
+        """, list(event_ids) + [now])
+
+        conflicts = set()
+        for row in cursor.fetchall():
+            first, second = sorted((row["event1_id"], row["event2_id"]))
+            key = f"room_conflict:{first}:{second}"
+            if key in conflicts:
+                continue
+            conflicts.add(key)
+            raise_alert(
+                cursor, key, "room_conflict", "high",
+                f"{row['event1_name']} and {row['event2_name']} are both booked in "
+                f"{row['buildingName']} {row['roomNumber']} at overlapping times",
+                event_id=first,
+            )
+
+        # Open conflicts touching a re-checked event that no longer overlap
+        stale = [
+            alert["alertKey"] for alert in open_alerts
+            if alert["alertKey"] not in conflicts
+        ]
+        resolve_alert_keys(cursor, stale)
+
+    if last_updated is not None:
+        _set_watermark(cursor, "Events", last_timestamp=last_updated)
+
+
+RULES = [
+    evaluate_metric_thresholds,
+    evaluate_error_rate,
+    evaluate_capacity,
+    evaluate_room_conflicts,
+]
+
+
+def evaluate_alerts(wait=False):
+    """
+    Run every rule once over the data that arrived since the previous run.
+    If a run is already in progress, skip (the scheduled job) or wait for
+    it to finish and run again (`wait`). Returns whether the rules ran.
+    """
+    if not _evaluate_lock.acquire(blocking=wait):
+        return False
+    now = datetime.now()
+    cursor = db.get_db().cursor()
+    try:
+        for rule in RULES:
+            _changed_topics.clear()
+            rule(cursor, now)
+            db.get_db().commit()
+            push_bus.publish_many(_changed_topics)
+    finally:
+        _changed_topics.clear()
+        cursor.close()
+        _evaluate_lock.release()
+    return True
@@ -0,0 +1,143 @@
+#------------------------------------------------------------
+# Buffered ingestion of server heartbeats and log entries
+#------------------------------------------------------------
+import atexit
+import os
+import threading
+from backend.db_connection import db
+
+
+# Items held in memory before /admin/ingest starts answering 429
+INGEST_MAX_BUFFERED = int(os.getenv("INGEST_MAX_BUFFERED", "50000"))
+# Flush as soon as this many items are waiting...
+INGEST_FLUSH_SIZE = int(os.getenv("INGEST_FLUSH_SIZE", "1000"))
+# ...or after this many seconds, whichever comes first
+INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "1.0"))
+
+# Rows per multi-row INSERT statement
+INSERT_CHUNK_SIZE = 1000
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+class IngestBuffer:
+    """
+    Collects heartbeats and log entries from the ingest endpoint and writes
+    them in the background: heartbeats are coalesced to one Servers upsert
+    per server, log entries become multi-row EventLog inserts.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._heartbeats = {}
+        self._heartbeat_count = 0
+        self._logs = []
+        self.stats = {"accepted": 0, "rejected": 0, "flushed": 0, "dropped": 0}
+
+    def init_app(self, app):
+        self.app = app
+        atexit.register(self._flush_on_exit)
+
+    def buffered(self):
+        return self._heartbeat_count + len(self._logs)
+
+    def offer(self, heartbeats, logs):
+        """
+        Queue a batch. Returns False without queueing anything when the
+        buffer cannot take the whole batch, so the caller can push back.
+        """
+        incoming = len(heartbeats) + len(logs)
+        with self._lock:
+            if self.buffered() + incoming > INGEST_MAX_BUFFERED:
+                self.stats["rejected"] += incoming
+                return False
+
+            for heartbeat in heartbeats:
+                # Only the newest heartbeat per server needs to reach the database
+                current = self._heartbeats.get(heartbeat["serverID"])
+                if current is None or heartbeat["lastUpdated"] >= current["lastUpdated"]:
+                    self._heartbeats[heartbeat["serverID"]] = heartbeat
+            self._heartbeat_count += len(heartbeats)
+            self._logs.extend(logs)
+            self.stats["accepted"] += incoming
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ingest-flusher", daemon=True)
+                self._thread.start()
+
+        if self.buffered() >= INGEST_FLUSH_SIZE:
+            self._wake.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(INGEST_FLUSH_INTERVAL)
+            self._wake.clear()
+            with self.app.app_context():
+                self.flush()
+
+    def _take(self):
+        with self._lock:
+            heartbeats = list(self._heartbeats.values())
+            logs = self._logs
+            count = self._heartbeat_count + len(logs)
+            self._heartbeats = {}
+            self._heartbeat_count = 0
+            self._logs = []
+        return heartbeats, logs, count
+
+    def flush(self):
+        """Write everything buffered so far. Must run inside an app context."""
+        heartbeats, logs, count = self._take()
+        if not count:
+            return
+
+        cursor = db.get_db().cursor()
+        try:
+            for chunk in _chunks(heartbeats, INSERT_CHUNK_SIZE):
+                placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+                params = []
+                for hb in chunk:
+                    params.extend([hb["serverID"], hb["status"], hb["ipAddress"], hb["lastUpdated"]])
+                cursor.execute(f"""
+                    INSERT INTO Servers (serverID, status, ipAddress, lastUpdated)
+                    VALUES {placeholders} AS new
+                    ON DUPLICATE KEY UPDATE
+                        status = IF(new.lastUpdated >= COALESCE(Servers.lastUpdated, new.lastUpdated),
+                                    new.status, Servers.status),
+                        ipAddress = COALESCE(new.ipAddress, Servers.ipAddress),
+                        lastUpdated = GREATEST(COALESCE(Servers.lastUpdated, new.lastUpdated), new.lastUpdated)
+                """, params)
+
+            for chunk in _chunks(logs, INSERT_CHUNK_SIZE):
+                placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+                params = []
+                for log in chunk:
+                    params.extend([log["logTimestamp"], log["status"], log["severity"], log["serverID"]])
+                cursor.execute(f"""
+                    INSERT INTO EventLog (logTimestamp, status, severity, serverID)
+                    VALUES {placeholders}
+                """, params)
+
+            db.get_db().commit()
+            self.stats["flushed"] += count
+        except Exception as e:
+            db.get_db().rollback()
+            self.stats["dropped"] += count
+            self.app.logger.error(f"Ingest flush failed, dropped {count} items: {e}")
+        finally:
+            cursor.close()
+
+    def _flush_on_exit(self):
+        if self.app is not None and self.buffered():
+            with self.app.app_context():
+                self.flush()
+
+
+ingest_buffer = IngestBuffer()
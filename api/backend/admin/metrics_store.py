@@ -0,0 +1,311 @@
+#------------------------------------------------------------
+# Time-series metrics: sampling into System_Metrics and
+# downsampling into System_Metrics_Rollups
+#------------------------------------------------------------
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import g
+from backend.db_connection import db
+from backend.push import push_bus
+
+
+# Seconds between two samples written to System_Metrics
+METRICS_INTERVAL = int(os.getenv("METRICS_INTERVAL_SECONDS", "15"))
+
+# name -> (unit, warning threshold, critical threshold)
+METRIC_DEFINITIONS = {
+    "api_requests": ("requests", None, None),
+    "api_errors": ("requests", 5, 20),
+    "api_latency_avg_ms": ("ms", 500, 2000),
+    "api_latency_max_ms": ("ms", 2000, 5000),
+    "db_ping_ms": ("ms", 50, 250),
+    "db_threads_connected": ("connections", 100, 140),
+    "db_queries_per_sec": ("queries/s", None, None),
+    "servers_offline": ("servers", 1, 3),
+    "eventlog_errors": ("logs", 5, 20),
+}
+
+# Servers.status values counted as down by servers_offline (NULL counts too);
+# the seed data and /admin/ingest use 'active', 'maintenance' and 'inactive'
+SERVER_DOWN_STATUSES = ("inactive", "offline")
+
+# Storage tiers, finest first: (name, bucket seconds, how long it is kept)
+# Raw samples are expired by the System_Metrics partition policy.
+TIERS = [
+    ("raw", 0, timedelta(days=28)),
+    ("1m", 60, timedelta(days=7)),
+    ("1h", 60 * 60, timedelta(days=90)),
+    ("1d", 24 * 60 * 60, timedelta(days=730)),
+]
+
+# Rollups: (tier, source tier, how many recent buckets to recompute each run)
+ROLLUPS = [
+    ("1m", "raw", 5),
+    ("1h", "1m", 2),
+    ("1d", "1h", 2),
+]
+
+
+class RequestStats:
+    """Thread-safe counters for the API requests served since the last sample."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms, status_code):
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if status_code >= 500:
+                self.errors += 1
+
+    def drain(self):
+        with self._lock:
+            snapshot = {
+                "api_requests": self.count,
+                "api_errors": self.errors,
+                "api_latency_avg_ms": self.total_ms / self.count if self.count else 0,
+                "api_latency_max_ms": self.max_ms,
+            }
+            self._reset()
+        return snapshot
+
+
+request_stats = RequestStats()
+
+# (Questions counter, time it was read) from the previous sample
+_last_questions = None
+
+
+def init_request_metrics(app):
+    """Time every request so the sampler can report API throughput and latency."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            request_stats.record((time.perf_counter() - start) * 1000, response.status_code)
+        return response
+
+
+def _metric_status(name, value):
+    _, warning, critical = METRIC_DEFINITIONS[name]
+    if critical is not None and value >= critical:
+        return "critical"
+    if warning is not None and value >= warning:
+        return "warning"
+    return "ok"
+
+
+def _collect_db_metrics(cursor, now):
+    global _last_questions
+    values = {}
+
+    start = time.perf_counter()
+    cursor.execute("SELECT 1")
+    cursor.fetchall()
+    values["db_ping_ms"] = (time.perf_counter() - start) * 1000
+
+    cursor.execute("""
+        SHOW GLOBAL STATUS
+        WHERE Variable_name IN ('Threads_connected', 'Questions')
+    """)
+    status = {row["Variable_name"]: int(row["Value"]) for row in cursor.fetchall()}
+    values["db_threads_connected"] = status.get("Threads_connected", 0)
+
+    questions = status.get("Questions")
+    if questions is not None:
+        if _last_questions is not None:
+            elapsed = (now - _last_questions[1]).total_seconds()
+            if elapsed > 0:
+                values["db_queries_per_sec"] = (questions - _last_questions[0]) / elapsed
+        _last_questions = (questions, now)
+
+    cursor.execute(f"""
+        SELECT SUM(CASE WHEN status IN ({', '.join(['%s'] * len(SERVER_DOWN_STATUSES))})
+                          OR status IS NULL THEN 1 ELSE 0 END) AS servers_offline
+        FROM Servers
+    """, SERVER_DOWN_STATUSES)
+    values["servers_offline"] = (cursor.fetchone() or {}).get("servers_offline") or 0
+
+    cursor.execute("""
+        SELECT COUNT(*) AS eventlog_errors
+        FROM EventLog
+        WHERE logTimestamp >= %s
+          AND severity = 'error'
+    """, (now - timedelta(seconds=METRICS_INTERVAL),))
+    values["eventlog_errors"] = cursor.fetchone()["eventlog_errors"]
+
+    return values
+
+
+def record_metrics():
+    """Take one sample of every metric and write it to System_Metrics in one INSERT."""
+    now = datetime.now().replace(microsecond=0)
+    values = request_stats.drain()
+
+    cursor = db.get_db().cursor()
+    try:
+        values.update(_collect_db_metrics(cursor, now))
+
+        rows = []
+        for name, value in values.items():
+            unit, warning, critical = METRIC_DEFINITIONS[name]
+            rows.append((name, round(value, 2), unit, now, _metric_status(name, value), warning, critical))
+
+        cursor.executemany("""
+            INSERT INTO System_Metrics
+                (metricName, metricValue, metricUnit, timestamp, status, thresholdWarning, thresholdCritical)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        db.get_db().commit()
+    finally:
+        cursor.close()
+    push_bus.publish("metrics", {"timestamp": now})
+
+
+def _floor(value, seconds):
+    epoch = int(value.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds)
+
+
+def rollup_metrics(now=None):
+    """
+    Recompute the most recent buckets of every rollup tier from the tier
+    below it, then expire rollups past their retention. Only the last few
+    buckets are touched, so the cost is proportional to new samples.
+    """
+    now = now or datetime.now()
+    tiers = {name: (seconds, retention) for name, seconds, retention in TIERS}
+
+    cursor = db.get_db().cursor()
+    try:
+        for tier, source, lookback in ROLLUPS:
+            seconds = tiers[tier][0]
+            since = _floor(now, seconds) - timedelta(seconds=seconds * lookback)
+
+            if source == "raw":
+                select = """
+                    SELECT
+                        metricName,
+                        FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(timestamp) / %s) * %s) AS bucket_start,
+                        COUNT(*) AS sample_count,
+                        SUM(metricValue) AS sum_value,
+                        MIN(metricValue) AS min_value,
+                        MAX(metricValue) AS max_value
+                    FROM System_Metrics
+                    WHERE timestamp >= %s
+                    GROUP BY metricName, bucket_start
+                """
+                params = (seconds, seconds, since)
+            else:
+                select = """
+                    SELECT
+                        metricName,
+                        FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(bucketStart) / %s) * %s) AS bucket_start,
+                        SUM(sampleCount) AS sample_count,
+                        SUM(sumValue) AS sum_value,
+                        MIN(minMetricValue) AS min_value,
+                        MAX(maxMetricValue) AS max_value
+                    FROM System_Metrics_Rollups
+                    WHERE resolution = %s
+                      AND bucketStart >= %s
+                    GROUP BY metricName, bucket_start
+                """
+                params = (seconds, seconds, source, since)
+
+            cursor.execute(f"""
+                INSERT INTO System_Metrics_Rollups
+                    (metricName, resolution, bucketStart, sampleCount, sumValue, minMetricValue, maxMetricValue)
+                SELECT metricName, %s, bucket_start, sample_count, sum_value, min_value, max_value
+                FROM ({select}) AS src
+                ON DUPLICATE KEY UPDATE
+                    sampleCount = src.sample_count,
+                    sumValue = src.sum_value,
+                    minMetricValue = src.min_value,
+                    maxMetricValue = src.max_value
+            """, (tier,) + params)
+
+            cursor.execute("""
+                DELETE FROM System_Metrics_Rollups
+                WHERE resolution = %s
+                  AND bucketStart < %s
+            """, (tier, now - tiers[tier][1]))
+
+        db.get_db().commit()
+    finally:
+        cursor.close()
+
+
+def choose_tier(start, step, now=None):
+    """
+    Pick the cheapest tier for a query: the coarsest one whose buckets are
+    no wider than `step` and that still holds data as old as `start`.
+    Falls back to the finest tier that reaches back far enough.
+    """
+    now = now or datetime.now()
+    covering = [t for t in TIERS if start >= now - t[2]] or [TIERS[-1]]
+    fitting = [t for t in covering if t[1] <= step]
+    return fitting[-1] if fitting else covering[0]
+
+
+def metric_history(cursor, metric, start, end, step):
+    """
+    Return (tier name, step actually used, points) for `metric` between
+    start and end, one point per `step` seconds with count/avg/min/max.
+    """
+    tier, tier_seconds, _ = choose_tier(start, step)
+    if tier_seconds:
+        # A point can't be narrower than the buckets it is built from
+        step = max(tier_seconds, step - step % tier_seconds)
+
+    if tier == "raw":
+        query = """
+            SELECT
+                FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(timestamp) / %s) * %s) AS t,
+                COUNT(*) AS count,
+                AVG(metricValue) AS avg,
+                MIN(metricValue) AS min,
+                MAX(metricValue) AS max
+            FROM System_Metrics
+            WHERE metricName = %s
+              AND timestamp >= %s
+              AND timestamp < %s
+            GROUP BY t
+            ORDER BY t
+        """
+        params = (step, step, metric, start, end)
+    else:
+        query = """
+            SELECT
+                FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(bucketStart) / %s) * %s) AS t,
+                SUM(sampleCount) AS count,
+                SUM(sumValue) / SUM(sampleCount) AS avg,
+                MIN(minMetricValue) AS min,
+                MAX(maxMetricValue) AS max
+            FROM System_Metrics_Rollups
+            WHERE metricName = %s
+              AND resolution = %s
+              AND bucketStart >= %s
+              AND bucketStart < %s
+            GROUP BY t
+            ORDER BY t
+        """
+        params = (step, step, metric, tier, start, end)
+
+    cursor.execute(query, params)
+    return tier, step, cursor.fetchall()
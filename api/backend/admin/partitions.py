@@ -0,0 +1,176 @@
+#------------------------------------------------------------
+# Monthly RANGE partition management for the append-only log tables
+#------------------------------------------------------------
+from datetime import datetime
+from flask import current_app
+from backend.db_connection import db
+
+
+# table -> (timestamp column, months to keep, copy to <table>_Archive before dropping)
+RETENTION_POLICY = {
+    "EventLog": ("logTimestamp", 12, True),
+    "Audit_Logs": ("timestamp", 24, True),
+    "Search_Logs": ("timestamp", 12, False),
+    "System_Metrics": ("timestamp", 1, False),  # raw tier; rollups live in System_Metrics_Rollups
+}
+
+# Non-partitioned side tables holding copies of rows from a managed table
+# table -> (companion table, its timestamp column)
+COMPANION_TABLES = {
+    "EventLog": ("EventLog_Search", "logTimestamp"),
+}
+
+# How many months of empty partitions to keep ready ahead of NOW()
+MONTHS_AHEAD = 3
+
+# Catch-all partition every managed table ends with
+FUTURE_PARTITION = "p_future"
+
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + (value.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_name(month):
+    return f"p{month.year}_{month.month:02d}"
+
+
+def _parse_bound(description):
+    """Turn information_schema's PARTITION_DESCRIPTION into a datetime (None for MAXVALUE)."""
+    if description is None or description.upper() == "MAXVALUE":
+        return None
+    value = description.strip("'")
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def list_partitions(cursor, table):
+    """Return the partitions of a table in order, with their upper bound and row estimate."""
+    cursor.execute("""
+        SELECT
+            PARTITION_NAME AS partition_name,
+            PARTITION_DESCRIPTION AS upper_bound,
+            TABLE_ROWS AS row_estimate
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = %s
+          AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    return cursor.fetchall()
+
+
+def create_future_partitions(cursor, table, months_ahead=MONTHS_AHEAD, now=None):
+    """
+    Split p_future so that every month up to `months_ahead` months from now
+    has its own partition. Returns the names of the partitions created.
+    """
+    now = now or datetime.now()
+    partitions = list_partitions(cursor, table)
+    bounds = [_parse_bound(p["upper_bound"]) for p in partitions]
+    bounds = [b for b in bounds if b is not None]
+    if not bounds:
+        return []
+
+    next_month = max(bounds)
+    target = _add_months(_month_start(now), months_ahead + 1)
+
+    new_partitions = []
+    while next_month < target:
+        upper = _add_months(next_month, 1)
+        new_partitions.append(
+            f"PARTITION {_partition_name(next_month)} "
+            f"VALUES LESS THAN ('{upper.strftime('%Y-%m-%d')}')"
+        )
+        next_month = upper
+
+    if not new_partitions:
+        return []
+
+    new_partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    cursor.execute(
+        f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(new_partitions)})"
+    )
+    return [p.split()[1] for p in new_partitions[:-1]]
+
+
+def _ensure_archive_table(cursor, table):
+    archive = f"{table}_Archive"
+    cursor.execute("""
+        SELECT COUNT(*) AS table_count
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = %s
+    """, (archive,))
+    if cursor.fetchone()["table_count"] == 0:
+        cursor.execute(f"CREATE TABLE {archive} LIKE {table}")
+        cursor.execute(f"ALTER TABLE {archive} REMOVE PARTITIONING")
+    return archive
+
+
+def drop_expired_partitions(cursor, table, retain_months, archive=False, now=None):
+    """
+    Drop every partition whose rows are all older than `retain_months`.
+    When `archive` is set the rows are copied into <table>_Archive first.
+    Returns the names of the partitions dropped.
+    """
+    now = now or datetime.now()
+    cutoff = _add_months(_month_start(now), -retain_months)
+
+    expired = []
+    for partition in list_partitions(cursor, table):
+        bound = _parse_bound(partition["upper_bound"])
+        if bound is not None and bound <= cutoff:
+            expired.append(partition["partition_name"])
+
+    for name in expired:
+        if archive:
+            archive_table = _ensure_archive_table(cursor, table)
+            cursor.execute(f"INSERT INTO {archive_table} SELECT * FROM {table} PARTITION ({name})")
+            db.get_db().commit()
+        cursor.execute(f"ALTER TABLE {table} DROP PARTITION {name}")
+
+    if expired and table in COMPANION_TABLES:
+        companion, column = COMPANION_TABLES[table]
+        cursor.execute(f"DELETE FROM {companion} WHERE {column} < %s", (cutoff,))
+
+    return expired
+
+
+def maintain_partitions(apply_retention=True):
+    """
+    Create upcoming monthly partitions for every managed table and,
+    optionally, drop/archive the ones past their retention window.
+    """
+    summary = {}
+    cursor = db.get_db().cursor()
+    try:
+        for table, (column, retain_months, archive) in RETENTION_POLICY.items():
+            created = create_future_partitions(cursor, table)
+            dropped = []
+            if apply_retention:
+                dropped = drop_expired_partitions(cursor, table, retain_months, archive)
+            summary[table] = {
+                "partition_column": column,
+                "retain_months": retain_months,
+                "archived": archive,
+                "created": created,
+                "dropped": dropped,
+            }
+            if created or dropped:
+                current_app.logger.info(
+                    f"Partition maintenance on {table}: created={created} dropped={dropped}"
+                )
+        db.get_db().commit()
+    finally:
+        cursor.close()
+    return summary
@@ -4,9 +4,13 @@ from pymysql import Error
 from flask import current_app
 from pymysql.cursors import DictCursor
 from datetime import datetime, timedelta
+from backend.exports import export_format, stream_query
 
 analytics_routes = Blueprint("analytics_routes", __name__)
 
+# Every GET below also accepts ?format=csv or ?format=ndjson, which streams
+# the same result set as a file download instead of returning JSON.
+
 
 # GET /analytics/engagement/current-metrics
 @analytics_routes.route("/engagement/current-metrics", methods=["GET"])
@@ -37,7 +41,12 @@ def get_current_period_metrics():
             WHERE e.startDateTime >= %s
         """
         
-        cursor.execute(query, (start_date_str, start_date_str, start_date_str))
+        params = (start_date_str, start_date_str, start_date_str)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_engagement_current_metrics")
+
+        cursor.execute(query, params)
         result = cursor.fetchone()
         return jsonify(result), 200
     except Error as e:
@@ -83,7 +92,12 @@ def get_previous_period_metrics():
               AND e.startDateTime < %s
         """
         
-        cursor.execute(query, (start_date_str, end_date_str, start_date_str, end_date_str, start_date_str, end_date_str))
+        params = (start_date_str, end_date_str, start_date_str, end_date_str, start_date_str, end_date_str)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_engagement_previous_metrics")
+
+        cursor.execute(query, params)
         result = cursor.fetchone()
         return jsonify(result), 200
     except Error as e:
@@ -117,7 +131,12 @@ def get_events_by_month():
             ORDER BY month ASC;
         """
         
-        cursor.execute(query, (start_date_str,))
+        params = (start_date_str,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_engagement_events_by_month")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
     except Error as e:
@@ -155,7 +174,12 @@ def get_top_clubs_by_engagement():
             LIMIT 10
         """
         
-        cursor.execute(query, (start_date, start_date))
+        params = (start_date, start_date)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_engagement_top_clubs")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
     except Error as e:
@@ -186,7 +210,12 @@ def get_engagement_rate():
             WHERE sea.timestamp >= %s
         """
         
-        cursor.execute(query, (start_date,))
+        params = (start_date,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_engagement_engagement_rate")
+
+        cursor.execute(query, params)
         result = cursor.fetchone()
         return jsonify(result), 200
     except Error as e:
@@ -212,13 +241,18 @@ def get_search_summary():
                 (SELECT COUNT(DISTINCT s.searchID) 
                  FROM Searches s
                  LEFT JOIN Searches_Search_Results ssr ON s.searchID = ssr.searchID
-                 WHERE DATE(s.timestamp) >= %s 
+                 WHERE s.timestamp >= %s 
                    AND ssr.resultID IS NULL) as no_result_searches
             FROM Searches
-            WHERE DATE(timestamp) >= %s
+            WHERE timestamp >= %s
         """
         
-        cursor.execute(query, (start_date, start_date))
+        params = (start_date, start_date)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_search_summary")
+
+        cursor.execute(query, params)
         result = cursor.fetchone()
         return jsonify(result), 200
         
@@ -249,14 +283,19 @@ def get_top_keywords():
             FROM Searches s
             LEFT JOIN Searches_Search_Results ssr ON s.searchID = ssr.searchID
             LEFT JOIN Search_Result sr ON ssr.resultID = sr.resultID
-            WHERE DATE(s.timestamp) >= %s
+            WHERE s.timestamp >= %s
             GROUP BY s.searchQuery
             HAVING search_count > 0
             ORDER BY search_count DESC
             LIMIT 20
         """
         
-        cursor.execute(query, (start_date,))
+        params = (start_date,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_search_top_keywords")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -282,14 +321,19 @@ def get_no_result_searches():
                 COUNT(*) as search_count
             FROM Searches s
             LEFT JOIN Searches_Search_Results ssr ON s.searchID = ssr.searchID
-            WHERE DATE(s.timestamp) >= %s
+            WHERE s.timestamp >= %s
               AND ssr.resultID IS NULL
             GROUP BY s.searchQuery
             ORDER BY search_count DESC
             LIMIT 20
         """
         
-        cursor.execute(query, (start_date,))
+        params = (start_date,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_search_no_results")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -327,7 +371,12 @@ def get_engagement_by_year():
             ORDER BY s.year
         """
         
-        cursor.execute(query, (start_date,))
+        params = (start_date,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_demographics_by_year")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -373,7 +422,12 @@ def get_engagement_by_major():
             ORDER BY participation_rate DESC
         """
         
-        cursor.execute(query, (start_date, start_date))
+        params = (start_date, start_date)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_demographics_by_major")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -411,7 +465,12 @@ def get_event_preferences_by_demographic():
             ORDER BY s.major, attendance_count DESC
         """
         
-        cursor.execute(query, (start_date,))
+        params = (start_date,)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_demographics_event_preferences")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -463,7 +522,12 @@ def get_underserved_populations():
             ORDER BY participation_rate ASC
         """
         
-        cursor.execute(query, (start_date, start_date))
+        params = (start_date, start_date)
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, params, fmt, "analytics_demographics_underserved")
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return jsonify(rows), 200
         
@@ -511,6 +575,10 @@ def get_engagement_reports():
             ORDER BY generatedAt DESC
             LIMIT 50;
         """
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, (), fmt, "analytics_reports")
+
         cursor.execute(query)
         reports = cursor.fetchall()
         return jsonify(reports), 200
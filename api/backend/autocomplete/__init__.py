@@ -0,0 +1,209 @@
+#------------------------------------------------------------
+# In-memory typeahead over event, club and student names
+#------------------------------------------------------------
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from backend.db_connection import db
+
+
+# Seconds between full rebuilds from the database (writes are applied in between)
+AUTOCOMPLETE_REBUILD_INTERVAL = 10 * 60
+
+# kind -> query returning (id, name, popularity, startDateTime or NULL)
+SOURCES = {
+    "events": """
+        SELECT e.eventID AS id, e.name, COALESCE(r.rsvps, 0) AS popularity, e.startDateTime AS starts_at
+        FROM Events e
+        LEFT JOIN (
+            SELECT eventID, COUNT(*) AS rsvps
+            FROM RSVPs
+            WHERE status = 'confirmed'
+            GROUP BY eventID
+        ) r ON r.eventID = e.eventID
+    """,
+    "clubs": """
+        SELECT c.clubID AS id, c.name, COALESCE(m.members, 0) AS popularity, NULL AS starts_at
+        FROM Clubs c
+        LEFT JOIN (
+            SELECT club_id, COUNT(*) AS members
+            FROM club_memberships
+            GROUP BY club_id
+        ) m ON m.club_id = c.clubID
+    """,
+    "students": """
+        SELECT studentID AS id, CONCAT(firstName, ' ', lastName) AS name, 0 AS popularity, NULL AS starts_at
+        FROM Students
+    """,
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text):
+    return _WORD.findall((text or "").lower())
+
+
+def _parse_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("T", " "))
+    except ValueError:
+        return None
+
+
+class PrefixIndex:
+    """
+    Sorted (word, id) pairs for one kind of item. A prefix lookup is a
+    bisect to the first word >= prefix followed by a scan while words
+    still start with it, ranked into a heap of `limit` entries on the way,
+    so it costs O(log n + matches * log limit).
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.items = {}
+
+    @classmethod
+    def build(cls, rows):
+        """Index (id, name, popularity, starts_at) rows with a single sort."""
+        index = cls()
+        for row in rows:
+            item = index._item(row["id"], row["name"], row["popularity"], row["starts_at"])
+            index.entries.extend((word, item["id"]) for word in set(item["words"]))
+        index.entries.sort()
+        return index
+
+    def _item(self, item_id, name, popularity, starts_at):
+        words = _words(name)
+        item = {
+            "id": item_id,
+            "name": name,
+            "words": words,
+            "normalized": " ".join(words),
+            "popularity": popularity or 0,
+            "starts_at": starts_at,
+        }
+        self.items[item_id] = item
+        return item
+
+    def add(self, item_id, name, popularity=0, starts_at=None):
+        """Insert or replace one item, keeping the entries sorted."""
+        if item_id in self.items:
+            self.remove(item_id)
+        item = self._item(item_id, name, popularity, starts_at)
+        for word in set(item["words"]):
+            insort(self.entries, (word, item_id))
+
+    def remove(self, item_id):
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        for word in set(item["words"]):
+            position = bisect_left(self.entries, (word, item_id))
+            if position < len(self.entries) and self.entries[position] == (word, item_id):
+                del self.entries[position]
+
+    def _matching_ids(self, prefix):
+        """Every id with a word starting with prefix, once, in word order."""
+        seen = set()
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and self.entries[position][0].startswith(prefix):
+            item_id = self.entries[position][1]
+            if item_id not in seen:
+                seen.add(item_id)
+                yield item_id
+            position += 1
+
+    def suggest(self, query, limit, now):
+        """
+        Items where the last query word is a prefix of some word and every
+        other query word is a prefix of another word of the name. Ranked by:
+        whole name starts with the query, upcoming before past, popularity,
+        shorter names.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        normalized_query = " ".join(words)
+
+        # Every match is ranked, but only the best `limit` are kept: a short
+        # prefix's most popular items can sit anywhere in word order
+        best = []
+        for item_id in self._matching_ids(words[-1]):
+            item = self.items[item_id]
+            if not all(any(w.startswith(q) for w in item["words"]) for q in words[:-1]):
+                continue
+            upcoming = item["starts_at"] is not None and item["starts_at"] >= now
+            entry = (
+                item["normalized"].startswith(normalized_query),
+                upcoming,
+                item["popularity"],
+                -len(item["name"]),
+                item_id,
+            )
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        best.sort(reverse=True)
+        return [
+            {"id": entry[-1], "name": self.items[entry[-1]]["name"], "popularity": entry[2]}
+            for entry in best
+        ]
+
+
+class Autocomplete:
+    """One PrefixIndex per kind, built from the database and kept current from writes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = None
+
+    def rebuild(self):
+        """Load every kind from the database and swap the new indexes in at once."""
+        indexes = {}
+        cursor = db.get_db().cursor()
+        try:
+            for kind, query in SOURCES.items():
+                cursor.execute(query)
+                indexes[kind] = PrefixIndex.build(cursor.fetchall())
+        finally:
+            cursor.close()
+        with self._lock:
+            self._indexes = indexes
+
+    def suggest(self, kind, query, limit=10):
+        if self._indexes is None:
+            self.rebuild()
+        now = datetime.now()
+        with self._lock:
+            return self._indexes[kind].suggest(query, limit, now)
+
+    def apply_change(self, change):
+        """
+        Change bus subscriber: add/remove events as they are written and
+        move their popularity with RSVPs, between two full rebuilds.
+        """
+        if self._indexes is None:
+            return
+        with self._lock:
+            index = self._indexes["events"]
+            if change.entity == "RSVPs":
+                item = index.items.get(int(change.fields.get("eventID", 0)))
+                if item is not None:
+                    item["popularity"] += -1 if change.operation == "delete" else 1
+            elif change.operation == "delete":
+                index.remove(int(change.entity_id))
+            elif "name" in change.fields:
+                event_id = int(change.entity_id)
+                previous = index.items.get(event_id, {})
+                index.add(event_id, change.fields["name"], previous.get("popularity", 0),
+                          _parse_datetime(change.fields.get("startDateTime")) or previous.get("starts_at"))
+
+
+autocomplete = Autocomplete()
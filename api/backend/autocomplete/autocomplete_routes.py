@@ -0,0 +1,34 @@
+from flask import Blueprint, jsonify, request
+from backend.autocomplete import autocomplete, SOURCES
+from backend.pagination import get_page_limit
+from pymysql import Error
+from flask import current_app
+
+autocomplete_routes = Blueprint("autocomplete_routes", __name__)
+
+
+# GET /autocomplete?q=hack&kinds=events,clubs - Top-K name suggestions per keystroke
+@autocomplete_routes.route("", methods=["GET"])
+def get_suggestions():
+    """
+    Ranked name suggestions from the in-memory prefix indexes.
+    kinds: comma-separated subset of events, clubs, students (default all);
+    limit: suggestions per kind; exclude: id to leave out of every kind.
+    """
+    kinds = [k.strip() for k in request.args.get("kinds", ",".join(SOURCES)).split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in SOURCES]
+    if unknown:
+        return jsonify({"error": f"Unknown kinds: {', '.join(unknown)}"}), 400
+
+    query = request.args.get("q", "")
+    limit = get_page_limit(default=10, maximum=50)
+    exclude = request.args.get("exclude", type=int)
+    try:
+        suggestions = {}
+        for kind in kinds:
+            matches = autocomplete.suggest(kind, query, limit + (1 if exclude is not None else 0))
+            suggestions[kind] = [m for m in matches if m["id"] != exclude][:limit]
+        return jsonify(suggestions), 200
+    except Error as e:
+        current_app.logger.error(f"Error building autocomplete index: {e}")
+        return jsonify({"error": "Autocomplete is unavailable"}), 500
@@ -0,0 +1,188 @@
+#------------------------------------------------------------
+# Change-data-capture bus: write routes record what they changed,
+# subscribers consume the changes in a background thread
+#------------------------------------------------------------
+import json
+import os
+import queue
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+from flask import g
+from backend.db_connection import db
+
+
+# Also persist every change to Change_Outbox inside the write's transaction
+CHANGE_OUTBOX_ENABLED = os.getenv("CHANGE_OUTBOX_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Changes held in memory waiting for the dispatcher before new ones are dropped
+CHANGE_QUEUE_SIZE = int(os.getenv("CHANGE_QUEUE_SIZE", "10000"))
+
+# Changes handed to the subscribers per dispatcher pass
+DISPATCH_BATCH_SIZE = 100
+
+# Outbox rows still undispatched after this long are re-published by the relay
+OUTBOX_RELAY_AFTER = timedelta(seconds=60)
+
+# Dispatched outbox rows are deleted after this long
+OUTBOX_RETENTION = timedelta(days=7)
+
+
+# entity: table name; entity_id: its primary key; operation: insert/update/delete;
+# fields: the columns written (or the deleted row); change_id: Change_Outbox row, if any
+ChangeEvent = namedtuple(
+    "ChangeEvent",
+    ["entity", "entity_id", "operation", "fields", "occurred_at", "change_id"],
+)
+
+
+def record_change(cursor, entity, entity_id, operation, fields=None):
+    """
+    Record a change made by the current request. Call it on the write's
+    cursor before db.commit(): with the outbox enabled the outbox row is
+    part of the same transaction. The change is handed to the subscribers
+    once the request finished successfully, so rolled back or failed
+    writes are never published.
+    """
+    fields = fields or {}
+    occurred_at = datetime.now().replace(microsecond=0)
+    change_id = None
+    if CHANGE_OUTBOX_ENABLED:
+        cursor.execute("""
+            INSERT INTO Change_Outbox (entity, entityID, operation, changedFields, occurredAt)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (entity, str(entity_id), operation, json.dumps(fields, default=str), occurred_at))
+        change_id = cursor.lastrowid
+
+    change = ChangeEvent(entity, entity_id, operation, fields, occurred_at, change_id)
+    g.setdefault("pending_changes", []).append(change)
+    return change
+
+
+class ChangeBus:
+    """
+    Delivers recorded changes to subscribers from a daemon thread, so the
+    write path only pays for a queue put. Delivery is at least once when
+    the outbox is enabled and best effort otherwise.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._queue = queue.Queue(maxsize=CHANGE_QUEUE_SIZE)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {"published": 0, "dispatched": 0, "dropped": 0, "failed": 0}
+
+    def init_app(self, app):
+        self.app = app
+        app.after_request(self._publish_pending)
+
+    def subscribe(self, callback, entities=None):
+        """Call callback(change) for every change, or only for the given entities."""
+        entities = set(entities) if entities is not None else None
+        self._subscribers.append((callback, entities))
+
+    def _publish_pending(self, response):
+        changes = g.pop("pending_changes", [])
+        if changes and response.status_code < 400:
+            self.publish(changes)
+        return response
+
+    def publish(self, changes):
+        """Queue already-committed changes for the subscribers. Never blocks."""
+        for change in changes:
+            try:
+                self._queue.put_nowait(change)
+                self.stats["published"] += 1
+            except queue.Full:
+                # With the outbox enabled the relay picks these up later
+                self.stats["dropped"] += 1
+                self.app.logger.warning(f"Change queue full, dropped {change.entity} {change.entity_id}")
+
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="change-dispatcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < DISPATCH_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self.app.app_context():
+                self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        for change in batch:
+            for callback, entities in self._subscribers:
+                if entities is not None and change.entity not in entities:
+                    continue
+                try:
+                    callback(change)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.app.logger.error(
+                        f"Change subscriber {callback.__name__} failed on "
+                        f"{change.entity} {change.entity_id}: {e}"
+                    )
+        self.stats["dispatched"] += len(batch)
+
+        change_ids = [change.change_id for change in batch if change.change_id is not None]
+        if change_ids:
+            cursor = db.get_db().cursor()
+            try:
+                cursor.execute(f"""
+                    UPDATE Change_Outbox
+                    SET dispatchedAt = NOW()
+                    WHERE changeID IN ({', '.join(['%s'] * len(change_ids))})
+                """, change_ids)
+                db.get_db().commit()
+            finally:
+                cursor.close()
+
+    def relay_outbox(self):
+        """
+        Re-publish outbox rows that were committed but never dispatched
+        (process crash, full queue) and delete old dispatched rows.
+        """
+        if not CHANGE_OUTBOX_ENABLED:
+            return
+        now = datetime.now()
+        cursor = db.get_db().cursor()
+        try:
+            cursor.execute("""
+                SELECT changeID, entity, entityID, operation, changedFields, occurredAt
+                FROM Change_Outbox
+                WHERE dispatchedAt IS NULL
+                  AND occurredAt < %s
+                ORDER BY changeID
+                LIMIT %s
+            """, (now - OUTBOX_RELAY_AFTER, CHANGE_QUEUE_SIZE // 2))
+            changes = [
+                ChangeEvent(
+                    row["entity"], row["entityID"], row["operation"],
+                    json.loads(row["changedFields"]) if row["changedFields"] else {},
+                    row["occurredAt"], row["changeID"],
+                )
+                for row in cursor.fetchall()
+            ]
+
+            cursor.execute("""
+                DELETE FROM Change_Outbox
+                WHERE dispatchedAt < %s
+            """, (now - OUTBOX_RETENTION,))
+            db.get_db().commit()
+        finally:
+            cursor.close()
+
+        if changes:
+            self.app.logger.info(f"Relaying {len(changes)} undispatched changes from Change_Outbox")
+            self.publish(changes)
+
+
+change_bus = ChangeBus()
@@ -3,7 +3,14 @@ from flask import Blueprint, jsonify, request
 from backend.db_connection import cursor, db
 from mysql.connector import Error
 from flask import current_app
-from datetime import datetime, timedelta
+from backend.clubs.similarity import club_similarity
+from backend.clubs.overlap import club_overlap, OVERLAP_WINDOWS, DEFAULT_OVERLAP_WINDOW
+from backend.changes import record_change
+from backend.clubs.metrics import RANKING_METRICS, METRIC_COLUMNS
+from backend.clubs.performance import performance_cache, MAX_PERFORMANCE_DAYS
+from backend.clubs.rankings import (COMPOSITE_RANKING, compute_quarters, current_quarter,
+                                    parse_period)
+from backend.pagination import encode_cursor, decode_cursor, get_page_limit
 
 club_routes = Blueprint('club_routes', __name__)
 
@@ -19,8 +26,6 @@ def get_clubs():
                 c.budget,
                 c.competitiveness_level
             FROM Clubs c
-            LEFT JOIN club_memberships cm ON c.clubID = cm.club_id
-            GROUP BY c.clubID, c.name, c.budget, c.competitiveness_level
             ORDER BY c.name ASC
         """
         cursor.execute(query)
@@ -36,25 +41,13 @@ def get_clubs():
 def get_clubs_with_metrics():
     try:
         cursor = db.cursor(dictionary=True)
-        query = """
+        query = f"""
             SELECT
                 c.clubID AS club_id,
                 c.name  AS club_name,
-                c.budget,
-                c.competitiveness_level,
-                COALESCE(m.member_count, 0)  AS member_count,
-                COALESCE(e.event_count, 0)   AS event_count
+                {METRIC_COLUMNS}
             FROM Clubs c
-            LEFT JOIN (
-                SELECT club_id, COUNT(*) AS member_count
-                FROM club_memberships
-                GROUP BY club_id
-            ) m ON m.club_id = c.clubID
-            LEFT JOIN (
-                SELECT clubID, COUNT(*) AS event_count
-                FROM Events
-                GROUP BY clubID
-            ) e ON e.clubID = c.clubID
+            JOIN Club_Metrics cm ON cm.clubID = c.clubID
             ORDER BY c.name;
         """
         cursor.execute(query)
@@ -66,6 +59,64 @@ def get_clubs_with_metrics():
     finally:
         cursor.close()
 
+# Clubs ranked by one metric, highest first
+@club_routes.route('/clubs/ranked', methods=['GET'])
+def get_ranked_clubs():
+    """
+    Top clubs by one Club_Metrics column, read in (metric, clubID) index
+    order. Query params: metric (default member_count), limit (default 10,
+    max 100), cursor (next_cursor of the previous page).
+    """
+    cursor = None
+    try:
+        metric = request.args.get('metric', 'member_count')
+        if metric not in RANKING_METRICS:
+            return jsonify({"error": f"metric must be one of {', '.join(RANKING_METRICS)}"}), 400
+        column = f"cm.{RANKING_METRICS[metric]}"
+        limit = get_page_limit(default=10, maximum=100)
+
+        conditions, params, rank = "", [], 0
+        token = request.args.get('cursor')
+        if token:
+            position = decode_cursor(token)
+            if not position or len(position) != 3:
+                return jsonify({"error": "Invalid cursor"}), 400
+            value, last_club_id, rank = position
+            conditions = f"WHERE ({column} < %s OR ({column} = %s AND cm.clubID < %s))"
+            params = [value, value, last_club_id]
+
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT
+                c.clubID AS club_id,
+                c.name AS club_name,
+                {METRIC_COLUMNS}
+            FROM Club_Metrics cm
+            JOIN Clubs c ON c.clubID = cm.clubID
+            {conditions}
+            ORDER BY {column} DESC, cm.clubID DESC
+            LIMIT %s
+        """, params + [limit + 1])
+        clubs = cursor.fetchall()
+
+        has_more = len(clubs) > limit
+        clubs = clubs[:limit]
+        for offset, club in enumerate(clubs, start=1):
+            club["rank"] = rank + offset
+
+        next_cursor = None
+        if has_more:
+            last = clubs[-1]
+            next_cursor = encode_cursor(last[metric], last["club_id"], last["rank"])
+
+        return jsonify({"metric": metric, "clubs": clubs, "next_cursor": next_cursor}), 200
+    except Error as e:
+        current_app.logger.error(f"Error ranking clubs: {e}")
+        return jsonify({"error": "Error ranking clubs"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
 # Create new club
 @club_routes.route('/clubs', methods=['POST'])
 def create_club():
@@ -166,48 +217,146 @@ def deactivate_club(club_id):
     finally:
         cursor.close()
 
+# Add a member to a club
+@club_routes.route('/clubs/<int:club_id>/members', methods=['POST'])
+def add_club_member(club_id):
+    cursor = None
+    try:
+        data = request.get_json(silent=True) or {}
+        if 'student_id' not in data:
+            return jsonify({"error": "student_id is required"}), 400
+
+        cursor = db.cursor(dictionary=True)
+        # INSERT IGNORE would also swallow the foreign key errors, so check
+        # both sides first and leave it to report duplicates only
+        cursor.execute("SELECT clubID FROM Clubs WHERE clubID = %s", (club_id,))
+        if cursor.fetchone() is None:
+            return jsonify({"error": "Club not found"}), 404
+        cursor.execute("SELECT studentID FROM Students WHERE studentID = %s", (data['student_id'],))
+        if cursor.fetchone() is None:
+            return jsonify({"error": "Student not found"}), 404
+
+        cursor.execute(
+            "INSERT IGNORE INTO club_memberships (club_id, student_id) VALUES (%s, %s)",
+            (club_id, data['student_id'])
+        )
+        if not cursor.rowcount:
+            return jsonify({"error": "Student is already a member"}), 409
+
+        membership_id = cursor.lastrowid
+        record_change(cursor, "club_memberships", membership_id, "insert",
+                      {"clubID": club_id, "studentID": data['student_id']})
+        db.commit()
+        return jsonify({"message": "Member added", "membership_id": membership_id}), 201
+    except Error as e:
+        current_app.logger.error(f"Error adding club member: {e}")
+        return jsonify({"error": "Error adding club member"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+# Remove a member from a club
+@club_routes.route('/clubs/<int:club_id>/members/<int:student_id>', methods=['DELETE'])
+def remove_club_member(club_id, student_id):
+    cursor = None
+    try:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(
+            "DELETE FROM club_memberships WHERE club_id = %s AND student_id = %s",
+            (club_id, student_id)
+        )
+        deleted = cursor.rowcount
+        if deleted:
+            record_change(cursor, "club_memberships", f"{club_id}:{student_id}", "delete",
+                          {"clubID": club_id, "studentID": student_id})
+        db.commit()
+
+        if not deleted:
+            return jsonify({"error": "Membership not found"}), 404
+        return jsonify({"message": "Member removed"}), 200
+    except Error as e:
+        current_app.logger.error(f"Error removing club member: {e}")
+        return jsonify({"error": "Error removing club member"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+# Clubs accepted by one /clubs/compare request
+MAX_COMPARE_CLUBS = 50
+
 # [NewStudent-1.2] Compare clubs
 @club_routes.route('/clubs/compare', methods=['GET'])
 def compare_clubs():
+    """
+    Side-by-side facts for up to MAX_COMPARE_CLUBS clubs, read from their
+    Club_Metrics rows by primary key; clubs come back in the requested order.
+    """
+    cursor = None
     try:
         club_ids = request.args.get('ids')
         if not club_ids:
             return jsonify({"error": "Club IDs required"}), 400
-        
-        ids = tuple(club_ids.split(','))
+        try:
+            ids = list(dict.fromkeys(int(club_id) for club_id in club_ids.split(',') if club_id.strip()))
+        except ValueError:
+            return jsonify({"error": "Club IDs must be integers"}), 400
+        if not ids:
+            return jsonify({"error": "Club IDs required"}), 400
+        if len(ids) > MAX_COMPARE_CLUBS:
+            return jsonify({"error": f"At most {MAX_COMPARE_CLUBS} clubs can be compared"}), 400
+
         cursor = db.cursor(dictionary=True)
         query = """
             SELECT 
                 c.clubID as club_id,
                 c.name as club_name,
-                c.adviser as curriculum,
-                c.budget,
-                c.competitiveness_level,
-                COUNT(DISTINCT cm.student_id) AS number_of_members
-            FROM Clubs c
-            LEFT JOIN club_memberships cm ON c.clubID = cm.club_id
-            WHERE c.clubID IN (%s)
-            GROUP BY c.clubID, c.name, c.adviser, c.budget, c.competitiveness_level
+                cat.name as category,
+                c.type,
+                c.adviser,
+                cm.budget,
+                cm.competitivenessLevel as competitiveness_level,
+                cm.memberCount as number_of_members,
+                cm.eventsPerMonth as events_per_month,
+                cm.avgAttendance as avg_attendance,
+                cm.rsvpConversion as rsvp_conversion,
+                cm.topKeywords as top_keywords,
+                cm.upcomingEvents as upcoming_events,
+                cm.refreshedAt as refreshed_at
+            FROM Club_Metrics cm
+            JOIN Clubs c ON c.clubID = cm.clubID
+            LEFT JOIN Categories cat ON cat.categoryID = c.categoryID
+            WHERE cm.clubID IN (%s)
         """ % ','.join(['%s'] * len(ids))
         cursor.execute(query, ids)
-        comparison = cursor.fetchall()
+        rows = {row['club_id']: row for row in cursor.fetchall()}
+
+        comparison = []
+        for club_id in ids:
+            row = rows.get(club_id)
+            if row:
+                row['top_keywords'] = row['top_keywords'].split(', ') if row['top_keywords'] else []
+                comparison.append(row)
         return jsonify(comparison), 200
     except Error as e:
         current_app.logger.error(f"Error comparing clubs: {e}")
         return jsonify({"error": "Error comparing clubs"}), 500
     finally:
-        cursor.close()
+        if cursor:
+            cursor.close()
 
 # [NewStudent-1.6] Get club rankings
 @club_routes.route('/rankings', methods=['GET'])
 def get_club_rankings():
+    cursor = None
     try:
         period = request.args.get('period', '2025-Q4')
+        ranking_type = request.args.get('type', COMPOSITE_RANKING)
         
         # Parse period (e.g., "2025-Q4" -> year=2025, quarter=4)
-        year, quarter = period.split('-Q')
-        year = int(year)
-        quarter = int(quarter)
+        try:
+            year, quarter = parse_period(period)
+        except ValueError:
+            return jsonify({"error": "period must look like 2025-Q4"}), 400
         
         cursor = db.cursor(dictionary=True)
         query = """
@@ -217,178 +366,250 @@ def get_club_rankings():
                 c.budget,
                 c.competitiveness_level,
                 r.rankingValue as ranking_score,
-                r.rankingType as ranking_type
+                r.rankingType as ranking_type,
+                r.rankPosition as rank_position
             FROM Clubs c
             LEFT JOIN Rankings r ON c.clubID = r.clubID 
                 AND r.rankingYear = %s 
                 AND r.rankingQuarter = %s
+                AND r.rankingType = %s
             ORDER BY r.rankingValue DESC
         """
-        cursor.execute(query, (year, quarter))
+        cursor.execute(query, (year, quarter, ranking_type))
         rankings = cursor.fetchall()
         return jsonify(rankings), 200
     except Error as e:
         current_app.logger.error(f"Error fetching club rankings: {e}")
         return jsonify({"error": "Error fetching club rankings"}), 500
     finally:
-        cursor.close()
+        if cursor:
+            cursor.close()
+
+# Recompute rankings for one or more quarters
+@club_routes.route('/rankings/compute', methods=['POST'])
+def compute_club_rankings():
+    """
+    Recompute the composite and component rankings of the given quarters
+    (body: {"periods": ["2025-Q3", "2025-Q4"]}, default the current one),
+    several quarters in parallel.
+    """
+    data = request.get_json(silent=True) or {}
+    periods = data.get('periods') or ["{}-Q{}".format(*current_quarter())]
+    try:
+        quarters = sorted({parse_period(period) for period in periods})
+    except (ValueError, AttributeError):
+        return jsonify({"error": "periods must look like ['2025-Q4']"}), 400
+    if any(quarter > current_quarter() for quarter in quarters):
+        return jsonify({"error": "Cannot rank a quarter that has not started"}), 400
+
+    results = compute_quarters(quarters)
+    failed = {period: result for period, result in results.items() if isinstance(result, dict)}
+    status = 500 if len(failed) == len(results) else 200
+    return jsonify({"ranked": {p: r for p, r in results.items() if p not in failed},
+                    "failed": failed}), status
+
+# Rank history of one club
+@club_routes.route('/clubs/<int:club_id>/rankings', methods=['GET'])
+def get_club_ranking_history(club_id):
+    """Quarter by quarter score and position of a club, oldest first (?type=, default Composite)."""
+    cursor = None
+    try:
+        ranking_type = request.args.get('type', COMPOSITE_RANKING)
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT
+                CONCAT(rankingYear, '-Q', rankingQuarter) AS period,
+                rankingYear AS year,
+                rankingQuarter AS quarter,
+                rankingValue AS ranking_score,
+                rankPosition AS rank_position,
+                computedAt AS computed_at
+            FROM Rankings
+            WHERE clubID = %s AND rankingType = %s
+            ORDER BY rankingYear, rankingQuarter
+        """, (club_id, ranking_type))
+        history = cursor.fetchall()
+        return jsonify({"club_id": club_id, "type": ranking_type, "history": history}), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching ranking history: {e}")
+        return jsonify({"error": "Error fetching ranking history"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+# Which of a club's events the per-event stats cover
+CLUB_EVENT_WINDOWS = {
+    "upcoming": "{e}.startDateTime >= CURRENT_TIMESTAMP",
+    "past": "COALESCE({e}.endDateTime, {e}.startDateTime) < CURRENT_TIMESTAMP",
+    "all": "TRUE",
+}
+
+def _club_event_stats(cursor, club_id, window, newest_first=False):
+    """
+    RSVP and attendance figures for every event of one club. Each fact table
+    is counted per event in its own subquery (restricted to the club's events
+    through idx_events_club_start) and only the per-event counts are joined,
+    so RSVPs and check-ins never multiply each other.
+    """
+    condition = CLUB_EVENT_WINDOWS[window]
+    query = f"""
+        SELECT 
+            e.eventID AS event_id,
+            e.name AS event_name,
+            e.eventType AS event_type,
+            e.capacity,
+            e.startDateTime AS start_datetime,
+            e.endDateTime AS end_datetime,
+            COALESCE(r.total_rsvps, 0) AS total_rsvps,
+            COALESCE(r.confirmed_count, 0) AS confirmed_count,
+            COALESCE(r.waitlist_count, 0) AS waitlist_count,
+            GREATEST(e.capacity - COALESCE(r.confirmed_count, 0), 0) AS remaining_capacity,
+            COALESCE(a.attendance, 0) AS actual_attendance,
+            ROUND(COALESCE(a.attendance, 0) * 100.0 / NULLIF(r.total_rsvps, 0), 2) AS attendance_rate,
+            ROUND(COALESCE(a.attendance, 0) * 100.0 / NULLIF(e.capacity, 0), 2) AS capacity_utilization
+        FROM Events e
+        LEFT JOIN (
+            SELECT r.eventID,
+                   COUNT(*) AS total_rsvps,
+                   SUM(r.status = 'confirmed') AS confirmed_count,
+                   SUM(r.status = 'waitlisted') AS waitlist_count
+            FROM Events ce
+            JOIN RSVPs r ON r.eventID = ce.eventID
+            WHERE ce.clubID = %s AND {condition.format(e="ce")}
+                AND r.status <> 'cancelled'
+            GROUP BY r.eventID
+        ) r ON r.eventID = e.eventID
+        LEFT JOIN (
+            SELECT sea.eventID, COUNT(*) AS attendance
+            FROM Events ce
+            JOIN Students_Event_Attendees sea ON sea.eventID = ce.eventID
+            WHERE ce.clubID = %s AND {condition.format(e="ce")}
+            GROUP BY sea.eventID
+        ) a ON a.eventID = e.eventID
+        WHERE e.clubID = %s AND {condition.format(e="e")}
+        ORDER BY e.startDateTime {"DESC" if newest_first else "ASC"}
+    """
+    cursor.execute(query, (club_id, club_id, club_id))
+    return cursor.fetchall()
 
 # [EventsCoord-2.2] Get club events with RSVP stats
-@club_routes.route('/clubs/<club_id>/events', methods=['GET'])
+@club_routes.route('/clubs/<int:club_id>/events', methods=['GET'])
 def get_club_events(club_id):
+    cursor = None
     try:
         upcoming = request.args.get('upcoming', 'true').lower() == 'true'
         cursor = db.cursor(dictionary=True)
-        
-        time_condition = ">=" if upcoming else "<"
-        query = f"""
-            SELECT 
-                e.event_id,
-                e.event_name,
-                e.capacity,
-                COUNT(r.rsvp_id) AS total_rsvps,
-                SUM(CASE WHEN r.status = 'confirmed' THEN 1 ELSE 0 END) AS confirmed_count,
-                SUM(CASE WHEN r.status = 'waitlisted' THEN 1 ELSE 0 END) AS waitlist_count,
-                (e.capacity - COUNT(r.rsvp_id)) AS remaining_capacity,
-                e.start_datetime
-            FROM Events e
-            LEFT JOIN RSVPs r ON e.event_id = r.event_id
-            WHERE e.club_id = %s
-                AND e.start_datetime {time_condition} CURRENT_TIMESTAMP
-            GROUP BY e.event_id, e.event_name, e.capacity, e.start_datetime
-            ORDER BY e.start_datetime ASC
-        """
-        cursor.execute(query, (club_id,))
-        events = cursor.fetchall()
+        events = _club_event_stats(cursor, club_id, "upcoming" if upcoming else "past")
         return jsonify(events), 200
     except Error as e:
         current_app.logger.error(f"Error fetching club events: {e}")
         return jsonify({"error": "Error fetching club events"}), 500
     finally:
-        cursor.close()
+        if cursor:
+            cursor.close()
+
+# Get club events with RSVP headcounts (RSVP management page)
+@club_routes.route('/clubs/<int:club_id>/events/rsvps', methods=['GET'])
+def get_club_event_rsvps(club_id):
+    cursor = None
+    try:
+        window = request.args.get('window', 'upcoming')
+        if window not in CLUB_EVENT_WINDOWS:
+            return jsonify({"error": f"window must be one of {', '.join(CLUB_EVENT_WINDOWS)}"}), 400
+        cursor = db.cursor(dictionary=True)
+        events = _club_event_stats(cursor, club_id, window)
+        return jsonify(events), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching club event RSVPs: {e}")
+        return jsonify({"error": "Error fetching club event RSVPs"}), 500
+    finally:
+        if cursor:
+            cursor.close()
 
 # [EventsCoord-2.5] Get club analytics
-@club_routes.route('/clubs/<club_id>/analytics', methods=['GET'])
+@club_routes.route('/clubs/<int:club_id>/analytics', methods=['GET'])
 def get_club_analytics(club_id):
+    cursor = None
     try:
         period = request.args.get('period', 'past')
+        if period not in CLUB_EVENT_WINDOWS:
+            return jsonify({"error": f"period must be one of {', '.join(CLUB_EVENT_WINDOWS)}"}), 400
         cursor = db.cursor(dictionary=True)
-        query = """
-            SELECT 
-                e.event_id,
-                e.event_name,
-                e.event_type,
-                e.start_datetime,
-                e.capacity,
-                COUNT(DISTINCT r.rsvp_id) AS total_rsvps,
-                COUNT(DISTINCT a.attendance_id) AS actual_attendance,
-                ROUND(COUNT(DISTINCT a.attendance_id) * 100.0 / 
-                      NULLIF(COUNT(DISTINCT r.rsvp_id), 0), 2) AS attendance_rate,
-                ROUND(COUNT(DISTINCT a.attendance_id) * 100.0 / 
-                      NULLIF(e.capacity, 0), 2) AS capacity_utilization
-            FROM Events e
-            LEFT JOIN RSVPs r ON e.event_id = r.event_id
-            LEFT JOIN attendance a ON e.event_id = a.event_id
-            WHERE e.club_id = %s
-                AND e.end_datetime < CURRENT_TIMESTAMP
-            GROUP BY e.event_id, e.event_name, e.event_type, 
-                     e.start_datetime, e.capacity
-            ORDER BY e.start_datetime DESC
-        """
-        cursor.execute(query, (club_id,))
-        analytics = cursor.fetchall()
+        analytics = _club_event_stats(cursor, club_id, period, newest_first=True)
         return jsonify(analytics), 200
     except Error as e:
         current_app.logger.error(f"Error fetching club analytics: {e}")
         return jsonify({"error": "Error fetching club analytics"}), 500
     finally:
-        cursor.close()
+        if cursor:
+            cursor.close()
 
 # [EventsCoord-2.6] Find similar clubs
-@club_routes.route('/clubs/<club_id>/similar', methods=['GET'])
+@club_routes.route('/clubs/<int:club_id>/similar', methods=['GET'])
 def get_similar_clubs(club_id):
+    """
+    Clubs most similar to this one, best first: category, type, budget
+    band, competitiveness and keyword profile, blended with shared members
+    and shared event attendees. Served from the precomputed neighbours.
+    Query params: limit (default 10), minEvents (default 0).
+    """
     try:
-        min_events = request.args.get('minEvents', 5, type=int)
+        min_events = request.args.get('minEvents', 0, type=int)
         limit = request.args.get('limit', 10, type=int)
-        
-        cursor = db.cursor(dictionary=True)
-        query = """
-            SELECT 
-                c.club_id,
-                c.club_name,
-                c.category,
-                COUNT(DISTINCT e.event_id) AS total_events,
-                AVG(ea.attendance_count) AS avg_attendance,
-                c.contact_email
-            FROM Clubs c
-            JOIN Events e ON c.club_id = e.club_id
-            LEFT JOIN (
-                SELECT event_id, COUNT(*) AS attendance_count
-                FROM Attendance
-                GROUP BY event_id
-            ) ea ON e.event_id = ea.event_id
-            WHERE c.club_id != %s
-                AND c.category IN (
-                    SELECT category 
-                    FROM Clubs 
-                    WHERE club_id = %s
-                )
-            GROUP BY c.club_id, c.club_name, c.category, c.contact_email
-            HAVING COUNT(DISTINCT e.event_id) >= %s
-            ORDER BY avg_attendance DESC
-            LIMIT %s
-        """
-        cursor.execute(query, (club_id, club_id, min_events, limit))
-        similar_clubs = cursor.fetchall()
+
+        similar_clubs = club_similarity.similar(club_id, limit, min_events)
+        if similar_clubs is None:
+            return jsonify({"error": "Club not found"}), 404
         return jsonify(similar_clubs), 200
     except Error as e:
         current_app.logger.error(f"Error fetching similar clubs: {e}")
         return jsonify({"error": "Error fetching similar clubs"}), 500
-    finally:
-        cursor.close()
+
+# [EventsCoord-2.6] Clubs sharing members / attendees with this club
+@club_routes.route('/clubs/<int:club_id>/overlap', methods=['GET'])
+def get_club_overlap(club_id):
+    """
+    Clubs with the most shared members (by=members, default) or shared
+    event attendees over the last `days` days (by=attendees), read from the
+    precomputed club x club overlap matrices. Query params: by, days
+    (30, 90 or 365; default 90), limit (default 10).
+    """
+    by = request.args.get('by', 'members')
+    days = request.args.get('days', DEFAULT_OVERLAP_WINDOW, type=int)
+    limit = request.args.get('limit', 10, type=int)
+    if by not in ('members', 'attendees'):
+        return jsonify({"error": "by must be 'members' or 'attendees'"}), 400
+    if days not in OVERLAP_WINDOWS:
+        return jsonify({"error": f"days must be one of {', '.join(map(str, OVERLAP_WINDOWS))}"}), 400
+
+    try:
+        overlap = club_overlap.top(club_id, by, days, limit)
+        if overlap is None:
+            return jsonify({"error": "Club not found"}), 404
+        return jsonify(overlap), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching club overlap: {e}")
+        return jsonify({"error": "Error fetching club overlap"}), 500
 
 # [DataAnalyst-4.5] Get club performance metrics
 @club_routes.route('/performance', methods=['GET'])
 def get_club_performance():
-    try:
-        days = request.args.get('days', 90, type=int)
-        start_date_str = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
-        min_events = 1 
-        
-        cursor = db.cursor(dictionary=True)
-        query = """
-            SELECT 
-                c.clubID as club_id,
-                c.name as club_name,
-                COUNT(DISTINCT e.eventID) AS total_events,
-                COUNT(DISTINCT r.rsvpID) AS total_rsvps,
-                COUNT(DISTINCT sea.attendanceID) AS total_attendance,
-                ROUND(AVG(event_attendance.attendance_count), 2) AS avg_attendance_per_event,
-                ROUND(AVG(event_attendance.attendance_count) * 100.0 / 
-                    NULLIF(AVG(e.capacity), 0), 2) AS avg_capacity_utilization
-            FROM Clubs c
-            JOIN Events e ON c.clubID = e.clubID
-            LEFT JOIN RSVPs r ON e.eventID = r.eventID
-                AND r.timestamp >= %s
-            LEFT JOIN Students_Event_Attendees sea ON e.eventID = sea.eventID
-                AND sea.timestamp >= %s
-            LEFT JOIN (
-                SELECT eventID, COUNT(*) AS attendance_count
-                FROM Students_Event_Attendees
-                WHERE timestamp >= %s
-                GROUP BY eventID
-            ) event_attendance ON e.eventID = event_attendance.eventID
-            WHERE e.startDateTime >= %s
-            GROUP BY c.clubID, c.name
-            HAVING COUNT(DISTINCT e.eventID) >= %s
-            ORDER BY avg_attendance_per_event DESC
-        """
+    """
+    Per-club performance for events started in the last ?days= days
+    (default 90), optionally for one ?club_id=. Results are shared per
+    window through the performance cache.
+    """
+    days = request.args.get('days', 90, type=int)
+    club_id = request.args.get('club_id', type=int)
+    min_events = request.args.get('min_events', 1, type=int)
+    if days is None or not 1 <= days <= MAX_PERFORMANCE_DAYS:
+        return jsonify({"error": f"days must be between 1 and {MAX_PERFORMANCE_DAYS}"}), 400
+    if min_events is None or min_events < 1:
+        return jsonify({"error": "min_events must be a positive integer"}), 400
 
-        cursor.execute(query, (start_date_str, start_date_str, start_date_str, start_date_str, min_events))
-        performance = cursor.fetchall()
+    try:
+        performance = performance_cache.get(days, club_id, min_events)
         return jsonify(performance), 200
     except Error as e:
         current_app.logger.error(f"Error fetching club performance: {e}")
         return jsonify({"error": "Error fetching club performance"}), 500
-    finally:
-        cursor.close()
\ No newline at end of file
@@ -0,0 +1,128 @@
+#------------------------------------------------------------
+# Club_Metrics refresh: recompute the time-based columns
+#------------------------------------------------------------
+from backend.db_connection import db
+
+
+# Seconds between refreshes of the rolling-window columns
+CLUB_METRICS_REFRESH_INTERVAL = 10 * 60
+
+# ?metric= name -> Club_Metrics column; each has a (column, clubID) index
+RANKING_METRICS = {
+    "member_count": "memberCount",
+    "event_count": "eventCount",
+    "upcoming_events": "upcomingEvents",
+    "attendance_30d": "attendance30d",
+    "attendance_90d": "attendance90d",
+    "budget": "budget",
+    "competitiveness_level": "competitivenessLevel",
+}
+
+# Club_Metrics columns as returned by the API
+METRIC_COLUMNS = ", ".join(f"cm.{column} AS {name}" for name, column in RANKING_METRICS.items())
+
+# Keywords kept per club in Club_Metrics.topKeywords
+TOP_KEYWORDS = 5
+
+
+def refresh_club_metrics():
+    """
+    Rewrite every Club_Metrics row from the source tables in one statement.
+    The triggers keep the counts exact between runs; this slides the
+    upcoming / 30-day / 90-day windows forward, recomputes the comparison
+    facts, creates missing rows and corrects any drift.
+    """
+    cursor = db.get_db().cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO Club_Metrics
+                (clubID, memberCount, eventCount, upcomingEvents, attendance30d,
+                 attendance90d, budget, competitivenessLevel, eventsPerMonth, avgAttendance,
+                 rsvpConversion, topKeywords, refreshedAt)
+            SELECT * FROM (
+                SELECT
+                    c.clubID,
+                    COALESCE(m.members, 0) AS memberCount,
+                    COALESCE(ev.events, 0) AS eventCount,
+                    COALESCE(ev.upcoming, 0) AS upcomingEvents,
+                    COALESCE(a.attendance30d, 0) AS attendance30d,
+                    COALESCE(a.attendance90d, 0) AS attendance90d,
+                    COALESCE(c.budget, 0) AS budget,
+                    COALESCE(c.competitiveness_level, 0) AS competitivenessLevel,
+                    COALESCE(ev.last_year, 0) / 12 AS eventsPerMonth,
+                    COALESCE(pa.attendees / NULLIF(ev.past, 0), 0) AS avgAttendance,
+                    COALESCE(rv.converted / NULLIF(rv.rsvps, 0), 0) AS rsvpConversion,
+                    kw.keywords AS topKeywords,
+                    NOW() AS refreshedAt
+                FROM Clubs c
+                LEFT JOIN (
+                    SELECT club_id, COUNT(*) AS members
+                    FROM club_memberships
+                    GROUP BY club_id
+                ) m ON m.club_id = c.clubID
+                LEFT JOIN (
+                    SELECT clubID,
+                           COUNT(*) AS events,
+                           SUM(startDateTime >= NOW()) AS upcoming,
+                           SUM(startDateTime < NOW()) AS past,
+                           SUM(startDateTime >= NOW() - INTERVAL 12 MONTH AND startDateTime < NOW()) AS last_year
+                    FROM Events
+                    GROUP BY clubID
+                ) ev ON ev.clubID = c.clubID
+                LEFT JOIN (
+                    SELECT e.clubID,
+                           SUM(sea.timestamp >= NOW() - INTERVAL 30 DAY) AS attendance30d,
+                           COUNT(*) AS attendance90d
+                    FROM Students_Event_Attendees sea
+                    JOIN Events e ON e.eventID = sea.eventID
+                    WHERE sea.timestamp >= NOW() - INTERVAL 90 DAY
+                    GROUP BY e.clubID
+                ) a ON a.clubID = c.clubID
+                LEFT JOIN (
+                    SELECT e.clubID, COUNT(*) AS attendees
+                    FROM Students_Event_Attendees sea
+                    JOIN Events e ON e.eventID = sea.eventID
+                    WHERE e.startDateTime < NOW()
+                    GROUP BY e.clubID
+                ) pa ON pa.clubID = c.clubID
+                LEFT JOIN (
+                    SELECT e.clubID, COUNT(*) AS rsvps, COUNT(sea.attendanceID) AS converted
+                    FROM RSVPs r
+                    JOIN Events e ON e.eventID = r.eventID
+                    LEFT JOIN Students_Event_Attendees sea
+                        ON sea.eventID = r.eventID AND sea.studentID = r.studentID
+                    WHERE r.status = 'confirmed' AND e.startDateTime < NOW()
+                    GROUP BY e.clubID
+                ) rv ON rv.clubID = c.clubID
+                LEFT JOIN (
+                    SELECT clubID, GROUP_CONCAT(keyword ORDER BY position SEPARATOR ', ') AS keywords
+                    FROM (
+                        SELECT e.clubID, k.keyword,
+                               ROW_NUMBER() OVER (PARTITION BY e.clubID
+                                                  ORDER BY COUNT(*) DESC, k.keyword) AS position
+                        FROM Events_Event_Keywords eek
+                        JOIN Events e ON e.eventID = eek.eventID
+                        JOIN Keywords k ON k.keywordID = eek.keywordID
+                        GROUP BY e.clubID, k.keywordID, k.keyword
+                    ) ranked
+                    WHERE position <= %s
+                    GROUP BY clubID
+                ) kw ON kw.clubID = c.clubID
+            ) AS fresh
+            ON DUPLICATE KEY UPDATE
+                memberCount = fresh.memberCount,
+                eventCount = fresh.eventCount,
+                upcomingEvents = fresh.upcomingEvents,
+                attendance30d = fresh.attendance30d,
+                attendance90d = fresh.attendance90d,
+                budget = fresh.budget,
+                competitivenessLevel = fresh.competitivenessLevel,
+                eventsPerMonth = fresh.eventsPerMonth,
+                avgAttendance = fresh.avgAttendance,
+                rsvpConversion = fresh.rsvpConversion,
+                topKeywords = fresh.topKeywords,
+                refreshedAt = fresh.refreshedAt
+        """, (TOP_KEYWORDS,))
+        db.get_db().commit()
+    finally:
+        cursor.close()
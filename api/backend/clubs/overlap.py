@@ -0,0 +1,180 @@
+#------------------------------------------------------------
+# Club x club overlap: shared members and shared event attendees
+#------------------------------------------------------------
+import threading
+import numpy as np
+from scipy import sparse
+from backend.db_connection import db
+
+
+# Seconds between full rebuilds (attendance windows also slide forward on each rebuild)
+OVERLAP_REBUILD_INTERVAL = 60 * 60
+
+# Attendance windows, in days, that shared attendees can be asked for
+OVERLAP_WINDOWS = (30, 90, 365)
+DEFAULT_OVERLAP_WINDOW = 90
+
+
+LOAD_QUERIES = {
+    "clubs": "SELECT clubID, name FROM Clubs",
+    "memberships": "SELECT club_id AS clubID, student_id AS studentID FROM club_memberships",
+    "attendance": """
+        SELECT DISTINCT e.clubID, sea.studentID,
+               DATEDIFF(CURRENT_TIMESTAMP, sea.timestamp) AS days_ago
+        FROM Students_Event_Attendees sea
+        JOIN Events e ON e.eventID = sea.eventID
+        WHERE e.clubID IS NOT NULL
+          AND sea.timestamp >= CURRENT_TIMESTAMP - INTERVAL %s DAY
+    """,
+    "events": "SELECT eventID, clubID FROM Events WHERE clubID IS NOT NULL",
+}
+
+
+class OverlapMatrix:
+    """
+    Symmetric clubs x clubs counts of students in both clubs' sets. Built
+    from a binary students x clubs incidence matrix with one sparse product
+    (I.T @ I, the diagonal holding each set's size) and kept as a LIL
+    matrix so single memberships can be added or removed in place.
+    """
+
+    def __init__(self, club_index, pairs):
+        self.club_index = club_index
+        self.student_clubs = {}
+        for club_id, student_id in pairs:
+            if club_id in club_index:
+                self.student_clubs.setdefault(student_id, set()).add(club_index[club_id])
+
+        students = list(self.student_clubs)
+        rows, cols = [], []
+        for row, student_id in enumerate(students):
+            for column in self.student_clubs[student_id]:
+                rows.append(row)
+                cols.append(column)
+        incidence = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                                      shape=(len(students), len(club_index)))
+        self.counts = (incidence.T @ incidence).tolil()
+
+    def _bump(self, column, student_id, delta):
+        others = self.student_clubs.get(student_id, set())
+        for other in others | {column}:
+            self.counts[column, other] += delta
+            if other != column:
+                self.counts[other, column] += delta
+
+    def add(self, club_id, student_id):
+        column = self.club_index.get(club_id)
+        if column is None or column in self.student_clubs.get(student_id, ()):
+            return False
+        self._bump(column, student_id, 1)
+        self.student_clubs.setdefault(student_id, set()).add(column)
+        return True
+
+    def remove(self, club_id, student_id):
+        column = self.club_index.get(club_id)
+        if column is None or column not in self.student_clubs.get(student_id, ()):
+            return False
+        self.student_clubs[student_id].discard(column)
+        self._bump(column, student_id, -1)
+        return True
+
+    def size(self, column):
+        return int(self.counts[column, column])
+
+    def row(self, column):
+        """{other column: shared count} for one club, without its own diagonal."""
+        return {other: int(count)
+                for other, count in zip(self.counts.rows[column], self.counts.data[column])
+                if other != column and count > 0}
+
+
+class ClubOverlap:
+    """Shared-member matrix plus one shared-attendee matrix per attendance window."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clubs = None
+        self._club_index = {}
+        self._event_club = {}
+        self._members = None
+        self._attendees = {}
+
+    def rebuild(self):
+        rows = {}
+        cursor = db.get_db().cursor()
+        try:
+            for name in ("clubs", "memberships", "events"):
+                cursor.execute(LOAD_QUERIES[name])
+                rows[name] = cursor.fetchall()
+            cursor.execute(LOAD_QUERIES["attendance"], (max(OVERLAP_WINDOWS),))
+            rows["attendance"] = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        club_index = {club["clubID"]: i for i, club in enumerate(rows["clubs"])}
+        members = OverlapMatrix(club_index, ((r["clubID"], r["studentID"]) for r in rows["memberships"]))
+        attendees = {
+            days: OverlapMatrix(club_index, {(r["clubID"], r["studentID"])
+                                             for r in rows["attendance"] if r["days_ago"] < days})
+            for days in OVERLAP_WINDOWS
+        }
+        with self._lock:
+            self._clubs = rows["clubs"]
+            self._club_index = club_index
+            self._event_club = {r["eventID"]: r["clubID"] for r in rows["events"]}
+            self._members = members
+            self._attendees = attendees
+
+    def top(self, club_id, by="members", days=DEFAULT_OVERLAP_WINDOW, limit=10):
+        """Clubs sharing the most members (or recent attendees) with this one; None if unknown."""
+        if self._clubs is None:
+            self.rebuild()
+        with self._lock:
+            column = self._club_index.get(club_id)
+            if column is None:
+                return None
+            members, attendees = self._members, self._attendees[days]
+            shared_members, shared_attendees = members.row(column), attendees.row(column)
+            ranked = shared_members if by == "members" else shared_attendees
+            best = sorted(ranked, key=lambda other: (-ranked[other], other))[:limit]
+            return {
+                "club_id": club_id,
+                "member_count": members.size(column),
+                "attendee_count": attendees.size(column),
+                "days": days,
+                "overlaps": [{
+                    "club_id": self._clubs[other]["clubID"],
+                    "club_name": self._clubs[other]["name"],
+                    "shared_members": shared_members.get(other, 0),
+                    "shared_attendees": shared_attendees.get(other, 0),
+                    "member_count": members.size(other),
+                    "attendee_count": attendees.size(other),
+                } for other in best],
+            }
+
+    def apply_change(self, change):
+        """
+        Change bus subscriber: move the matrices by one membership or one
+        check-in. Attendees leaving a window are dropped by the next rebuild.
+        """
+        if self._clubs is None:
+            return
+        fields = change.fields
+        with self._lock:
+            if change.entity == "club_memberships":
+                club_id, student_id = int(fields["clubID"]), int(fields["studentID"])
+                if change.operation == "delete":
+                    self._members.remove(club_id, student_id)
+                else:
+                    self._members.add(club_id, student_id)
+            elif change.entity == "Students_Event_Attendees":
+                club_id = self._event_club.get(int(fields.get("eventID", 0)))
+                if club_id is not None:
+                    for matrix in self._attendees.values():
+                        matrix.add(club_id, int(fields["studentID"]))
+            elif change.entity == "Events" and change.operation == "insert":
+                if fields.get("clubID") is not None:
+                    self._event_club[int(change.entity_id)] = int(fields["clubID"])
+
+
+club_overlap = ClubOverlap()
@@ -0,0 +1,118 @@
+#------------------------------------------------------------
+# Club performance over a trailing window, cached per window
+#------------------------------------------------------------
+import threading
+import time
+from datetime import datetime, timedelta
+from backend.db_connection import db
+
+
+# Seconds a computed window is served before it is recomputed
+PERFORMANCE_CACHE_TTL = 5 * 60
+
+# Windows (days, club, min events) kept at once; the oldest is dropped first
+PERFORMANCE_CACHE_SIZE = 64
+
+# Longest window accepted by /clubs/performance
+MAX_PERFORMANCE_DAYS = 730
+
+
+PERFORMANCE_QUERY = """
+    SELECT
+        c.clubID AS club_id,
+        c.name AS club_name,
+        COUNT(*) AS total_events,
+        SUM(COALESCE(r.rsvps, 0)) AS total_rsvps,
+        SUM(COALESCE(a.attendance, 0)) AS total_attendance,
+        ROUND(AVG(COALESCE(a.attendance, 0)), 2) AS avg_attendance_per_event,
+        ROUND(SUM(CASE WHEN e.capacity > 0 THEN COALESCE(a.attendance, 0) END) * 100.0 /
+              NULLIF(SUM(CASE WHEN e.capacity > 0 THEN e.capacity END), 0), 2) AS avg_capacity_utilization
+    FROM Events e
+    JOIN Clubs c ON c.clubID = e.clubID
+    LEFT JOIN (
+        SELECT r.eventID, COUNT(*) AS rsvps
+        FROM Events we
+        JOIN RSVPs r ON r.eventID = we.eventID
+        WHERE we.startDateTime >= %(start)s AND we.startDateTime < %(end)s {club_filter}
+            AND r.status <> 'cancelled'
+        GROUP BY r.eventID
+    ) r ON r.eventID = e.eventID
+    LEFT JOIN (
+        SELECT sea.eventID, COUNT(*) AS attendance
+        FROM Events we
+        JOIN Students_Event_Attendees sea ON sea.eventID = we.eventID
+        WHERE we.startDateTime >= %(start)s AND we.startDateTime < %(end)s {club_filter}
+        GROUP BY sea.eventID
+    ) a ON a.eventID = e.eventID
+    WHERE e.startDateTime >= %(start)s AND e.startDateTime < %(end)s {event_filter}
+    GROUP BY c.clubID, c.name
+    HAVING COUNT(*) >= %(min_events)s
+    ORDER BY avg_attendance_per_event DESC, c.clubID
+"""
+
+
+def compute_performance(days, club_id=None, min_events=1):
+    """
+    Per-club events, RSVPs, attendance and capacity use for the events that
+    started in the last `days` days. RSVPs and check-ins are each counted
+    per event in their own subquery and only those counts are joined to
+    the events, so neither fact table multiplies the other.
+    """
+    end = datetime.now().replace(microsecond=0)
+    params = {"start": end - timedelta(days=days), "end": end,
+              "min_events": min_events, "club_id": club_id}
+    query = PERFORMANCE_QUERY.format(
+        club_filter="AND we.clubID = %(club_id)s" if club_id is not None else "",
+        event_filter="AND e.clubID = %(club_id)s" if club_id is not None else "",
+    )
+    cursor = db.get_db().cursor()
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class PerformanceCache:
+    """
+    Computed performance tables keyed by (days, club, min events). Every
+    caller asking for the same window shares one result until it expires
+    or an event, RSVP or check-in is written.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generation = 0
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, days, club_id=None, min_events=1):
+        key = (days, club_id, min_events)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < PERFORMANCE_CACHE_TTL:
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+            generation = self._generation
+
+        rows = compute_performance(days, club_id, min_events)
+        with self._lock:
+            if generation != self._generation:
+                # A write landed while computing: serve the rows, don't keep them
+                return rows
+            self._entries.pop(key, None)
+            self._entries[key] = (now, rows)
+            while len(self._entries) > PERFORMANCE_CACHE_SIZE:
+                self._entries.pop(next(iter(self._entries)))
+        return rows
+
+    def apply_change(self, change):
+        """Change bus subscriber: any event, RSVP or check-in write drops every window."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+performance_cache = PerformanceCache()
@@ -0,0 +1,230 @@
+#------------------------------------------------------------
+# Quarterly club rankings: composite scores written to Rankings
+#------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from flask import current_app
+from backend.db_connection import db
+
+
+# Seconds between recomputations of the current (and previous) quarter
+RANKINGS_INTERVAL = 24 * 60 * 60
+
+# Quarters recomputed at the same time by POST /clubs/rankings/compute
+RANKINGS_WORKERS = 4
+
+# Component -> weight in the composite score (weights add up to 1)
+RANKING_COMPONENTS = {
+    "Attendance": 0.30,
+    "Growth": 0.20,
+    "RSVP Conversion": 0.20,
+    "Capacity Utilization": 0.15,
+    "Collaboration": 0.15,
+}
+COMPOSITE_RANKING = "Composite"
+
+# Rows per multi-row INSERT statement
+INSERT_CHUNK_SIZE = 1000
+
+
+# Per-club raw figures for one quarter; every query takes (start, end)
+QUARTER_QUERIES = {
+    "attendance": """
+        SELECT clubID,
+               SUM(attendees) AS attendance,
+               SUM(CASE WHEN capacity > 0 THEN attendees END) AS seated,
+               SUM(CASE WHEN capacity > 0 THEN capacity END) AS capacity
+        FROM (
+            SELECT e.eventID, e.clubID, e.capacity, COUNT(sea.attendanceID) AS attendees
+            FROM Events e
+            LEFT JOIN Students_Event_Attendees sea ON sea.eventID = e.eventID
+            WHERE e.startDateTime >= %s AND e.startDateTime < %s
+            GROUP BY e.eventID, e.clubID, e.capacity
+        ) per_event
+        GROUP BY clubID
+    """,
+    "rsvps": """
+        SELECT e.clubID, COUNT(*) AS rsvps, COUNT(sea.attendanceID) AS converted
+        FROM RSVPs r
+        JOIN Events e ON e.eventID = r.eventID
+        LEFT JOIN Students_Event_Attendees sea
+            ON sea.eventID = r.eventID AND sea.studentID = r.studentID
+        WHERE r.status = 'confirmed'
+          AND e.startDateTime >= %s AND e.startDateTime < %s
+        GROUP BY e.clubID
+    """,
+    "members": """
+        SELECT club_id AS clubID,
+               SUM(join_date < %s) AS members_at_start,
+               SUM(join_date >= %s AND join_date < %s) AS joined
+        FROM club_memberships
+        GROUP BY club_id
+    """,
+    "collaborations": """
+        SELECT clubID, COUNT(*) AS collaborations
+        FROM (
+            SELECT col.clubID
+            FROM Collaborations col
+            JOIN Events e ON e.eventID = col.eventID
+            WHERE e.startDateTime >= %s AND e.startDateTime < %s
+            UNION ALL
+            SELECT e.clubID
+            FROM Collaborations col
+            JOIN Events e ON e.eventID = col.eventID
+            WHERE e.startDateTime >= %s AND e.startDateTime < %s
+        ) partners
+        GROUP BY clubID
+    """,
+}
+
+
+def quarter_bounds(year, quarter):
+    """[start, end) datetimes of a calendar quarter."""
+    start = datetime(year, 3 * (quarter - 1) + 1, 1)
+    end = datetime(year + quarter // 4, (3 * quarter) % 12 + 1, 1)
+    return start, end
+
+
+def current_quarter(now=None):
+    now = now or datetime.now()
+    return now.year, (now.month - 1) // 3 + 1
+
+
+def previous_quarter(year, quarter):
+    return (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+
+
+def parse_period(period):
+    """'2025-Q4' -> (2025, 4); raises ValueError on anything else."""
+    year, quarter = period.upper().split("-Q")
+    year, quarter = int(year), int(quarter)
+    if not 1 <= quarter <= 4:
+        raise ValueError(f"Bad quarter in {period}")
+    return year, quarter
+
+
+def _scale(values):
+    """Min-max scale to 0..100; all-equal columns score 0."""
+    low, high = values.min(initial=0.0), values.max(initial=0.0)
+    if high == low:
+        return np.zeros_like(values)
+    return 100.0 * (values - low) / (high - low)
+
+
+def _positions(values):
+    """Competition ranks (1 = best, ties share a position) for every entry."""
+    descending = np.sort(values)[::-1]
+    return np.searchsorted(-descending, -values, side="left") + 1
+
+
+def score_quarter(club_ids, figures):
+    """
+    Component and composite scores for every club in one pass.
+    `figures` maps a column name to a per-club float array aligned with club_ids.
+    Returns {ranking type: (scores, positions)}.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = {
+            "Attendance": figures["attendance"],
+            "Growth": np.where(figures["members_at_start"] > 0,
+                               figures["joined"] / figures["members_at_start"],
+                               np.minimum(figures["joined"], 1.0)),
+            "RSVP Conversion": np.where(figures["rsvps"] > 0, figures["converted"] / figures["rsvps"], 0.0),
+            "Capacity Utilization": np.where(figures["capacity"] > 0,
+                                             np.minimum(figures["seated"] / figures["capacity"], 1.0), 0.0),
+            "Collaboration": figures["collaborations"],
+        }
+
+    results = {}
+    composite = np.zeros(len(club_ids))
+    for component, weight in RANKING_COMPONENTS.items():
+        scores = _scale(raw[component])
+        composite += weight * scores
+        results[component] = (scores, _positions(scores))
+    results[COMPOSITE_RANKING] = (composite, _positions(composite))
+    return results
+
+
+def compute_quarter(year, quarter):
+    """Compute and upsert every ranking type of one quarter. Returns the number of clubs ranked."""
+    start, end = quarter_bounds(year, quarter)
+    cursor = db.get_db().cursor()
+    try:
+        cursor.execute("SELECT clubID FROM Clubs ORDER BY clubID")
+        club_ids = [row["clubID"] for row in cursor.fetchall()]
+        if not club_ids:
+            return 0
+        position = {club_id: i for i, club_id in enumerate(club_ids)}
+
+        params = {
+            "attendance": (start, end),
+            "rsvps": (start, end),
+            "members": (start, start, end),
+            "collaborations": (start, end, start, end),
+        }
+        figures = {}
+        for name, query in QUARTER_QUERIES.items():
+            cursor.execute(query, params[name])
+            for row in cursor.fetchall():
+                i = position.get(row["clubID"])
+                if i is None:
+                    continue
+                for column, value in row.items():
+                    if column != "clubID":
+                        figures.setdefault(column, np.zeros(len(club_ids)))[i] = float(value or 0)
+        for column in ("attendance", "seated", "capacity", "rsvps", "converted",
+                       "members_at_start", "joined", "collaborations"):
+            figures.setdefault(column, np.zeros(len(club_ids)))
+
+        results = score_quarter(club_ids, figures)
+
+        computed_at = datetime.now().replace(microsecond=0)
+        rows = [
+            (club_id, round(float(scores[i]), 2), ranking_type, year, quarter, int(positions[i]), computed_at)
+            for ranking_type, (scores, positions) in results.items()
+            for i, club_id in enumerate(club_ids)
+        ]
+        for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[offset:offset + INSERT_CHUNK_SIZE]
+            cursor.execute(f"""
+                INSERT INTO Rankings
+                    (clubID, rankingValue, rankingType, rankingYear, rankingQuarter, rankPosition, computedAt)
+                VALUES {', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(chunk))} AS new
+                ON DUPLICATE KEY UPDATE
+                    rankingValue = new.rankingValue,
+                    rankPosition = new.rankPosition,
+                    computedAt = new.computedAt
+            """, [value for row in chunk for value in row])
+        db.get_db().commit()
+        return len(club_ids)
+    finally:
+        cursor.close()
+
+
+def compute_quarters(quarters):
+    """
+    Recompute several quarters at once, one worker (and one database
+    connection) per quarter. Returns {"YYYY-Qn": clubs ranked or error}.
+    """
+    app = current_app._get_current_object()
+
+    def run(year, quarter):
+        with app.app_context():
+            try:
+                return compute_quarter(year, quarter)
+            except Exception as e:
+                db.get_db().rollback()
+                app.logger.error(f"Ranking computation for {year}-Q{quarter} failed: {e}")
+                return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=RANKINGS_WORKERS, thread_name_prefix="rankings") as pool:
+        futures = {f"{year}-Q{quarter}": pool.submit(run, year, quarter) for year, quarter in quarters}
+        return {period: future.result() for period, future in futures.items()}
+
+
+def compute_recent_rankings():
+    """Scheduled job: the current quarter, plus the previous one for late check-ins."""
+    year, quarter = current_quarter()
+    compute_quarter(year, quarter)
+    compute_quarter(*previous_quarter(year, quarter))
@@ -0,0 +1,290 @@
+#------------------------------------------------------------
+# Club similarity: feature vectors and overlaps for all clubs at once
+#------------------------------------------------------------
+import threading
+import numpy as np
+from scipy import sparse
+from backend.db_connection import db
+
+
+# Seconds between full reloads from the database (writes are applied in between)
+SIMILARITY_REBUILD_INTERVAL = 30 * 60
+
+# Neighbours kept per club
+SIMILAR_TOP_K = 25
+
+# How the three similarities are blended into one score
+CONTENT_WEIGHT = 0.4
+MEMBER_OVERLAP_WEIGHT = 0.3
+ATTENDEE_OVERLAP_WEIGHT = 0.3
+
+# Weight of each kind of content feature before normalization
+CONTENT_FEATURE_WEIGHTS = {"category": 1.0, "type": 0.5, "budget": 0.5,
+                           "competitiveness": 0.5, "keyword": 1.0}
+
+# Budgets are bucketed into this many quantile bands
+BUDGET_BANDS = 4
+
+
+LOAD_QUERIES = {
+    "clubs": """
+        SELECT c.clubID, c.name, c.email, c.type, c.budget, c.competitiveness_level,
+               c.categoryID, cat.name AS category
+        FROM Clubs c
+        LEFT JOIN Categories cat ON cat.categoryID = c.categoryID
+    """,
+    "events": "SELECT eventID, clubID FROM Events WHERE clubID IS NOT NULL",
+    "keywords": """
+        SELECT e.clubID, eek.keywordID
+        FROM Events_Event_Keywords eek
+        JOIN Events e ON e.eventID = eek.eventID
+        WHERE e.clubID IS NOT NULL
+    """,
+    "memberships": "SELECT club_id AS clubID, student_id AS studentID FROM club_memberships",
+    "attendance": """
+        SELECT e.clubID, sea.studentID
+        FROM Students_Event_Attendees sea
+        JOIN Events e ON e.eventID = sea.eventID
+        WHERE e.clubID IS NOT NULL
+    """,
+}
+
+
+def _normalize_rows(matrix):
+    """Scale every row of a sparse matrix to unit length (empty rows stay empty)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def jaccard(incidence):
+    """
+    All-pairs Jaccard similarity of the columns of a binary students x clubs
+    matrix: the intersections come from one sparse product, the unions from
+    the column sizes. Returns (jaccard, intersections) as dense arrays.
+    """
+    intersections = (incidence.T @ incidence).toarray()
+    sizes = np.diag(intersections)
+    unions = sizes[:, None] + sizes[None, :] - intersections
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = np.where(unions > 0, intersections / unions, 0.0)
+    return similarity, intersections
+
+
+class ClubSimilarity:
+    """
+    Top-K similar clubs for every club. Each club is a vector of category,
+    type, budget band, competitiveness and keyword profile (cosine), and a
+    set of members and of event attendees (Jaccard). The three are blended
+    into one score for all pairs in a few matrix operations.
+
+    The source rows stay in memory: writes seen on the change bus update
+    them and mark the scores stale, and the next read recomputes the
+    matrices without going back to the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._stale = True
+        self._clubs = []
+        self._club_index = {}
+        self._event_club = {}
+        self._keywords = {}
+        self._members = set()
+        self._attendees = {}
+        self._neighbours = {}
+        self._stats = {}
+
+    def rebuild(self):
+        """Reload every source from the database and recompute."""
+        rows = {}
+        cursor = db.get_db().cursor()
+        try:
+            for name, query in LOAD_QUERIES.items():
+                cursor.execute(query)
+                rows[name] = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        keywords = {}
+        for row in rows["keywords"]:
+            key = (row["clubID"], row["keywordID"])
+            keywords[key] = keywords.get(key, 0) + 1
+        attendees = {}
+        for row in rows["attendance"]:
+            key = (row["clubID"], row["studentID"])
+            attendees[key] = attendees.get(key, 0) + 1
+
+        with self._lock:
+            self._clubs = rows["clubs"]
+            self._club_index = {club["clubID"]: i for i, club in enumerate(self._clubs)}
+            self._event_club = {row["eventID"]: row["clubID"] for row in rows["events"]}
+            self._keywords = keywords
+            self._members = {(row["clubID"], row["studentID"]) for row in rows["memberships"]}
+            self._attendees = attendees
+            self._loaded = True
+            self._compute()
+
+    def _content_matrix(self):
+        clubs, n = self._clubs, len(self._clubs)
+        columns, entries = {}, []
+
+        def add(row, kind, value, weight):
+            column = columns.setdefault((kind, value), len(columns))
+            entries.append((row, column, weight * CONTENT_FEATURE_WEIGHTS[kind]))
+
+        budgets = np.array([float(c["budget"]) for c in clubs if c["budget"] is not None])
+        edges = np.quantile(budgets, np.linspace(0, 1, BUDGET_BANDS + 1)[1:-1]) if len(budgets) else []
+        levels = [c["competitiveness_level"] for c in clubs if c["competitiveness_level"] is not None]
+        top_level = max(levels, default=0) or 1
+
+        for i, club in enumerate(clubs):
+            if club["categoryID"] is not None:
+                add(i, "category", club["categoryID"], 1.0)
+            if club["type"]:
+                add(i, "type", club["type"], 1.0)
+            if club["budget"] is not None:
+                add(i, "budget", int(np.searchsorted(edges, float(club["budget"]))), 1.0)
+            if club["competitiveness_level"] is not None:
+                add(i, "competitiveness", None, club["competitiveness_level"] / top_level)
+
+        # Keyword profile: share of the club's keyword uses, so prolific clubs don't dominate
+        totals = {}
+        for (club_id, _), count in self._keywords.items():
+            totals[club_id] = totals.get(club_id, 0) + count
+        for (club_id, keyword_id), count in self._keywords.items():
+            if club_id in self._club_index:
+                add(self._club_index[club_id], "keyword", keyword_id, count / totals[club_id])
+
+        if not entries:
+            return sparse.csr_matrix((n, 1))
+        rows, cols, values = zip(*entries)
+        return sparse.coo_matrix((values, (rows, cols)), shape=(n, len(columns))).tocsr()
+
+    def _incidence(self, pairs):
+        """Binary students x clubs matrix from (clubID, studentID) pairs."""
+        students = {}
+        rows, cols = [], []
+        for club_id, student_id in pairs:
+            column = self._club_index.get(club_id)
+            if column is not None:
+                rows.append(students.setdefault(student_id, len(students)))
+                cols.append(column)
+        return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                 shape=(max(len(students), 1), len(self._clubs)))
+
+    def _compute(self):
+        """Recompute every club's neighbours from the in-memory sources. Caller holds the lock."""
+        n = len(self._clubs)
+        if n == 0:
+            self._neighbours, self._stats, self._stale = {}, {}, False
+            return
+
+        content = _normalize_rows(self._content_matrix())
+        content_similarity = (content @ content.T).toarray()
+        member_similarity, shared_members = jaccard(self._incidence(self._members))
+        attendee_similarity, shared_attendees = jaccard(self._incidence(self._attendees))
+
+        scores = (CONTENT_WEIGHT * content_similarity
+                  + MEMBER_OVERLAP_WEIGHT * member_similarity
+                  + ATTENDEE_OVERLAP_WEIGHT * attendee_similarity)
+        np.fill_diagonal(scores, -np.inf)
+
+        k = min(SIMILAR_TOP_K, n - 1)
+        neighbours = {}
+        if k > 0:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            for i, club in enumerate(self._clubs):
+                neighbours[club["clubID"]] = [{
+                    "club_id": self._clubs[j]["clubID"],
+                    "similarity": round(float(scores[i, j]), 4),
+                    "content_similarity": round(float(content_similarity[i, j]), 4),
+                    "shared_members": int(shared_members[i, j]),
+                    "shared_attendees": int(shared_attendees[i, j]),
+                } for j in top[i]]
+
+        # Activity figures shown next to each suggestion
+        events = np.zeros(n)
+        for club_id in self._event_club.values():
+            if club_id in self._club_index:
+                events[self._club_index[club_id]] += 1
+        attendance = np.zeros(n)
+        for (club_id, _), count in self._attendees.items():
+            if club_id in self._club_index:
+                attendance[self._club_index[club_id]] += count
+        self._stats = {
+            club["clubID"]: {
+                "club_name": club["name"],
+                "category": club["category"],
+                "contact_email": club["email"],
+                "total_events": int(events[i]),
+                "avg_attendance": round(float(attendance[i] / events[i]), 1) if events[i] else 0.0,
+            }
+            for i, club in enumerate(self._clubs)
+        }
+        self._neighbours = neighbours
+        self._stale = False
+
+    def similar(self, club_id, limit=10, min_events=0):
+        """Most similar clubs first, or None when the club does not exist."""
+        if not self._loaded:
+            self.rebuild()
+        with self._lock:
+            if self._stale:
+                self._compute()
+            if club_id not in self._neighbours:
+                return None if club_id not in self._club_index else []
+            results = []
+            for neighbour in self._neighbours[club_id]:
+                stats = self._stats[neighbour["club_id"]]
+                if stats["total_events"] >= min_events:
+                    results.append({**neighbour, **stats})
+                if len(results) == limit:
+                    break
+            return results
+
+    def apply_change(self, change):
+        """
+        Change bus subscriber: keep the in-memory sources in step with new
+        events, keywords, memberships and check-ins. Scores are recomputed
+        on the next read.
+        """
+        if not self._loaded:
+            return
+        fields = change.fields
+        with self._lock:
+            if change.entity == "Events":
+                event_id = int(change.entity_id) if change.entity_id is not None else None
+                if change.operation == "delete":
+                    self._event_club.pop(event_id, None)
+                elif fields.get("clubID") is not None:
+                    self._event_club[event_id] = int(fields["clubID"])
+            elif change.entity == "club_memberships":
+                key = (int(fields["clubID"]), int(fields["studentID"]))
+                if change.operation == "delete":
+                    self._members.discard(key)
+                else:
+                    self._members.add(key)
+            elif change.entity == "Students_Event_Attendees":
+                club_id = self._event_club.get(int(fields.get("eventID", 0)))
+                if club_id is None:
+                    return
+                key = (club_id, int(fields["studentID"]))
+                self._attendees[key] = self._attendees.get(key, 0) + 1
+            elif change.entity == "Events_Event_Keywords":
+                club_id = self._event_club.get(int(fields.get("eventID", 0)))
+                if club_id is None or "keywordID" not in fields:
+                    # Whole keyword sets are replaced: only a reload knows the old set
+                    return
+                key = (club_id, int(fields["keywordID"]))
+                delta = -1 if change.operation == "delete" else 1
+                self._keywords[key] = max(self._keywords.get(key, 0) + delta, 0)
+            else:
+                return
+            self._stale = True
+
+
+club_similarity = ClubSimilarity()
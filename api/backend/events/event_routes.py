@@ -3,6 +3,10 @@ from backend.db_connection import db
 from mysql.connector import Error
 from flask import current_app
 from pymysql.cursors import DictCursor
+from backend.exports import export_format, stream_query
+from backend.changes import record_change
+from backend.events.search_log import search_log
+import re
 
 # Create a Blueprint for Events routes
 events = Blueprint("events", __name__)
@@ -66,19 +70,21 @@ def create_event():
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        cursor.execute(query, (
-            data["name"],
-            data.get("description"),
-            data["startDateTime"],
-            data.get("endDateTime"),
-            data.get("location"),
-            data.get("capacity"),
-            data["clubID"],
-            data.get("eventType")
-        ))
+        fields = {
+            "name": data["name"],
+            "description": data.get("description"),
+            "startDateTime": data["startDateTime"],
+            "endDateTime": data.get("endDateTime"),
+            "location": data.get("location"),
+            "capacity": data.get("capacity"),
+            "clubID": data["clubID"],
+            "eventType": data.get("eventType"),
+        }
+        cursor.execute(query, tuple(fields.values()))
+        event_id = cursor.lastrowid
 
+        record_change(cursor, "Events", event_id, "insert", fields)
         db.commit()
-        event_id = cursor.lastrowid
 
         return jsonify({"message": "Event created successfully", "event_id": event_id}), 201
     except Error as e:
@@ -89,6 +95,110 @@ def create_event():
             cursor.close()
 
 
+# Weight of a match in the event name / keywords on top of the match over all columns
+SEARCH_NAME_WEIGHT = 2
+SEARCH_KEYWORD_WEIGHT = 1
+
+_SEARCH_WORD = re.compile(r"[a-z0-9]+")
+
+
+# GET /events/search - Relevance-ranked full-text search over events [Ruth-1]
+@events.route("/events/search", methods=["GET"])
+def search_events():
+    """
+    Search event names, descriptions, search descriptions, club names and
+    keywords. Every word of q matches as a prefix; results are ordered by
+    full-text relevance with extra weight on the name and keywords.
+    Optional: limit (default 20, max 50), upcoming=true, student_id (for
+    the search log). The returned events are logged to Searches/Search_Result.
+    """
+    cursor = None
+    try:
+        query_text = request.args.get("q", "").strip()
+        words = _SEARCH_WORD.findall(query_text.lower())
+        if not words:
+            return jsonify({"error": "q must contain at least one word"}), 400
+
+        try:
+            limit = min(max(int(request.args.get("limit", 20)), 1), 50)
+            student_id = request.args.get("student_id", type=int)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        upcoming = request.args.get("upcoming", "false").lower() in ("1", "true", "yes")
+
+        # Words are plain [a-z0-9]+, so no boolean operator can sneak in
+        boolean_query = " ".join(f"{word}*" for word in words)
+
+        upcoming_join = """
+            JOIN Events ue ON ue.eventID = es.eventID AND ue.startDateTime >= CURRENT_TIMESTAMP
+        """ if upcoming else ""
+
+        # Rank on the side table alone, then join only the page to Events/Clubs
+        query = f"""
+        SELECT
+            e.eventID,
+            e.name,
+            e.description,
+            e.startDateTime,
+            e.endDateTime,
+            e.location,
+            e.buildingName,
+            e.roomNumber,
+            e.capacity,
+            c.name AS club_name,
+            c.clubID,
+            c.type AS club_type,
+            ranked.relevance
+        FROM (
+            SELECT
+                es.eventID,
+                MATCH(es.name, es.body, es.clubName, es.keywords) AGAINST (%s IN BOOLEAN MODE)
+                + %s * MATCH(es.name) AGAINST (%s IN BOOLEAN MODE)
+                + %s * MATCH(es.keywords) AGAINST (%s IN BOOLEAN MODE) AS relevance
+            FROM Event_Search es
+            {upcoming_join}
+            WHERE MATCH(es.name, es.body, es.clubName, es.keywords) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY relevance DESC, es.eventID
+            LIMIT %s
+        ) ranked
+        JOIN Events e ON e.eventID = ranked.eventID
+        LEFT JOIN Clubs c ON c.clubID = e.clubID
+        ORDER BY ranked.relevance DESC, e.eventID
+        """
+
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(query, (
+            boolean_query,
+            SEARCH_NAME_WEIGHT, boolean_query,
+            SEARCH_KEYWORD_WEIGHT, boolean_query,
+            boolean_query, limit,
+        ))
+        results = cursor.fetchall()
+
+        search_log.record_search(query_text, student_id, [row["eventID"] for row in results])
+        return jsonify({"query": query_text, "results": results}), 200
+    except Error as e:
+        current_app.logger.error(f'Error in search_events: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+
+# POST /events/search/clicks - Count a click on a search result [Ruth-1]
+@events.route("/events/search/clicks", methods=["POST"])
+def record_search_click():
+    """Count a click on an event returned by /events/search (body: {"event_id": ...})"""
+    data = request.get_json(silent=True) or {}
+    try:
+        event_id = int(data["event_id"])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "event_id is required"}), 400
+
+    search_log.record_click(event_id)
+    return jsonify({"message": "Click recorded"}), 202
+
+
 # GET /events/{id} - Returns info on a particular event [Ruth-4]
 @events.route("/events/<int:event_id>", methods=["GET"])
 def get_event(event_id):
@@ -177,6 +287,10 @@ def get_event_attendance(event_id):
         ORDER BY sea.timestamp DESC
         """
 
+        fmt = export_format()
+        if fmt:
+            return stream_query(query, (event_id,), fmt, f"event_{event_id}_attendance")
+
         cursor.execute(query, (event_id,))
         attendance = cursor.fetchall()
         return jsonify(attendance), 200
@@ -185,6 +299,89 @@ def get_event_attendance(event_id):
         return jsonify({"error": str(e)}), 500
 
 
+def _export_filters(table_alias, timestamp_column):
+    """WHERE conditions/params for the export routes: event_id, club_id, status, from, to."""
+    conditions = []
+    params = []
+    if request.args.get("event_id"):
+        conditions.append(f"{table_alias}.eventID = %s")
+        params.append(request.args.get("event_id"))
+    if request.args.get("club_id"):
+        conditions.append("e.clubID = %s")
+        params.append(request.args.get("club_id"))
+    if request.args.get("status"):
+        conditions.append(f"{table_alias}.status = %s")
+        params.append(request.args.get("status"))
+    if request.args.get("from"):
+        conditions.append(f"{table_alias}.{timestamp_column} >= %s")
+        params.append(request.args.get("from"))
+    if request.args.get("to"):
+        conditions.append(f"{table_alias}.{timestamp_column} < %s")
+        params.append(request.args.get("to"))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+# GET /events/attendance/export - Stream all attendance records [Sofia-3]
+@events.route("/events/attendance/export", methods=["GET"])
+def export_attendance():
+    """Stream attendance records as CSV/NDJSON, optionally filtered by event, club, status or time range"""
+    try:
+        where, params = _export_filters("sea", "timestamp")
+        query = f"""
+        SELECT
+            sea.attendanceID,
+            sea.eventID,
+            e.name AS event_name,
+            e.clubID,
+            sea.studentID,
+            s.firstName,
+            s.lastName,
+            s.email,
+            sea.status,
+            sea.timestamp AS check_in_time
+        FROM Students_Event_Attendees sea
+        JOIN Events e ON sea.eventID = e.eventID
+        JOIN Students s ON sea.studentID = s.studentID
+        {where}
+        ORDER BY sea.attendanceID
+        """
+        return stream_query(query, params, export_format() or "csv", "attendance")
+    except Error as e:
+        current_app.logger.error(f'Error in export_attendance: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# GET /events/rsvps/export - Stream all RSVP records [Sofia-2]
+@events.route("/events/rsvps/export", methods=["GET"])
+def export_rsvps():
+    """Stream RSVP records as CSV/NDJSON, optionally filtered by event, club, status or time range"""
+    try:
+        where, params = _export_filters("r", "timestamp")
+        query = f"""
+        SELECT
+            r.rsvpID,
+            r.eventID,
+            e.name AS event_name,
+            e.clubID,
+            r.studentID,
+            s.firstName,
+            s.lastName,
+            s.email,
+            r.status,
+            r.timestamp AS rsvp_time
+        FROM RSVPs r
+        JOIN Events e ON r.eventID = e.eventID
+        JOIN Students s ON r.studentID = s.studentID
+        {where}
+        ORDER BY r.rsvpID
+        """
+        return stream_query(query, params, export_format() or "csv", "rsvps")
+    except Error as e:
+        current_app.logger.error(f'Error in export_rsvps: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # POST /events/{id}/attendance - Check in a student [Sofia-3]
 @events.route("/events/<int:event_id>/attendance", methods=["POST"])
 def check_in_student(event_id):
@@ -203,8 +400,11 @@ def check_in_student(event_id):
         """
 
         cursor.execute(query, (data["student_id"], event_id))
-        db.commit()
         attendance_id = cursor.lastrowid
+
+        record_change(cursor, "Students_Event_Attendees", attendance_id, "insert",
+                      {"studentID": data["student_id"], "eventID": event_id, "status": "present"})
+        db.commit()
         return jsonify({"message": "Check-in successful", "attendance_id": attendance_id}), 201
     except Error as e:
         current_app.logger.error(f'Error in check_in_student: {str(e)}')
@@ -261,6 +461,9 @@ def add_event_keyword(event_id):
             "INSERT IGNORE INTO Events_Event_Keywords (eventID, keywordID) VALUES (%s, %s)",
             (event_id, keyword_id)
         )
+        if cursor.rowcount:
+            record_change(cursor, "Events_Event_Keywords", f"{event_id}:{keyword_id}", "insert",
+                          {"eventID": event_id, "keywordID": keyword_id, "keyword": data["keyword"]})
 
         db.commit()
         return jsonify({"message": "Keyword added successfully"}), 201
@@ -294,6 +497,9 @@ def update_event_keywords(event_id):
                 (event_id, keyword_id)
             )
 
+        # The whole keyword set of the event is replaced
+        record_change(cursor, "Events_Event_Keywords", event_id, "update",
+                      {"eventID": event_id, "keywords": data["keywords"]})
         db.commit()
         return jsonify({"message": "Keywords updated successfully"}), 200
     except Error as e:
@@ -317,9 +523,12 @@ def delete_event_keyword(event_id):
             "DELETE FROM Events_Event_Keywords WHERE eventID = %s AND keywordID = %s",
             (event_id, keyword_id)
         )
+        rows_affected = cursor.rowcount
+        if rows_affected:
+            record_change(cursor, "Events_Event_Keywords", f"{event_id}:{keyword_id}", "delete",
+                          {"eventID": event_id, "keywordID": int(keyword_id)})
 
         db.commit()
-        rows_affected = cursor.rowcount
         cursor.close()
 
         if rows_affected == 0:
@@ -413,6 +622,7 @@ def delete_event(event_id):
         
         # Delete the event
         cursor.execute("DELETE FROM Events WHERE eventID = %s", (event_id,))
+        record_change(cursor, "Events", event_id, "delete", event)
         db.commit()
         
         return jsonify({"message": "Event deleted successfully"}), 200
@@ -0,0 +1,178 @@
+#------------------------------------------------------------
+# Buffered logging of event searches and result clicks
+#------------------------------------------------------------
+import atexit
+import threading
+from collections import Counter
+from datetime import datetime
+from backend.db_connection import db
+
+
+# Searches held in memory before new ones are dropped
+SEARCH_LOG_MAX_BUFFERED = 20000
+# Flush as soon as this many searches are waiting...
+SEARCH_LOG_FLUSH_SIZE = 500
+# ...or after this many seconds, whichever comes first
+SEARCH_LOG_FLUSH_INTERVAL = 2.0
+
+# Rows per multi-row INSERT statement
+INSERT_CHUNK_SIZE = 1000
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+class SearchLog:
+    """
+    Records what /events/search returned without making the search wait
+    for the writes: every search becomes a Searches row, a Search_Logs row
+    and one Searches_Search_Results row per result, and each returned
+    event's Search_Result counters are bumped once per flush.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._searches = []
+        self._clicks = Counter()
+        self.stats = {"logged": 0, "flushed": 0, "dropped": 0}
+
+    def init_app(self, app):
+        self.app = app
+        atexit.register(self._flush_on_exit)
+
+    def record_search(self, query, student_id, event_ids):
+        with self._lock:
+            if len(self._searches) >= SEARCH_LOG_MAX_BUFFERED:
+                self.stats["dropped"] += 1
+                return
+            self._searches.append({
+                "timestamp": datetime.now().replace(microsecond=0),
+                "query": query[:255],
+                "student_id": student_id,
+                "event_ids": list(event_ids),
+            })
+            self.stats["logged"] += 1
+            self._start()
+        if len(self._searches) >= SEARCH_LOG_FLUSH_SIZE:
+            self._wake.set()
+
+    def record_click(self, event_id):
+        with self._lock:
+            self._clicks[event_id] += 1
+            self._start()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="search-log-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(SEARCH_LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            with self.app.app_context():
+                self.flush()
+
+    def _take(self):
+        with self._lock:
+            searches, clicks = self._searches, self._clicks
+            self._searches, self._clicks = [], Counter()
+        return searches, clicks
+
+    def flush(self):
+        """Write everything buffered so far. Must run inside an app context."""
+        searches, clicks = self._take()
+        if not searches and not clicks:
+            return
+
+        cursor = db.get_db().cursor()
+        try:
+            # Searches.studentID is a foreign key: unknown students are logged anonymously
+            student_ids = {s["student_id"] for s in searches if s["student_id"] is not None}
+            if student_ids:
+                cursor.execute(f"""
+                    SELECT studentID FROM Students
+                    WHERE studentID IN ({', '.join(['%s'] * len(student_ids))})
+                """, list(student_ids))
+                known = {row["studentID"] for row in cursor.fetchall()}
+                for search in searches:
+                    if search["student_id"] not in known:
+                        search["student_id"] = None
+
+            # One counter bump per event per flush, however many searches returned it
+            appearances = Counter(event_id for s in searches for event_id in s["event_ids"])
+            counted = list(set(appearances) | set(clicks))
+            for chunk in _chunks(counted, INSERT_CHUNK_SIZE):
+                placeholders = ", ".join(["(%s, %s, %s)"] * len(chunk))
+                params = []
+                for event_id in chunk:
+                    params.extend([event_id, clicks[event_id], appearances[event_id]])
+                cursor.execute(f"""
+                    INSERT INTO Search_Result (eventID, clicks, appearances)
+                    VALUES {placeholders} AS new
+                    ON DUPLICATE KEY UPDATE
+                        clicks = COALESCE(Search_Result.clicks, 0) + new.clicks,
+                        appearances = COALESCE(Search_Result.appearances, 0) + new.appearances
+                """, params)
+
+            result_ids = {}
+            for chunk in _chunks(list(appearances), INSERT_CHUNK_SIZE):
+                cursor.execute(f"""
+                    SELECT eventID, resultID FROM Search_Result
+                    WHERE eventID IN ({', '.join(['%s'] * len(chunk))})
+                """, chunk)
+                result_ids.update((row["eventID"], row["resultID"]) for row in cursor.fetchall())
+
+            for chunk in _chunks(searches, INSERT_CHUNK_SIZE):
+                placeholders = ", ".join(["(%s, %s, %s)"] * len(chunk))
+                params = []
+                for search in chunk:
+                    params.extend([search["timestamp"], search["query"], search["student_id"]])
+                cursor.execute(f"""
+                    INSERT INTO Searches (timestamp, searchQuery, studentID)
+                    VALUES {placeholders}
+                """, params)
+                # A multi-row insert gets consecutive IDs starting at lastrowid
+                first_search_id = cursor.lastrowid
+
+                bridge = []
+                for offset, search in enumerate(chunk):
+                    bridge.extend((first_search_id + offset, result_ids[event_id])
+                                  for event_id in search["event_ids"])
+                for bridge_chunk in _chunks(bridge, INSERT_CHUNK_SIZE):
+                    cursor.execute(f"""
+                        INSERT INTO Searches_Search_Results (searchID, resultID)
+                        VALUES {', '.join(['(%s, %s)'] * len(bridge_chunk))}
+                    """, [value for row in bridge_chunk for value in row])
+
+                placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+                params = []
+                for search in chunk:
+                    params.extend([search["student_id"], search["query"],
+                                   len(search["event_ids"]), search["timestamp"]])
+                cursor.execute(f"""
+                    INSERT INTO Search_Logs (studentID, searchQuery, resultsCount, timestamp)
+                    VALUES {placeholders}
+                """, params)
+
+            db.get_db().commit()
+            self.stats["flushed"] += len(searches)
+        except Exception as e:
+            db.get_db().rollback()
+            self.stats["dropped"] += len(searches)
+            self.app.logger.error(f"Search log flush failed, dropped {len(searches)} searches: {e}")
+        finally:
+            cursor.close()
+
+    def _flush_on_exit(self):
+        if self.app is not None and (self._searches or self._clicks):
+            with self.app.app_context():
+                self.flush()
+
+
+search_log = SearchLog()
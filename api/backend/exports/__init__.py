@@ -0,0 +1,83 @@
+#------------------------------------------------------------
+# Streaming CSV / NDJSON exports over an unbuffered cursor
+#------------------------------------------------------------
+import csv
+import io
+import json
+from flask import Response, request, stream_with_context
+from pymysql.cursors import SSDictCursor
+from backend.db_connection import db
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows pulled from the server-side cursor per chunk written to the client
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_format():
+    """Return the requested ?format= if it is an export format, else None."""
+    fmt = request.args.get('format', '').lower()
+    return fmt if fmt in EXPORT_FORMATS else None
+
+
+def _csv_chunks(cursor, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    while True:
+        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([row[c] for c in columns])
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(cursor):
+    while True:
+        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        yield ''.join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def stream_query(query, params, fmt, filename):
+    """
+    Run `query` on an unbuffered SSDictCursor and stream the rows back as
+    CSV or NDJSON, EXPORT_BATCH_SIZE rows at a time. Memory use stays flat
+    however many rows match, and the response goes out with chunked
+    transfer encoding since no Content-Length is known up front.
+
+    The query is executed before the Response is returned so SQL errors
+    still reach the caller's except block as a normal 500.
+    """
+    cursor = db.get_db().cursor(SSDictCursor)
+    cursor.execute(query, params)
+    columns = [column[0] for column in cursor.description]
+
+    def generate():
+        try:
+            if fmt == "csv":
+                yield from _csv_chunks(cursor, columns)
+            else:
+                yield from _ndjson_chunks(cursor)
+        finally:
+            # Closing an unbuffered cursor drains whatever is left unread
+            cursor.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}.{fmt}",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,169 @@
+#------------------------------------------------------------
+# Group invitations: dedupe and insert in batches on a worker pool
+#------------------------------------------------------------
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import g
+from backend.db_connection import db
+from backend.changes import record_change, change_bus
+
+
+# Group invite jobs running at the same time
+INVITE_FANOUT_WORKERS = int(os.getenv("INVITE_FANOUT_WORKERS", "4"))
+
+# Rows per multi-row INSERT / ids per IN (...) lookup
+INVITE_BATCH_SIZE = 500
+
+# Finished jobs stay visible to GET /invitations/jobs/<id> for this long
+JOB_RETENTION = timedelta(hours=1)
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+class InviteFanout:
+    """
+    Runs group invitations in a small thread pool and keeps their progress
+    in memory, so the request that starts one returns a job handle at once.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def init_app(self, app):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=INVITE_FANOUT_WORKERS,
+                                            thread_name_prefix="invite-fanout")
+
+    def submit(self, event_id, sender_id, recipient_ids=None, club_id=None):
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "event_id": event_id,
+            "sender_student_id": sender_id,
+            "club_id": club_id,
+            "requested": len(recipient_ids) if recipient_ids is not None else None,
+            "invited": 0,
+            "skipped": 0,
+            "unknown_student_ids": [],
+            "error": None,
+            "created_at": datetime.now(),
+            "finished_at": None,
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job["job_id"]] = job
+        self._executor.submit(self._run, job, recipient_ids)
+        return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _prune(self):
+        cutoff = datetime.now() - JOB_RETENTION
+        for job_id in [j["job_id"] for j in self._jobs.values()
+                       if j["finished_at"] and j["finished_at"] < cutoff]:
+            del self._jobs[job_id]
+
+    def _update(self, job, **values):
+        with self._lock:
+            job.update(values)
+
+    def _run(self, job, recipient_ids):
+        self._update(job, status="running")
+        with self.app.app_context():
+            try:
+                invited, skipped = self._fan_out(job, recipient_ids)
+                self._update(job, status="done", invited=invited, skipped=skipped)
+            except Exception as e:
+                db.get_db().rollback()
+                self.app.logger.error(f"Group invite job {job['job_id']} failed: {e}")
+                self._update(job, status="failed", error=str(e))
+            finally:
+                self._update(job, finished_at=datetime.now())
+
+    def _fan_out(self, job, recipient_ids):
+        event_id = job["event_id"]
+        sender_id = job["sender_student_id"]
+
+        cursor = db.get_db().cursor()
+        try:
+            cursor.execute("SELECT eventID FROM Events WHERE eventID = %s", (event_id,))
+            if cursor.fetchone() is None:
+                raise ValueError(f"Event {event_id} not found")
+
+            if job["club_id"] is not None:
+                cursor.execute(
+                    "SELECT student_id FROM club_memberships WHERE club_id = %s",
+                    (job["club_id"],),
+                )
+                recipient_ids = [row["student_id"] for row in cursor.fetchall()]
+                self._update(job, requested=len(recipient_ids))
+
+            recipients = list(dict.fromkeys(int(r) for r in recipient_ids if int(r) != sender_id))
+
+            # Drop unknown students (they would fail the whole insert on the
+            # foreign key) and anyone already invited to, or going to, the event
+            known = set()
+            already = set()
+            for chunk in _chunks(recipients, INVITE_BATCH_SIZE):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"""
+                    SELECT studentID AS student_id
+                    FROM Students
+                    WHERE studentID IN ({placeholders})
+                """, chunk)
+                known.update(row["student_id"] for row in cursor.fetchall())
+                cursor.execute(f"""
+                    SELECT recipientStudentID AS student_id
+                    FROM Event_Invitations
+                    WHERE eventID = %s AND recipientStudentID IN ({placeholders})
+                    UNION
+                    SELECT studentID
+                    FROM RSVPs
+                    WHERE eventID = %s AND studentID IN ({placeholders})
+                """, [event_id, *chunk, event_id, *chunk])
+                already.update(row["student_id"] for row in cursor.fetchall())
+            unknown = [r for r in recipients if r not in known]
+            if unknown:
+                self._update(job, unknown_student_ids=unknown)
+            to_invite = [r for r in recipients if r in known and r not in already]
+
+            for chunk in _chunks(to_invite, INVITE_BATCH_SIZE):
+                placeholders = ", ".join(["(%s, %s, %s, 'pending', CURRENT_TIMESTAMP)"] * len(chunk))
+                params = []
+                for recipient_id in chunk:
+                    params.extend([event_id, sender_id, recipient_id])
+                cursor.execute(f"""
+                    INSERT INTO Event_Invitations
+                        (eventID, senderStudentID, recipientStudentID, status, sentAt)
+                    VALUES {placeholders}
+                """, params)
+                # One change per batch: multi-row inserts don't report every new ID
+                record_change(cursor, "Event_Invitations", None, "insert", {
+                    "eventID": event_id,
+                    "senderStudentID": sender_id,
+                    "recipientStudentIDs": chunk,
+                    "status": "pending",
+                })
+
+            db.get_db().commit()
+        finally:
+            cursor.close()
+
+        # Outside a request nothing publishes the recorded changes for us
+        change_bus.publish(g.pop("pending_changes", []))
+        return len(to_invite), len(recipient_ids) - len(to_invite)
+
+
+invite_fanout = InviteFanout()
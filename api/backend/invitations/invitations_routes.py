@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from backend.db_connection import db
 from mysql.connector import Error
 from flask import current_app
+from backend.changes import record_change
+from backend.invitations.fanout import invite_fanout, INVITE_BATCH_SIZE
 
 invitation_routes = Blueprint("invitation_routes", __name__)
 
@@ -22,10 +24,16 @@ def create_invitation():
             VALUES (%s, %s, %s, 'pending', CURRENT_TIMESTAMP)
         """
         cursor.execute(insert_query, (event_id, sender_id, recipient_id))
-        db.commit()
-
         new_id = cursor.lastrowid
 
+        record_change(cursor, "Event_Invitations", new_id, "insert", {
+            "eventID": event_id,
+            "senderStudentID": sender_id,
+            "recipientStudentID": recipient_id,
+            "status": "pending",
+        })
+        db.commit()
+
         # (Optional but nice) return the created invitation row
         select_query = """
             SELECT
@@ -47,4 +55,76 @@ def create_invitation():
         current_app.logger.error(f"Error creating invitation: {e}")
         return jsonify({"error": "Error creating invitation"}), 500
     finally:
-        cursor.close()
\ No newline at end of file
+        cursor.close()
+
+
+# Most recipients one group invite may list explicitly
+MAX_GROUP_RECIPIENTS = 20 * INVITE_BATCH_SIZE
+
+
+@invitation_routes.route("/invitations/group", methods=["POST"])
+def create_group_invitation():
+    """
+    Invite many students to an event in one request, either a list
+      {"event_id": 1, "sender_student_id": 2, "recipient_student_ids": [3, 4]}
+    or every member of a club
+      {"event_id": 1, "sender_student_id": 2, "club_id": 50000001}
+    Students already invited to or RSVP'd for the event, and unknown
+    student IDs (listed in the job's unknown_student_ids), are skipped. The
+    invitations are written in the background; poll the returned job.
+    """
+    data = request.get_json(silent=True) or {}
+    event_id = data.get("event_id")
+    sender_id = data.get("sender_student_id")
+    recipient_ids = data.get("recipient_student_ids")
+    club_id = data.get("club_id")
+
+    if event_id is None or sender_id is None:
+        return jsonify({"error": "event_id and sender_student_id are required"}), 400
+    if (recipient_ids is None) == (club_id is None):
+        return jsonify({"error": "Provide either recipient_student_ids or club_id"}), 400
+    try:
+        event_id = int(event_id)
+        sender_id = int(sender_id)
+        club_id = int(club_id) if club_id is not None else None
+        if recipient_ids is not None:
+            if not isinstance(recipient_ids, list):
+                return jsonify({"error": "recipient_student_ids must be a list"}), 400
+            if len(recipient_ids) > MAX_GROUP_RECIPIENTS:
+                return jsonify({"error": f"At most {MAX_GROUP_RECIPIENTS} recipients per request"}), 400
+            recipient_ids = [int(r) for r in recipient_ids]
+    except (TypeError, ValueError):
+        return jsonify({"error": "IDs must be integers"}), 400
+
+    # Fail here rather than in the background job the client only polls
+    cursor = None
+    try:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("SELECT eventID FROM Events WHERE eventID = %s", (event_id,))
+        if cursor.fetchone() is None:
+            return jsonify({"error": "Event not found"}), 404
+        cursor.execute("SELECT studentID FROM Students WHERE studentID = %s", (sender_id,))
+        if cursor.fetchone() is None:
+            return jsonify({"error": "Sender not found"}), 404
+        if club_id is not None:
+            cursor.execute("SELECT clubID FROM Clubs WHERE clubID = %s", (club_id,))
+            if cursor.fetchone() is None:
+                return jsonify({"error": "Club not found"}), 404
+    except Error as e:
+        current_app.logger.error(f"Error checking group invitation: {e}")
+        return jsonify({"error": "Error creating group invitation"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+    job = invite_fanout.submit(event_id, sender_id, recipient_ids=recipient_ids, club_id=club_id)
+    return jsonify(job), 202
+
+
+@invitation_routes.route("/invitations/jobs/<job_id>", methods=["GET"])
+def get_group_invitation_job(job_id):
+    """Progress of a group invite: queued, running, done or failed, with counts."""
+    job = invite_fanout.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
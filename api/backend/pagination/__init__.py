@@ -0,0 +1,37 @@
+#------------------------------------------------------------
+# Helpers shared by the keyset (cursor) paginated endpoints
+#------------------------------------------------------------
+import base64
+import json
+from flask import request
+
+
+def encode_cursor(*values):
+    """
+    Pack the sort key of the last row on a page into an opaque token.
+    Datetimes become 'YYYY-MM-DD HH:MM:SS' strings, which MySQL
+    compares correctly against DATETIME columns.
+    """
+    raw = json.dumps(list(values), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(token):
+    """Return the list of values packed by encode_cursor, or None if the token is bad."""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    # Well-formed JSON that encode_cursor could not have produced is bad too
+    if not isinstance(values, list) or not all(
+            value is None or isinstance(value, (str, int, float)) for value in values):
+        return None
+    return values
+
+
+def get_page_limit(default=50, maximum=500):
+    """Read ?limit= from the request, clamped to [1, maximum]."""
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit, maximum))
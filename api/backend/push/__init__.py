@@ -0,0 +1,121 @@
+#------------------------------------------------------------
+# In-process publish/subscribe bus behind the /push SSE stream
+#------------------------------------------------------------
+import json
+import queue
+import threading
+
+
+# Messages a slow subscriber may have pending before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_INTERVAL = 15
+
+
+class Subscription:
+    """One connected client: the topics it listens to and its pending messages."""
+
+    def __init__(self, topics):
+        self.topics = set(topics)
+        self.messages = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Next message, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class PushBus:
+    """
+    Topic-based change notifications. Writers publish to topics such as
+    "event:<id>:rsvps" or "alerts"; every publish bumps that topic's
+    version, so a client that remembers the versions it has seen only
+    needs to refetch when one of them moves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._versions = {}
+
+    def subscribe(self, topics):
+        subscription = Subscription(topics)
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._subscribers.get(topic)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def versions(self, topics):
+        with self._lock:
+            return {topic: self._versions.get(topic, 0) for topic in topics}
+
+    def publish(self, topic, data=None):
+        """Bump the topic's version and notify its subscribers. Never blocks."""
+        with self._lock:
+            version = self._versions.get(topic, 0) + 1
+            self._versions[topic] = version
+            subscribers = list(self._subscribers.get(topic, ()))
+
+        message = {"topic": topic, "version": version, "data": data}
+        for subscription in subscribers:
+            try:
+                subscription.messages.put_nowait(message)
+            except queue.Full:
+                # The client fell behind; it gets one "resync" instead of the backlog
+                subscription.overflowed = True
+        return version
+
+    def publish_many(self, topics, data=None):
+        for topic in topics:
+            self.publish(topic, data)
+
+
+# Change bus entity -> push topics it bumps, filled in from the change's
+# fields ("id" is the changed row's primary key)
+CHANGE_TOPICS = {
+    "Events": ("events", "event:{id}"),
+    "RSVPs": ("rsvps", "event:{eventID}:rsvps"),
+    "Students_Event_Attendees": ("event:{eventID}:attendance",),
+    "Event_Invitations": ("invitations", "event:{eventID}:invitations"),
+    "Events_Event_Keywords": ("keywords", "event:{eventID}:keywords"),
+}
+
+
+def publish_change(change):
+    """Change bus subscriber: notify the push topics a committed write touched."""
+    topics = []
+    for template in CHANGE_TOPICS.get(change.entity, ()):
+        try:
+            topics.append(template.format(id=change.entity_id, **change.fields))
+        except KeyError:
+            continue
+    push_bus.publish_many(topics, {"entity": change.entity, "id": change.entity_id,
+                                   "operation": change.operation})
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encode one server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+push_bus = PushBus()
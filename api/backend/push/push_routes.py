@@ -0,0 +1,67 @@
+from flask import Blueprint, jsonify, request, Response
+from backend.push import push_bus, format_sse, KEEPALIVE_INTERVAL
+
+push_routes = Blueprint("push_routes", __name__)
+
+# Most topics one client may listen to on a single stream
+MAX_TOPICS = 50
+
+
+def _requested_topics():
+    topics = [t.strip() for t in request.args.get("topics", "").split(",") if t.strip()]
+    return list(dict.fromkeys(topics))
+
+
+# GET /push/stream?topics=alerts,event:12:rsvps - Server-sent change notifications
+@push_routes.route("/stream", methods=["GET"])
+def stream():
+    """
+    Hold the connection open and send an event every time one of the
+    requested topics changes. The first event is a "snapshot" of the
+    current topic versions; a "resync" carries the same payload and is
+    sent when the client fell too far behind to receive every change.
+    """
+    topics = _requested_topics()
+    if not topics:
+        return jsonify({"error": "topics is required"}), 400
+    if len(topics) > MAX_TOPICS:
+        return jsonify({"error": f"At most {MAX_TOPICS} topics per stream"}), 400
+
+    subscription = push_bus.subscribe(topics)
+
+    def generate():
+        try:
+            yield format_sse(push_bus.versions(topics), event="snapshot")
+            while True:
+                message = subscription.get(timeout=KEEPALIVE_INTERVAL)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while subscription.get(timeout=0) is not None:
+                        pass
+                    yield format_sse(push_bus.versions(topics), event="resync")
+                elif message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(
+                        message,
+                        event="change",
+                        event_id=f"{message['topic']}@{message['version']}",
+                    )
+        finally:
+            push_bus.unsubscribe(subscription)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# GET /push/versions?topics=alerts,metrics - Current version of each topic
+@push_routes.route("/versions", methods=["GET"])
+def get_versions():
+    """Cheap alternative to the stream for clients that can only poll."""
+    topics = _requested_topics()
+    if not topics:
+        return jsonify({"error": "topics is required"}), 400
+    return jsonify(push_bus.versions(topics[:MAX_TOPICS])), 200
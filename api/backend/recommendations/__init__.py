@@ -0,0 +1,297 @@
+#------------------------------------------------------------
+# Personalized event recommendations from sparse feature matrices
+#------------------------------------------------------------
+import threading
+import numpy as np
+from scipy import sparse
+from backend.db_connection import db
+
+
+# Seconds between full rebuilds (RSVPs are applied incrementally in between)
+RECOMMENDATION_REBUILD_INTERVAL = 30 * 60
+
+# Recommendations kept per student
+RECOMMENDATION_TOP_N = 50
+
+# Students scored per dense block in the batch job
+SCORE_BLOCK_SIZE = 1000
+
+# How much each signal adds to a student's profile
+RSVP_WEIGHT = 1.0
+ATTENDANCE_WEIGHT = 2.0
+MEMBERSHIP_WEIGHT = 2.0
+DEMOGRAPHIC_WEIGHT = 0.5
+
+# How much each property of an event counts in its feature vector
+EVENT_FEATURE_WEIGHTS = {"club": 1.0, "keyword": 1.0, "category": 0.5, "type": 0.5}
+# Weight of the event's audience (share of its RSVPs/attendees per major and year)
+AUDIENCE_WEIGHT = 0.5
+
+# Small popularity prior, so students without any signal still get a list
+POPULARITY_WEIGHT = 0.05
+
+
+LOAD_QUERIES = {
+    "events": """
+        SELECT e.eventID, e.clubID, e.eventType, c.categoryID,
+               e.startDateTime >= CURRENT_TIMESTAMP AS upcoming
+        FROM Events e
+        LEFT JOIN Clubs c ON c.clubID = e.clubID
+    """,
+    "keywords": "SELECT eventID, keywordID FROM Events_Event_Keywords",
+    "clubs": "SELECT clubID, categoryID FROM Clubs",
+    "students": "SELECT studentID, major, year FROM Students",
+    "rsvps": """
+        SELECT studentID, eventID
+        FROM RSVPs
+        WHERE status IN ('confirmed', 'waitlisted')
+    """,
+    "attendance": "SELECT studentID, eventID FROM Students_Event_Attendees",
+    "memberships": "SELECT student_id AS studentID, club_id AS clubID FROM club_memberships",
+}
+
+
+class FeatureSpace:
+    """Maps feature keys such as ("club", 3) or ("major", "CS") to matrix columns."""
+
+    def __init__(self):
+        self.columns = {}
+
+    def column(self, kind, value):
+        return self.columns.setdefault((kind, value), len(self.columns))
+
+    def __len__(self):
+        return len(self.columns)
+
+
+def _matrix(entries, shape):
+    """CSR matrix from (row, column, value) triples; duplicate cells are summed."""
+    if not entries:
+        return sparse.csr_matrix(shape, dtype=np.float32)
+    rows, columns, values = zip(*entries)
+    return sparse.coo_matrix((values, (rows, columns)), shape=shape, dtype=np.float32).tocsr()
+
+
+def _normalize_rows(matrix):
+    """Scale every row to unit length (empty rows stay empty)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _top_n(scores, n):
+    """Column indexes of the n highest finite scores, best first."""
+    n = min(n, scores.shape[0])
+    if n == 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-scores, n - 1)[:n]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top[np.isfinite(scores[top])]
+
+
+class RecommendationModel:
+    """
+    One batch build. Students and events live in the same feature space:
+    an event is its club, category, type, keywords and audience; a student
+    is the sum of the events they went to or RSVP'd, the clubs they belong
+    to and their own major/year. Candidates are scored by cosine similarity
+    between the two, plus a small popularity prior.
+    """
+
+    def __init__(self, rows):
+        self.features = FeatureSpace()
+        self.student_index = {r["studentID"]: i for i, r in enumerate(rows["students"])}
+        self.event_index = {r["eventID"]: i for i, r in enumerate(rows["events"])}
+        self.event_ids = np.array([r["eventID"] for r in rows["events"]], dtype=np.int64)
+        n_students, n_events = len(self.student_index), len(self.event_index)
+
+        # Demographics: students x features
+        demographic = []
+        for i, student in enumerate(rows["students"]):
+            if student["major"]:
+                demographic.append((i, self.features.column("major", student["major"]), 1.0))
+            if student["year"] is not None:
+                demographic.append((i, self.features.column("year", student["year"]), 1.0))
+
+        # Event content: events x features
+        content = []
+        for i, event in enumerate(rows["events"]):
+            for kind, value in (("club", event["clubID"]), ("category", event["categoryID"]),
+                                ("type", event["eventType"])):
+                if value is not None:
+                    content.append((i, self.features.column(kind, value), EVENT_FEATURE_WEIGHTS[kind]))
+        for row in rows["keywords"]:
+            if row["eventID"] in self.event_index:
+                content.append((self.event_index[row["eventID"]],
+                                self.features.column("keyword", row["keywordID"]),
+                                EVENT_FEATURE_WEIGHTS["keyword"]))
+
+        # Club content, for memberships: clubs x features
+        club_index = {r["clubID"]: i for i, r in enumerate(rows["clubs"])}
+        club_content = []
+        for i, club in enumerate(rows["clubs"]):
+            club_content.append((i, self.features.column("club", club["clubID"]), EVENT_FEATURE_WEIGHTS["club"]))
+            if club["categoryID"] is not None:
+                club_content.append((i, self.features.column("category", club["categoryID"]),
+                                     EVENT_FEATURE_WEIGHTS["category"]))
+
+        # Interactions: students x events
+        interactions = []
+        for source, weight in (("rsvps", RSVP_WEIGHT), ("attendance", ATTENDANCE_WEIGHT)):
+            for row in rows[source]:
+                s, e = self.student_index.get(row["studentID"]), self.event_index.get(row["eventID"])
+                if s is not None and e is not None:
+                    interactions.append((s, e, weight))
+        memberships = []
+        for row in rows["memberships"]:
+            s, c = self.student_index.get(row["studentID"]), club_index.get(row["clubID"])
+            if s is not None and c is not None:
+                memberships.append((s, c, MEMBERSHIP_WEIGHT))
+
+        n_features = len(self.features)
+        self.demographic = _matrix(demographic, (n_students, n_features))
+        self.content = _matrix(content, (n_events, n_features))
+        self.interactions = _matrix(interactions, (n_students, n_events))
+        members = _matrix(memberships, (n_students, len(club_index)))
+        club_features = _matrix(club_content, (len(club_index), n_features))
+
+        # Audience: share of each event's participants per major/year
+        participated = self.interactions.copy()
+        participated.data[:] = 1.0
+        audience = participated.T @ self.demographic
+        participants = np.asarray(participated.sum(axis=0)).ravel()
+        audience = sparse.diags(AUDIENCE_WEIGHT / np.maximum(participants, 1.0)) @ audience
+
+        # Profiles: students x features
+        self.profiles = (self.interactions @ self.content
+                         + members @ club_features
+                         + DEMOGRAPHIC_WEIGHT * self.demographic).tocsr()
+
+        # Candidates: upcoming events only
+        self.candidate_events = np.array(
+            [r["eventID"] for r in rows["events"] if r["upcoming"]], dtype=np.int64)
+        candidate_rows = [self.event_index[event_id] for event_id in self.candidate_events]
+        self.candidates = _normalize_rows((self.content + audience).tocsr()[candidate_rows]).T.tocsc()
+        self.candidate_position = {int(event_id): i for i, event_id in enumerate(self.candidate_events)}
+
+        popularity = np.log1p(participants[candidate_rows])
+        self.prior = POPULARITY_WEIGHT * popularity / max(float(popularity.max(initial=0.0)), 1.0)
+
+        # Popularity-only list for students created after this build
+        self.popular = self._rank(self.prior.copy(), ())
+
+        # Profiles moved by RSVPs since the build: student row -> 1 x features
+        self.updated_profiles = {}
+
+        # Events a student already RSVP'd to or attended are never recommended
+        self.seen = {}
+        for s, e in zip(*self.interactions.nonzero()):
+            self.seen.setdefault(int(s), set()).add(int(e))
+
+    def _rank(self, scores, seen_rows):
+        """Top-N (event id, score) pairs from one student's candidate scores."""
+        for event_row in seen_rows:
+            position = self.candidate_position.get(int(self.event_ids[event_row]))
+            if position is not None:
+                scores[position] = -np.inf
+        top = _top_n(scores, RECOMMENDATION_TOP_N)
+        return [(int(self.candidate_events[i]), round(float(scores[i]), 4)) for i in top]
+
+    def score_all(self):
+        """student id -> top-N recommendations, scored one dense block of students at a time."""
+        student_ids = np.empty(len(self.student_index), dtype=np.int64)
+        for student_id, row in self.student_index.items():
+            student_ids[row] = student_id
+
+        normalized = _normalize_rows(self.profiles)
+        top = {}
+        for start in range(0, normalized.shape[0], SCORE_BLOCK_SIZE):
+            block = (normalized[start:start + SCORE_BLOCK_SIZE] @ self.candidates).toarray()
+            block += self.prior
+            for offset, scores in enumerate(block):
+                row = start + offset
+                top[int(student_ids[row])] = self._rank(scores, self.seen.get(row, ()))
+        return top
+
+    def rescore(self, student_id):
+        """Recompute one student's list from their current profile row."""
+        row = self.student_index.get(student_id)
+        if row is None:
+            return None
+        profile = _normalize_rows(self._profile(row))
+        scores = (profile @ self.candidates).toarray().ravel() + self.prior
+        return self._rank(scores, self.seen.get(row, ()))
+
+    def _profile(self, row):
+        profile = self.updated_profiles.get(row)
+        return self.profiles[row] if profile is None else profile
+
+    def apply_rsvp(self, student_id, event_id, delta):
+        """Move a student's profile by one RSVP (delta +1 / -1). Returns False if unknown."""
+        s, e = self.student_index.get(student_id), self.event_index.get(event_id)
+        if s is None or e is None:
+            return False
+        self.updated_profiles[s] = self._profile(s) + (delta * RSVP_WEIGHT) * self.content[e]
+        seen = self.seen.setdefault(s, set())
+        if delta > 0:
+            seen.add(e)
+        else:
+            seen.discard(e)
+        return True
+
+
+class Recommender:
+    """Holds the latest model and the cached top-N per student."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model = None
+        self._top = {}
+
+    def rebuild(self):
+        """Load every signal, build the matrices and score all students at once."""
+        rows = {}
+        cursor = db.get_db().cursor()
+        try:
+            for name, query in LOAD_QUERIES.items():
+                cursor.execute(query)
+                rows[name] = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        model = RecommendationModel(rows)
+        top = model.score_all()
+        with self._lock:
+            self._model, self._top = model, top
+
+    def recommend(self, student_id, limit=10):
+        """Cached (event id, score) pairs for a student, best first; None if not in the last build."""
+        if self._model is None:
+            self.rebuild()
+        with self._lock:
+            top = self._top.get(student_id)
+        return None if top is None else top[:limit]
+
+    def popular(self, limit=10):
+        """The most popular upcoming events as (event id, score) pairs, for students without a profile yet."""
+        if self._model is None:
+            self.rebuild()
+        with self._lock:
+            return self._model.popular[:limit]
+
+    def apply_change(self, change):
+        """Change bus subscriber: refresh one student's list after they RSVP or cancel."""
+        if self._model is None:
+            return
+        try:
+            student_id = int(change.fields["studentID"])
+            event_id = int(change.fields["eventID"])
+        except (KeyError, TypeError, ValueError):
+            return
+        delta = -1 if change.operation == "delete" else 1
+        with self._lock:
+            if self._model.apply_rsvp(student_id, event_id, delta):
+                self._top[student_id] = self._model.rescore(student_id)
+
+
+recommender = Recommender()
@@ -1,10 +1,11 @@
-from flask import Flask
+from flask import Flask, request
 from dotenv import load_dotenv
 import os
 import logging
 from logging.handlers import RotatingFileHandler
 
 from backend.db_connection import db
+from backend.scheduler import scheduler
 from backend.simple.simple_routes import simple_routes
 from backend.events.event_routes import events
 from backend.clubs.club_routes import club_routes
@@ -12,6 +13,23 @@ from backend.students.student_routes import student_routes
 from backend.admin.admin_routes import admin_routes
 from backend.analytics.analytics_routes import analytics_routes
 from backend.invitations.invitations_routes import invitation_routes
+from backend.push.push_routes import push_routes
+from backend.push import publish_change, CHANGE_TOPICS
+from backend.changes import change_bus
+from backend.invitations.fanout import invite_fanout
+from backend.events.search_log import search_log
+from backend.recommendations import recommender, RECOMMENDATION_REBUILD_INTERVAL
+from backend.clubs.similarity import club_similarity, SIMILARITY_REBUILD_INTERVAL
+from backend.clubs.overlap import club_overlap, OVERLAP_REBUILD_INTERVAL
+from backend.clubs.metrics import refresh_club_metrics, CLUB_METRICS_REFRESH_INTERVAL
+from backend.clubs.rankings import compute_recent_rankings, RANKINGS_INTERVAL
+from backend.clubs.performance import performance_cache
+from backend.autocomplete.autocomplete_routes import autocomplete_routes
+from backend.autocomplete import autocomplete, AUTOCOMPLETE_REBUILD_INTERVAL
+from backend.admin.partitions import maintain_partitions
+from backend.admin.metrics_store import init_request_metrics, record_metrics, rollup_metrics, METRICS_INTERVAL
+from backend.admin.ingest import ingest_buffer
+from backend.admin.alert_engine import evaluate_alerts, ALERT_INTERVAL
 
 def create_app():
     app = Flask(__name__)
@@ -60,10 +78,67 @@ def create_app():
     app.register_blueprint(admin_routes, url_prefix="/admin")
     app.register_blueprint(analytics_routes, url_prefix="/analytics")
     app.register_blueprint(invitation_routes, url_prefix="/invitations")
+    app.register_blueprint(push_routes, url_prefix="/push")
+    app.register_blueprint(autocomplete_routes, url_prefix="/autocomplete")
+
+    # GET JSON responses carry an ETag; a matching If-None-Match gets an empty 304
+    app.after_request(add_etag)
+
+    # Background jobs run in daemon threads, started on the first request.
+    app.logger.info("create_app(): registering background jobs.")
+    scheduler.init_app(app)
+    # Keep monthly log partitions created ahead of time and expire old ones once a day
+    scheduler.add_job("partition-maintenance", 24 * 60 * 60, maintain_partitions)
+    # Sample API/DB metrics into System_Metrics and keep the 1m/1h/1d rollups current
+    init_request_metrics(app)
+    scheduler.add_job("metrics-sampler", METRICS_INTERVAL, record_metrics)
+    scheduler.add_job("metrics-rollup", 60, rollup_metrics)
+    # Heartbeats / log entries posted to /admin/ingest are flushed in batches
+    ingest_buffer.init_app(app)
+    # Threshold, error-rate, capacity and room-conflict rules over new data only
+    scheduler.add_job("alert-engine", ALERT_INTERVAL, evaluate_alerts)
+    # Committed writes are published to the change bus subscribers after each request
+    change_bus.init_app(app)
+    change_bus.subscribe(publish_change, entities=CHANGE_TOPICS)
+    scheduler.add_job("change-outbox-relay", 60, change_bus.relay_outbox)
+    # Group invitations are deduped and inserted on a worker pool
+    invite_fanout.init_app(app)
+    # Name prefix indexes: rebuilt periodically, patched from Events/RSVPs writes in between
+    scheduler.add_job("autocomplete-rebuild", AUTOCOMPLETE_REBUILD_INTERVAL, autocomplete.rebuild)
+    change_bus.subscribe(autocomplete.apply_change, entities=["Events", "RSVPs"])
+    # Searches and result clicks from /events/search are logged in batches
+    search_log.init_app(app)
+    # Event recommendations: scored for every student in a batch, refreshed per student on RSVPs
+    scheduler.add_job("recommendations-rebuild", RECOMMENDATION_REBUILD_INTERVAL, recommender.rebuild)
+    change_bus.subscribe(recommender.apply_change, entities=["RSVPs"])
+    # Club neighbours for /clubs/<id>/similar: reloaded periodically, patched from writes in between
+    scheduler.add_job("club-similarity-rebuild", SIMILARITY_REBUILD_INTERVAL, club_similarity.rebuild)
+    change_bus.subscribe(club_similarity.apply_change,
+                         entities=["Events", "Students_Event_Attendees", "Events_Event_Keywords",
+                                   "club_memberships"])
+    # Club x club shared members / attendees: rebuilt hourly, moved by each membership or check-in
+    scheduler.add_job("club-overlap-rebuild", OVERLAP_REBUILD_INTERVAL, club_overlap.rebuild)
+    change_bus.subscribe(club_overlap.apply_change,
+                         entities=["club_memberships", "Students_Event_Attendees", "Events"])
+    # Club_Metrics: counts kept by triggers, rolling windows recomputed on a timer
+    scheduler.add_job("club-metrics-refresh", CLUB_METRICS_REFRESH_INTERVAL, refresh_club_metrics)
+    # Composite quarterly rankings for the current and previous quarter
+    scheduler.add_job("rankings-compute", RANKINGS_INTERVAL, compute_recent_rankings)
+    # /clubs/performance windows: cached per (days, club), dropped on event/RSVP/check-in writes
+    change_bus.subscribe(performance_cache.apply_change,
+                         entities=["Events", "RSVPs", "Students_Event_Attendees"])
 
     # Don't forget to return the app object
     return app
 
+def add_etag(response):
+    """Tag successful GET JSON responses and answer revalidations with 304 Not Modified."""
+    if (request.method == "GET" and response.status_code == 200
+            and response.is_json and not response.is_streamed):
+        response.add_etag()
+        response = response.make_conditional(request)
+    return response
+
 def setup_logging(app):
     """
     Configure logging for the Flask application in both files and console (Docker Desktop for this project)
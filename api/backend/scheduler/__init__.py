@@ -0,0 +1,67 @@
+#------------------------------------------------------------
+# This file creates a shared background job scheduler
+#------------------------------------------------------------
+import threading
+
+
+class PeriodicJob(threading.Thread):
+    """
+    Daemon thread that calls func() every `interval` seconds inside
+    an application context, so db.get_db() works the same way it
+    does in a route.
+    """
+
+    def __init__(self, app, name, interval, func):
+        super().__init__(name=name, daemon=True)
+        self.app = app
+        self.interval = interval
+        self.func = func
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.func()
+                except Exception as e:
+                    self.app.logger.error(f"Background job {self.name} failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class Scheduler:
+    """
+    Holds the periodic jobs registered by the blueprints.
+
+    Jobs are only started on the first request so that the Flask
+    reloader's parent process (debug mode) does not run them twice.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.jobs = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.before_request(self._start_jobs)
+
+    def add_job(self, name, interval, func):
+        self.jobs.append((name, interval, func))
+
+    def _start_jobs(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            for name, interval, func in self.jobs:
+                self.app.logger.info(f"Starting background job {name} (every {interval}s)")
+                PeriodicJob(self.app, name, interval, func).start()
+            self._started = True
+
+
+scheduler = Scheduler()
@@ -2,21 +2,107 @@ from flask import Blueprint, jsonify, request
 from backend.db_connection import db
 from mysql.connector import Error
 from flask import current_app
+from backend.changes import record_change
+from backend.pagination import encode_cursor, decode_cursor, get_page_limit
+from backend.recommendations import recommender
 
 student_routes = Blueprint('student_routes', __name__)
 
+# Columns ?fields= may ask for (studentID is always returned)
+STUDENT_FIELDS = ["studentID", "email", "firstName", "lastName", "year", "major"]
+
+
+def _like_prefix(term):
+    """Escape LIKE wildcards so user input only ever matches as a literal prefix."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
 @student_routes.route('/students', methods=['GET'])
 def get_students():
+    """
+    List students ordered by last name, first name.
+
+    Query params:
+      q        - typeahead search; every word must be a prefix of the first
+                 name, last name or email (idx_students_first_name,
+                 idx_students_last_name and the email key keep it a range scan)
+      exclude  - studentID to leave out (e.g. the current user)
+      fields   - comma-separated columns to return (default: all)
+      limit, cursor - keyset pagination
+      mode=typeahead - only [{"id", "name"}] for the top `limit` matches
+    """
+    cursor = None
     try:
+        typeahead = request.args.get('mode') == 'typeahead'
+        limit = get_page_limit(default=10, maximum=50) if typeahead else get_page_limit(default=100, maximum=1000)
+
+        if typeahead:
+            columns = ["studentID", "firstName", "lastName"]
+        else:
+            requested = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+            unknown = [f for f in requested if f not in STUDENT_FIELDS]
+            if unknown:
+                return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+            columns = ["studentID"] + [f for f in (requested or STUDENT_FIELDS) if f != "studentID"]
+        # The keyset columns have to be selected to build the next cursor
+        selected = list(dict.fromkeys(columns + ["lastName", "firstName"]))
+
+        conditions = []
+        params = []
+        for term in request.args.get('q', '').split():
+            pattern = _like_prefix(term)
+            conditions.append("(firstName LIKE %s OR lastName LIKE %s OR email LIKE %s)")
+            params.extend([pattern, pattern, pattern])
+
+        exclude = request.args.get('exclude', type=int)
+        if exclude is not None:
+            conditions.append("studentID != %s")
+            params.append(exclude)
+
+        token = None if typeahead else request.args.get('cursor')
+        if token:
+            position = decode_cursor(token)
+            if not position or len(position) != 3:
+                return jsonify({"error": "Invalid cursor"}), 400
+            conditions.append(
+                "(lastName > %s OR (lastName = %s AND (firstName > %s"
+                " OR (firstName = %s AND studentID > %s))))"
+            )
+            params.extend([position[0], position[0], position[1], position[1], position[2]])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM Students")
+        cursor.execute(f"""
+            SELECT {', '.join(selected)}
+            FROM Students
+            {where}
+            ORDER BY lastName, firstName, studentID
+            LIMIT %s
+        """, params + [limit + 1])
         students = cursor.fetchall()
-        return jsonify(students), 200
+
+        if typeahead:
+            return jsonify([
+                {"id": s["studentID"], "name": f"{s['firstName']} {s['lastName']}"}
+                for s in students[:limit]
+            ]), 200
+
+        next_cursor = None
+        if len(students) > limit:
+            students = students[:limit]
+            last = students[-1]
+            next_cursor = encode_cursor(last["lastName"], last["firstName"], last["studentID"])
+
+        return jsonify({
+            "students": [{column: s[column] for column in columns} for s in students],
+            "next_cursor": next_cursor,
+        }), 200
     except Error as e:
         current_app.logger.error(f"Error fetching students: {e}")
         return jsonify({"error": "Error fetching students"}), 500
     finally:
-        cursor.close()
+        if cursor:
+            cursor.close()
 
 @student_routes.route('/students/<int:student_id>/rsvps', methods=['GET'])
 def get_student_rsvps(student_id):
@@ -66,6 +152,8 @@ def create_rsvp(student_id):
                 (%s, %s, 'confirmed', CURRENT_TIMESTAMP)
         """
         cursor.execute(query, (student_id, data['event_id']))
+        record_change(cursor, "RSVPs", cursor.lastrowid, "insert",
+                      {"studentID": student_id, "eventID": data['event_id'], "status": "confirmed"})
         db.commit()
         return jsonify({"message": "RSVP created successfully"}), 201
     except Error as e:
@@ -79,14 +167,21 @@ def create_rsvp(student_id):
 def cancel_rsvp(student_id, rsvp_id):
     try:
         cursor = db.cursor(dictionary=True)
+        cursor.execute("SELECT eventID FROM RSVPs WHERE rsvpID = %s", (rsvp_id,))
+        rsvp = cursor.fetchone()
+
         query = """
             DELETE FROM RSVPs
             WHERE rsvpID = %s AND studentID = %s
         """
         cursor.execute(query, (rsvp_id, student_id))
+        deleted = cursor.rowcount
+        if deleted:
+            record_change(cursor, "RSVPs", rsvp_id, "delete",
+                          {"studentID": student_id, "eventID": rsvp['eventID']})
         db.commit()
 
-        if cursor.rowcount > 0:
+        if deleted > 0:
             return jsonify({"message": "RSVP cancelled successfully"}), 200
         else:
             return jsonify({"error": "RSVP not found"}), 404
@@ -145,11 +240,14 @@ def get_all_student_invitations(student_id):
                 s.lastName AS sender_last_name,
                 ei.status AS invitation_status,
                 ei.sentAt AS sent_datetime
-            FROM Event_Invitations ei
+            FROM (
+                SELECT invitationID FROM Event_Invitations WHERE senderStudentID = %s
+                UNION
+                SELECT invitationID FROM Event_Invitations WHERE recipientStudentID = %s
+            ) mine
+            JOIN Event_Invitations ei ON ei.invitationID = mine.invitationID
             JOIN Events e ON ei.eventID = e.eventID
             JOIN Students s ON ei.senderStudentID = s.studentID
-            WHERE ei.senderStudentID = %s
-               OR ei.recipientStudentID = %s
             ORDER BY ei.sentAt DESC
         """
         cursor.execute(query, (student_id, student_id))
@@ -161,6 +259,177 @@ def get_all_student_invitations(student_id):
     finally:
         cursor.close()
 
+# Invitation inbox: which column identifies the student in each box
+INBOX_BOXES = {
+    "sent": "senderStudentID",
+    "received": "recipientStudentID",
+}
+
+
+# Get student inbox (sent and received invitations, paginated separately)
+@student_routes.route('/students/<int:student_id>/inbox', methods=['GET'])
+def get_student_inbox(student_id):
+    """
+    Sent and received invitations of a student, newest first. Each box is
+    one index-driven branch of a UNION ALL (idx_invitations_sender /
+    idx_invitations_recipient) instead of an OR over both columns.
+
+    Query params: box (sent|received, default both), status, limit,
+    sent_cursor / received_cursor (next_cursor of the previous page).
+    Per-status counts are only computed for a box's first page.
+    """
+    cursor = None
+    try:
+        limit = get_page_limit(default=20, maximum=200)
+        status = request.args.get('status')
+        boxes = [request.args['box']] if request.args.get('box') else list(INBOX_BOXES)
+        if any(box not in INBOX_BOXES for box in boxes):
+            return jsonify({"error": "box must be 'sent' or 'received'"}), 400
+
+        branches = []
+        params = []
+        first_page = []
+        for box in boxes:
+            conditions = [f"{INBOX_BOXES[box]} = %s"]
+            branch_params = [student_id]
+            if status:
+                conditions.append("status = %s")
+                branch_params.append(status)
+
+            token = request.args.get(f"{box}_cursor")
+            if token:
+                position = decode_cursor(token)
+                if not position or len(position) != 2:
+                    return jsonify({"error": f"Invalid {box}_cursor"}), 400
+                conditions.append("(sentAt < %s OR (sentAt = %s AND invitationID < %s))")
+                branch_params.extend([position[0], position[0], position[1]])
+            else:
+                first_page.append(box)
+
+            branches.append(f"""
+                (SELECT '{box}' AS box, invitationID, sentAt
+                 FROM Event_Invitations
+                 WHERE {' AND '.join(conditions)}
+                 ORDER BY sentAt DESC, invitationID DESC
+                 LIMIT %s)
+            """)
+            params.extend(branch_params + [limit + 1])
+
+        cursor = db.cursor(dictionary=True)
+        # Only the page rows are joined to Events/Students
+        cursor.execute(f"""
+            SELECT
+                page.box,
+                ei.invitationID AS invitation_id,
+                ei.eventID AS event_id,
+                e.name AS event_name,
+                e.startDateTime AS start_datetime,
+                ei.senderStudentID AS sender_student_id,
+                ei.recipientStudentID AS recipient_student_id,
+                sender.firstName AS sender_first_name,
+                sender.lastName AS sender_last_name,
+                recipient.firstName AS recipient_first_name,
+                recipient.lastName AS recipient_last_name,
+                ei.status AS invitation_status,
+                ei.sentAt AS sent_datetime
+            FROM ({' UNION ALL '.join(branches)}) page
+            JOIN Event_Invitations ei ON ei.invitationID = page.invitationID
+            JOIN Events e ON ei.eventID = e.eventID
+            JOIN Students sender ON ei.senderStudentID = sender.studentID
+            JOIN Students recipient ON ei.recipientStudentID = recipient.studentID
+            ORDER BY page.box, page.sentAt DESC, page.invitationID DESC
+        """, params)
+        rows = cursor.fetchall()
+
+        grouped = {box: [] for box in boxes}
+        for row in rows:
+            grouped[row.pop('box')].append(row)
+
+        inbox = {}
+        for box, invitations in grouped.items():
+            next_cursor = None
+            if len(invitations) > limit:
+                invitations = invitations[:limit]
+                last = invitations[-1]
+                next_cursor = encode_cursor(last['sent_datetime'], last['invitation_id'])
+            inbox[box] = {"invitations": invitations, "next_cursor": next_cursor, "counts": None}
+
+        if first_page:
+            # Covered by the same two indexes; status is part of both
+            cursor.execute(' UNION ALL '.join(
+                f"""
+                (SELECT '{box}' AS box, status, COUNT(*) AS count
+                 FROM Event_Invitations
+                 WHERE {INBOX_BOXES[box]} = %s
+                 GROUP BY status)
+                """ for box in first_page
+            ), [student_id] * len(first_page))
+            for box in first_page:
+                inbox[box]["counts"] = {"pending": 0, "accepted": 0, "declined": 0}
+            for row in cursor.fetchall():
+                inbox[row['box']]["counts"][row['status']] = row['count']
+            for box in first_page:
+                inbox[box]["counts"]["total"] = sum(inbox[box]["counts"].values())
+
+        return jsonify(inbox), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching inbox: {e}")
+        return jsonify({"error": "Error fetching inbox"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
+# Recommended upcoming events
+@student_routes.route('/students/<int:student_id>/recommendations', methods=['GET'])
+def get_student_recommendations(student_id):
+    """
+    Upcoming events recommended for a student, best first, from the
+    precomputed top-N (refreshed right after the student's own RSVPs).
+    Query params: limit (default 10, max 50).
+    """
+    cursor = None
+    try:
+        limit = get_page_limit(default=10, maximum=50)
+        cursor = db.cursor(dictionary=True)
+        # Ask the cache for extra rows: some may have started since the last build
+        recommended = recommender.recommend(student_id, limit * 2)
+        if recommended is None:
+            # Not in the last build: unknown, or created since (popular events until the next one)
+            cursor.execute("SELECT studentID FROM Students WHERE studentID = %s", (student_id,))
+            if cursor.fetchone() is None:
+                return jsonify({"error": "Student not found"}), 404
+            recommended = recommender.popular(limit * 2)
+        if not recommended:
+            return jsonify([]), 200
+
+        scores = dict(recommended)
+        cursor.execute(f"""
+            SELECT
+                e.eventID,
+                e.name,
+                e.description,
+                e.startDateTime,
+                e.location,
+                e.capacity,
+                c.name AS club_name,
+                c.clubID
+            FROM Events e
+            LEFT JOIN Clubs c ON c.clubID = e.clubID
+            WHERE e.eventID IN ({', '.join(['%s'] * len(scores))})
+                AND e.startDateTime >= CURRENT_TIMESTAMP
+        """, list(scores))
+        events = cursor.fetchall()
+        for event in events:
+            event["score"] = scores[event["eventID"]]
+        events.sort(key=lambda event: event["score"], reverse=True)
+        return jsonify(events[:limit]), 200
+    except Error as e:
+        current_app.logger.error(f"Error fetching recommendations for student {student_id}: {e}")
+        return jsonify({"error": "Error fetching recommendations"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+
 # Update invitation status
 @student_routes.route('/students/<student_id>/invitations/<int:invitation_id>', methods=['PUT'])
 def update_invitation_status(student_id, invitation_id):
@@ -174,9 +443,15 @@ def update_invitation_status(student_id, invitation_id):
               AND recipientStudentID = %s
         """
         cursor.execute(query, (data['status'], invitation_id, student_id))
+        updated = cursor.rowcount
+        if updated:
+            cursor.execute("SELECT eventID FROM Event_Invitations WHERE invitationID = %s", (invitation_id,))
+            record_change(cursor, "Event_Invitations", invitation_id, "update",
+                          {"eventID": cursor.fetchone()["eventID"], "recipientStudentID": student_id,
+                           "status": data['status']})
         db.commit()
 
-        if cursor.rowcount > 0:
+        if updated > 0:
             return jsonify({"message": "Invitation status updated successfully"}), 200
         else:
             return jsonify({"error": "Invitation not found"}), 404
@@ -0,0 +1,194 @@
+# Shared HTTP client for the API. Every page goes through one
+# requests.Session per Streamlit server, so connections to web-api are
+# pooled and kept alive instead of opened per call. Idempotent requests
+# are retried with backoff, GET responses are revalidated with ETags and
+# every call is timed per endpoint.
+#
+# Pages pass API paths ("/clubs/clubs") and get a requests.Response back:
+#     from modules import api
+#     response = api.get("/events", params={"limit": 20})
+#
+# Independent GETs are issued together with fetch_all, so a page waits for
+# its slowest call rather than the sum of all of them:
+#     results = api.fetch_all({"servers": "/admin/servers", "metrics": "/admin/metrics"})
+#     if results["servers"].error: ...
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# The one place the API location is configured
+API_BASE_URL = os.getenv("API_BASE_URL", "http://web-api:4000")
+
+# The same API as the user's browser reaches it (web-api only resolves
+# inside the compose network); used for links the browser follows itself
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", "http://localhost:4000")
+
+# Seconds to wait for a response when the caller does not pass a timeout
+DEFAULT_TIMEOUT = 10
+
+# Connections kept open to the API (pages fetching concurrently share them)
+POOL_SIZE = 20
+
+# Threads running fetch_all calls, shared by every session
+FETCH_WORKERS = 8
+
+# Retries for idempotent requests on connection errors and 502/503/504
+RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# GET responses remembered for If-None-Match revalidation
+ETAG_CACHE_SIZE = 256
+
+# Requests slower than this many seconds are logged
+SLOW_REQUEST = 1.0
+
+
+class ApiClient:
+    """Pooled session plus the ETag cache and per-endpoint timings."""
+
+    def __init__(self, base_url=API_BASE_URL):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        retry = Retry(
+            total=RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="api-fetch")
+        self._lock = threading.Lock()
+        self._etags = OrderedDict()
+        self.stats = {}
+
+    def url(self, path):
+        return path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+
+    def request(self, method, path, **kwargs):
+        """Send one request through the pool. Returns the requests.Response."""
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        url = self.url(path)
+        cache_key = None
+        cached = None
+        if method == "GET" and not kwargs.get("stream"):
+            cache_key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+            with self._lock:
+                cached = self._etags.get(cache_key)
+            if cached is not None:
+                kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached.headers["ETag"]}
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(method, path, time.perf_counter() - started, error=True)
+            raise
+        self._record(method, path, time.perf_counter() - started, error=response.status_code >= 500)
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                return cached
+            if response.status_code == 200 and "ETag" in response.headers:
+                with self._lock:
+                    self._etags[cache_key] = response
+                    self._etags.move_to_end(cache_key)
+                    while len(self._etags) > ETAG_CACHE_SIZE:
+                        self._etags.popitem(last=False)
+        return response
+
+    def _record(self, method, path, elapsed, error=False):
+        endpoint = f"{method} {path.split('?')[0]}"
+        with self._lock:
+            stat = self.stats.setdefault(endpoint, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stat["calls"] += 1
+            stat["errors"] += int(error)
+            stat["total_ms"] += elapsed * 1000
+            stat["max_ms"] = max(stat["max_ms"], elapsed * 1000)
+        if elapsed >= SLOW_REQUEST:
+            logger.warning(f"Slow API call: {endpoint} took {elapsed:.2f}s")
+
+    def timings(self):
+        """{endpoint: calls, errors, avg_ms, max_ms} since the server started."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "calls": stat["calls"],
+                    "errors": stat["errors"],
+                    "avg_ms": round(stat["total_ms"] / stat["calls"], 1),
+                    "max_ms": round(stat["max_ms"], 1),
+                }
+                for endpoint, stat in self.stats.items()
+            }
+
+
+@st.cache_resource
+def get_client():
+    return ApiClient()
+
+
+def public_url(path, params=None):
+    """Browser-facing URL of an API path, e.g. to download a streamed export directly."""
+    return requests.Request("GET", f"{PUBLIC_API_URL.rstrip('/')}{path}", params=params).prepare().url
+
+
+def get(path, **kwargs):
+    return get_client().request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    return get_client().request("POST", path, **kwargs)
+
+
+def put(path, **kwargs):
+    return get_client().request("PUT", path, **kwargs)
+
+
+def delete(path, **kwargs):
+    return get_client().request("DELETE", path, **kwargs)
+
+
+# One fetch_all call: the decoded JSON body, or the reason there is none
+Fetched = namedtuple("Fetched", ["data", "error"])
+
+
+def _fetch(client, path, params, timeout):
+    try:
+        response = client.request("GET", path, params=params, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return Fetched(None, str(e))
+    if response.status_code != 200:
+        return Fetched(None, f"Status: {response.status_code}")
+    try:
+        return Fetched(response.json(), None)
+    except ValueError as e:
+        return Fetched(None, f"Invalid response: {e}")
+
+
+def fetch_all(calls, timeout=DEFAULT_TIMEOUT):
+    """
+    Run independent GET requests at the same time. `calls` maps a name to
+    a path or a (path, params) pair; each call gets its own `timeout`.
+    Returns {name: Fetched} once all of them finished. A failed call only
+    carries its error, the others still return their data.
+    """
+    client = get_client()
+    futures = {}
+    for name, call in calls.items():
+        path, params = (call, None) if isinstance(call, str) else call
+        futures[name] = client.executor.submit(_fetch, client, path, params, timeout)
+    return {name: future.result() for name, future in futures.items()}
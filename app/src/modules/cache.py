@@ -0,0 +1,181 @@
+# Cache for API data shared by every session of this Streamlit server.
+# Entries live under namespaces named after what they hold ("events",
+# "my_rsvps:10000001"), so a write only drops the namespaces it touched
+# instead of every cached function of every user. Entries past their TTL
+# are still served for a while and refreshed in the background
+# (stale-while-revalidate), concurrent misses on one key share a single
+# load, and hits/misses are counted per namespace.
+#
+#     @cached("my_rsvps:{student_id}", ttl=30)
+#     def fetch_my_rsvps(student_id): ...
+#
+#     invalidate("events", f"my_rsvps:{STUDENT_ID}")   # after an RSVP
+
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import streamlit as st
+
+# Entries kept across all namespaces; the least recently stored go first
+MAX_ENTRIES = 1000
+
+# Threads refreshing stale entries in the background
+REFRESH_WORKERS = 4
+
+Entry = namedtuple("Entry", ["namespace", "value", "stored_at"])
+
+
+class SharedCache:
+    """Namespaced entries, shared loads, background refreshes and per-namespace counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # key -> (namespace, Future) of the load in progress, awaited by
+        # concurrent misses
+        self._loading = {}
+        # namespace -> invalidation count; a load only stores its value if
+        # its namespace and all of its parents were not invalidated meanwhile
+        self._generations = {}
+        self._executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+        self._stats = {}
+
+    def _count(self, namespace, outcome):
+        stat = self._stats.setdefault(namespace.split(":")[0], {
+            "hits": 0, "stale_hits": 0, "misses": 0, "shared_loads": 0, "refreshes": 0, "invalidations": 0})
+        stat[outcome] += 1
+
+    def _generation(self, namespace):
+        parts = namespace.split(":")
+        return tuple(self._generations.get(":".join(parts[:i]), 0) for i in range(1, len(parts) + 1))
+
+    def _done_loading(self, key, loading):
+        # An invalidation may already have replaced this load with a newer one
+        if self._loading.get(key, (None, None))[1] is loading:
+            del self._loading[key]
+
+    def _load(self, key, namespace, load, generation, loading):
+        try:
+            value = load()
+        except Exception as e:
+            with self._lock:
+                self._done_loading(key, loading)
+            loading.set_exception(e)
+            return
+        with self._lock:
+            self._done_loading(key, loading)
+            # Skipped if invalidated while loading: the value may predate the write
+            if generation == self._generation(namespace):
+                self._entries.pop(key, None)
+                self._entries[key] = Entry(namespace, value, time.monotonic())
+                while len(self._entries) > MAX_ENTRIES:
+                    self._entries.popitem(last=False)
+        loading.set_result(value)
+
+    def get(self, namespace, key, load, ttl, stale_ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry.stored_at if entry else None
+            if entry and age < ttl:
+                self._count(namespace, "hits")
+                return entry.value
+            loading = self._loading.get(key, (None, None))[1]
+            if entry and age < ttl + stale_ttl:
+                self._count(namespace, "stale_hits")
+                if loading is None:
+                    self._count(namespace, "refreshes")
+                    loading = Future()
+                    self._loading[key] = (namespace, loading)
+                    self._executor.submit(self._load, key, namespace, load,
+                                          self._generation(namespace), loading)
+                return entry.value
+            self._count(namespace, "misses")
+            if loading is not None:
+                # Another session is already loading this key: wait for its result
+                self._count(namespace, "shared_loads")
+                owner = False
+            else:
+                loading = Future()
+                self._loading[key] = (namespace, loading)
+                generation = self._generation(namespace)
+                owner = True
+
+        if owner:
+            self._load(key, namespace, load, generation, loading)
+        return loading.result()
+
+    def invalidate(self, *namespaces):
+        """
+        Drop every entry in these namespaces and in their sub-namespaces
+        ("events" covers "events:12"). Loads already running there are left
+        to finish but not stored, and later misses start a fresh load.
+        """
+        def affected(entry_namespace):
+            return any(entry_namespace == ns or entry_namespace.startswith(ns + ":") for ns in namespaces)
+
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key, entry in list(self._entries.items()):
+                if affected(entry.namespace):
+                    del self._entries[key]
+            for key, (namespace, _) in list(self._loading.items()):
+                if affected(namespace):
+                    del self._loading[key]
+            for namespace in namespaces:
+                self._count(namespace, "invalidations")
+
+    def stats(self):
+        """Entry count, plus counters and hit rate per top-level namespace."""
+        with self._lock:
+            namespaces = {}
+            for namespace, stat in self._stats.items():
+                reads = stat["hits"] + stat["stale_hits"] + stat["misses"]
+                hit_rate = (stat["hits"] + stat["stale_hits"]) / reads if reads else None
+                namespaces[namespace] = {**stat, "hit_rate": hit_rate}
+            return {"entries": len(self._entries), "namespaces": namespaces}
+
+
+@st.cache_resource
+def get_cache():
+    return SharedCache()
+
+
+def cached(namespace, ttl=60, stale_ttl=None):
+    """
+    Cache a fetch function's result for `ttl` seconds in `namespace`, which
+    may name the function's arguments ("club_events:{club_id}"). For another
+    `stale_ttl` seconds (default: ttl) the old result is returned while a
+    background refresh loads the new one. Callers get their own copy.
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        origin = f"{func.__code__.co_filename}:{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            ns = namespace.format(**bound.arguments)
+            key = (origin, repr(sorted(bound.arguments.items())))
+            value = get_cache().get(ns, key, lambda: func(*args, **kwargs), ttl, stale_ttl)
+            return copy.deepcopy(value)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*namespaces):
+    get_cache().invalidate(*namespaces)
+
+
+def cache_stats():
+    return get_cache().stats()
@@ -0,0 +1,143 @@
+# Keeps one connection to the API's /push/stream per Streamlit server and
+# tracks a version number per topic. Pages pass topic_version(...) into
+# their cached fetch functions, so cached data is only refetched when the
+# API reported a change, and live_updates(...) reruns a page when one of
+# its topics moves instead of polling the API on a timer.
+
+import json
+import threading
+import time
+
+import requests
+import streamlit as st
+
+from modules.api import API_BASE_URL
+
+# Seconds to wait before reconnecting after the stream dropped
+RECONNECT_DELAY = 5
+
+# The API sends a keep-alive every 15 seconds; give up on a silent stream after this
+READ_TIMEOUT = 45
+
+
+class PushListener:
+    """
+    Background reader for the server-sent event stream. Versions are kept
+    locally and only ever go up, so they stay valid cache keys across API
+    restarts and reconnects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._topics = set()
+        self._versions = {}
+        self._server_versions = {}
+        self._response = None
+        self._thread = None
+        self.connected = False
+
+    def watch(self, topics):
+        """Make sure the stream includes these topics (reconnects if it has to grow)."""
+        with self._lock:
+            new_topics = set(topics) - self._topics
+            if not new_topics:
+                return
+            self._topics |= new_topics
+            response = self._response
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="push-listener", daemon=True)
+                self._thread.start()
+
+        if response is not None:
+            # The reader loop reconnects straight away with the wider topic list
+            response.close()
+
+    def version(self, topic):
+        """Local version of a topic; None while the stream is down."""
+        if not self.connected:
+            return None
+        with self._lock:
+            return self._versions.get(topic, 0)
+
+    def _bump(self, topic):
+        self._versions[topic] = self._versions.get(topic, 0) + 1
+
+    def _apply(self, event, payload):
+        with self._lock:
+            if event in ("snapshot", "resync"):
+                # Anything may have changed while we were not listening
+                for topic, server_version in payload.items():
+                    if self._server_versions.get(topic) != server_version:
+                        self._bump(topic)
+                    self._server_versions[topic] = server_version
+                self.connected = True
+            elif event == "change":
+                self._server_versions[payload["topic"]] = payload["version"]
+                self._bump(payload["topic"])
+
+    def _run(self):
+        while True:
+            with self._lock:
+                topics = ",".join(sorted(self._topics))
+            try:
+                response = requests.get(
+                    f"{API_BASE_URL}/push/stream",
+                    params={"topics": topics},
+                    stream=True,
+                    timeout=(5, READ_TIMEOUT),
+                )
+                with self._lock:
+                    self._response = response
+                    if ",".join(sorted(self._topics)) != topics:
+                        # watch() added topics while we were connecting
+                        response.close()
+
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        self._apply(event, json.loads(line[len("data:"):]))
+                    elif not line:
+                        event = None
+            except Exception:
+                pass
+
+            with self._lock:
+                self._response = None
+                reconnect_now = ",".join(sorted(self._topics)) != topics
+                # Drop the server versions so the next snapshot bumps everything
+                self._server_versions = {}
+            self.connected = False
+            if not reconnect_now:
+                time.sleep(RECONNECT_DELAY)
+
+
+@st.cache_resource
+def get_push_listener():
+    return PushListener()
+
+
+def topic_version(topic):
+    """Version of `topic` to use as a cache key argument in @st.cache_data fetches."""
+    listener = get_push_listener()
+    listener.watch([topic])
+    return listener.version(topic)
+
+
+def live_updates(*topics, check_every=2):
+    """
+    Rerun the page when any of `topics` changes. The check only reads the
+    listener's local state, so an idle page makes no API requests.
+    """
+    listener = get_push_listener()
+    listener.watch(topics)
+    seen = {topic: listener.version(topic) for topic in topics}
+
+    @st.fragment(run_every=check_every)
+    def _check_for_changes():
+        if any(listener.version(topic) != version for topic, version in seen.items()):
+            st.rerun()
+
+    _check_for_changes()
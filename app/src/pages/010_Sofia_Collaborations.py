@@ -1,7 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -11,9 +12,6 @@ st.set_page_config(
 
 CLUB_ID = 101  # Latin American Student Union
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎭 Sofia's Pages")
 st.sidebar.markdown("**Current:** Collaborations")
@@ -30,10 +28,10 @@ st.markdown("Discover clubs that host similar events for cross-promotion and par
 st.divider()
 
 # Fetch similar clubs
-@st.cache_data(ttl=300)
+@cached("club:{club_id}:similar", ttl=300)
 def fetch_similar_clubs(club_id):
     try:
-        response = requests.get(f"{API_BASE_URL}/clubs/{club_id}/similar", timeout=5)
+        response = api.get(f"/clubs/clubs/{club_id}/similar", params={"limit": 25}, timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -43,10 +41,10 @@ def fetch_similar_clubs(club_id):
         return []
 
 # Fetch own club info
-@st.cache_data(ttl=300)
+@cached("club:{club_id}", ttl=300)
 def fetch_club_info(club_id):
     try:
-        response = requests.get(f"{API_BASE_URL}/clubs/{club_id}", timeout=5)
+        response = api.get(f"/clubs/{club_id}", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -54,6 +52,21 @@ def fetch_club_info(club_id):
     except Exception as e:
         return None
 
+# Fetch clubs sharing members / recent attendees with this club
+@cached("club:{club_id}:overlap", ttl=300)
+def fetch_overlap(club_id, by):
+    try:
+        response = api.get(
+            f"/clubs/clubs/{club_id}/overlap",
+            params={"by": by, "days": 90, "limit": 10},
+            timeout=5)
+        if response.status_code == 200:
+            return response.json().get("overlaps", [])
+        else:
+            return []
+    except Exception as e:
+        return []
+
 # Get data
 similar_clubs = fetch_similar_clubs(CLUB_ID)
 own_club = fetch_club_info(CLUB_ID)
@@ -166,6 +179,7 @@ else:
     
     with col_filter2:
         sort_options = {
+            'Most Similar': 'similarity',
             'Most Events': 'total_events',
             'Highest Attendance': 'avg_attendance',
             'Alphabetical': 'club_name'
@@ -199,6 +213,10 @@ else:
                 contact = club.get('contact_email', 'N/A')
                 if contact != 'N/A':
                     st.markdown(f"📧 {contact}")
+
+                st.markdown(f"🔗 **Match:** {club.get('similarity', 0):.0%} · "
+                            f"{int(club.get('shared_members', 0))} shared members · "
+                            f"{int(club.get('shared_attendees', 0))} shared attendees")
                 
                 # Collaboration score (based on activity and attendance)
                 total_events = club.get('total_events', 0)
@@ -229,6 +247,20 @@ else:
     
     st.divider()
     
+    # Shared audience
+    st.markdown("### 👥 Shared Audience")
+    overlap_by = st.radio("Overlap by", ["members", "attendees"], horizontal=True,
+                          format_func=lambda by: "Shared members" if by == "members" else "Shared attendees (90 days)")
+    overlaps = fetch_overlap(CLUB_ID, overlap_by)
+    if overlaps:
+        overlap_df = pd.DataFrame(overlaps)[['club_name', 'shared_members', 'shared_attendees', 'member_count']]
+        overlap_df.columns = ['Club', 'Shared Members', 'Shared Attendees', 'Members']
+        st.dataframe(overlap_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No clubs share members or attendees with yours yet")
+
+    st.divider()
+
     # Collaboration tips
     with st.expander("💡 Tips for Successful Collaborations"):
         st.markdown("""
@@ -259,7 +291,7 @@ col_action1, col_action2, col_action3 = st.columns([1, 1, 2])
 
 with col_action1:
     if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
+        invalidate(f"club:{CLUB_ID}")
         st.rerun()
 
 with col_action2:
@@ -275,4 +307,4 @@ with col_action2:
 
 # Footer
 st.divider()
-st.markdown("*Similar clubs are identified based on shared categories and event types. Clubs with 5+ events are prioritized.*")
\ No newline at end of file
+st.markdown("*Similar clubs are matched on category, type, budget, competitiveness and event keywords, plus shared members and event attendees.*")
\ No newline at end of file
@@ -2,17 +2,17 @@ import json
 import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
-import requests
 from streamlit_extras.app_logo import add_logo
 from modules.nav import SideBarLinks
 import pandas as pd
+from modules import api
 
 SideBarLinks()
 
 st.write("Accessing REST API from within Streamlit")
 
 try:
-    response = requests.get('http://web-api:4000/analytics/analytics/engagement')
+    response = api.get('/analytics/analytics/engagement')
     st.write(f"Status Code: {response.status_code}")
     
     if response.status_code == 200:
@@ -1,6 +1,7 @@
 import streamlit as st
-import requests
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -13,9 +14,6 @@ STUDENT_ID = 10000001
 if 'clear_trigger' not in st.session_state:
     st.session_state.clear_trigger = 0
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎒 Ruth's Pages")
 st.sidebar.markdown("**Current:** Event Discovery")
@@ -32,7 +30,7 @@ st.markdown("Find events happening on campus")
 st.divider()
 
 # Search bar
-search_query = st.text_input("🔍 Search events by name...", placeholder="Type to search...")
+search_query = st.text_input("🔍 Search events...", placeholder="Search names, descriptions, clubs and keywords...")
 
 # Filter row
 col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
@@ -62,8 +60,8 @@ st.divider()
 # RSVP function
 def create_rsvp(event_id, event_name):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/students/students/{STUDENT_ID}/rsvps",
+        response = api.post(
+            f"/students/students/{STUDENT_ID}/rsvps",
             json={"event_id": event_id},
             timeout=5
         )
@@ -74,10 +72,10 @@ def create_rsvp(event_id, event_name):
         return False
 
 # Fetch events from API
-@st.cache_data(ttl=60)  # Cache for 60 seconds
+@cached("events", ttl=60)  # Cache for 60 seconds
 def fetch_events():
     try:
-        response = requests.get(f"{API_BASE_URL}/events", timeout=5)
+        response = api.get("/events", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -86,15 +84,58 @@ def fetch_events():
         st.error(f"Could not connect to API: {e}")
         return []
 
+# Ranked event IDs for the search box: full-text search over names,
+# descriptions, club names and keywords (the API logs each search)
+@cached("event_search", ttl=60)
+def search_event_ids(query):
+    try:
+        response = api.get(
+            "/events/search",
+            params={"q": query, "upcoming": "true", "limit": 50, "student_id": STUDENT_ID},
+            timeout=5)
+        if response.status_code == 200:
+            return [e["eventID"] for e in response.json().get("results", [])]
+        else:
+            return None
+    except Exception as e:
+        return None
+
+# Upcoming events recommended for this student
+@cached(f"recommendations:{STUDENT_ID}", ttl=60)
+def fetch_recommendations(limit=4):
+    try:
+        response = api.get(
+            f"/students/students/{STUDENT_ID}/recommendations",
+            params={"limit": limit},
+            timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return []
+    except Exception as e:
+        return []
+
+# Count a click on an event that came from a search
+def record_search_click(event_id):
+    try:
+        api.post("/events/search/clicks", json={"event_id": event_id}, timeout=2)
+    except Exception:
+        pass
+
 # Get events
 events = fetch_events()
 
 # Apply all filters
 filtered_events = events.copy()
 
-# Search filter
+# Search filter (best matches first)
 if search_query:
-    filtered_events = [e for e in filtered_events if search_query.lower() in e.get('name', '').lower()]
+    ranked_ids = search_event_ids(search_query.strip())
+    if ranked_ids is None:
+        filtered_events = [e for e in filtered_events if search_query.lower() in e.get('name', '').lower()]
+    else:
+        by_id = {e.get('eventID'): e for e in filtered_events}
+        filtered_events = [by_id[event_id] for event_id in ranked_ids if event_id in by_id]
 
 # Date filter
 if date_filter != "All Dates":
@@ -131,6 +172,26 @@ if type_filter != "All Types":
 # Use filtered_events instead of events from here on
 events = filtered_events
 
+# Recommendations (only on the unfiltered view)
+no_filters = (not search_query and date_filter == "All Dates"
+              and type_filter == "All Types" and club_filter == "All Clubs")
+recommendations = fetch_recommendations() if no_filters else []
+if recommendations:
+    st.markdown("### ✨ Recommended for you")
+    rec_cols = st.columns(len(recommendations))
+    for rec_col, rec in zip(rec_cols, recommendations):
+        with rec_col:
+            with st.container(border=True):
+                st.markdown(f"**{rec.get('name', 'Untitled Event')}**")
+                st.caption(rec.get('club_name') or '')
+                if st.button("RSVP", key=f"rec_rsvp_{rec.get('eventID')}", use_container_width=True):
+                    if create_rsvp(rec.get('eventID'), rec.get('name')):
+                        st.success(f"✓ RSVP'd to {rec.get('name')}!")
+                        invalidate("events", f"my_rsvps:{STUDENT_ID}", f"recommendations:{STUDENT_ID}")
+                    else:
+                        st.error("Failed to RSVP. Try again.")
+    st.divider()
+
 # Display events in grid
 if not events:
     st.info("No events found so far 😢. Try adjusting your filters!")
@@ -172,14 +233,18 @@ else:
                 col_a, col_b = st.columns(2)
                 with col_a:
                     if st.button("RSVP", key=f"rsvp_{event.get('eventID')}", use_container_width=True, type="primary"):
+                        if search_query:
+                            record_search_click(event.get('eventID'))
                         if create_rsvp(event.get('eventID'), event.get('name')):
                             st.success(f"✓ RSVP'd to {event.get('name')}!")
                             st.balloons()
-                            st.cache_data.clear()
+                            invalidate("events", f"my_rsvps:{STUDENT_ID}", f"recommendations:{STUDENT_ID}")
                         else:
                             st.error("Failed to RSVP. Try again.")
                 with col_b:
                     if st.button("Details →", key=f"details_{event.get('eventID')}", use_container_width=True):
+                        if search_query:
+                            record_search_click(event.get('eventID'))
                         st.session_state[f'show_details_{event.get("eventID")}'] = True
                         st.rerun()
 
@@ -2,7 +2,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 import streamlit as st
-import requests
+from modules import api
+from modules.cache import cached
 
 # Page config
 st.set_page_config(
@@ -10,9 +11,6 @@ st.set_page_config(
     page_icon="🖥️",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🖥️ David's Pages")
 st.sidebar.markdown("**Current:** Admin Home")
@@ -28,35 +26,22 @@ st.title('🖥️ System Admin Dashboard')
 st.markdown("Welcome, David! Monitor and manage the ClubHub platform.")
 st.divider()
 
-# Fetch metrics for dashboard
-@st.cache_data(ttl=60)
-def fetch_metrics():
-    try:
-        response = requests.get(f"{API_BASE_URL}/admin/metrics", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except Exception as e:
-        logger.error(f"Could not connect to metrics API: {e}")
-        return None
-
-# Fetch alerts for dashboard
-@st.cache_data(ttl=60)
-def fetch_alerts():
-    try:
-        response = requests.get(f"{API_BASE_URL}/admin/alerts", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return []
-    except Exception as e:
-        logger.error(f"Could not connect to alerts API: {e}")
-        return []
+# Fetch metrics and the latest alerts for the dashboard, both at once
+@cached("alerts:dashboard", ttl=60)
+def fetch_dashboard():
+    results = api.fetch_all({
+        "metrics": "/admin/metrics",
+        "alerts": ("/admin/alerts", {"limit": 3}),
+    }, timeout=5)
+    for name, result in results.items():
+        if result.error:
+            logger.error(f"Could not load {name} from the API: {result.error}")
+    return results["metrics"].data, results["alerts"].data or {}
 
 # Get data
-metrics = fetch_metrics()
-alerts = fetch_alerts()
+metrics, alert_page = fetch_dashboard()
+alerts = alert_page.get("alerts", [])
+alert_count = alert_page.get("total") or 0
 
 # System Status Overview
 st.markdown("### 📊 System Status")
@@ -84,7 +69,6 @@ if metrics:
             st.metric("Uptime", "N/A")
 
     # Alert summary
-    alert_count = len(alerts)
     if alert_count > 0:
         st.warning(f"⚠️ {alert_count} unresolved alert(s) require attention")
     else:
@@ -127,7 +111,6 @@ with action_col1:
 with action_col2:
     if st.button('🚨 Manage Alerts', type='primary', use_container_width=True):
         st.switch_page('pages/24_Alert_Management.py')
-    alert_count = len(alerts)
     if alert_count > 0:
         st.markdown(f"⚠️ **{alert_count} unresolved alerts**")
     else:
@@ -143,9 +126,9 @@ st.divider()
 # Recent Alerts Preview
 if alerts and len(alerts) > 0:
     st.markdown("### 🚨 Recent Alerts")
-    st.markdown(f"Showing {min(3, len(alerts))} of {len(alerts)} unresolved alerts")
+    st.markdown(f"Showing {len(alerts)} of {alert_count} unresolved alerts")
 
-    for i, alert in enumerate(alerts[:3]):  # Show top 3 alerts
+    for i, alert in enumerate(alerts):  # First page holds the 3 newest alerts
         with st.container(border=True):
             alert_type = alert.get('alertType', 'Unknown')
             alert_id = alert.get('alertID', 'N/A')
@@ -161,8 +144,8 @@ if alerts and len(alerts) > 0:
                 if st.button("View →", key=f"view_alert_{alert_id}", use_container_width=True):
                     st.switch_page('pages/24_Alert_Management.py')
 
-    if len(alerts) > 3:
-        st.markdown(f"*...and {len(alerts) - 3} more alerts*")
+    if alert_count > len(alerts):
+        st.markdown(f"*...and {alert_count - len(alerts)} more alerts*")
 
 st.divider()
 
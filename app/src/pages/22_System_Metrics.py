@@ -1,5 +1,10 @@
 import streamlit as st
-import requests
+import pandas as pd
+import plotly.express as px
+from datetime import datetime, timedelta
+from modules.push import topic_version, live_updates
+from modules import api
+from modules.cache import cached, invalidate, cache_stats
 
 # Page config
 st.set_page_config(
@@ -7,9 +12,6 @@ st.set_page_config(
     page_icon="📊",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🖥️ David's Pages")
 st.sidebar.markdown("**Current:** System Metrics")
@@ -25,11 +27,28 @@ st.title("📊 System Metrics Dashboard")
 st.markdown("Monitor real-time system health and performance")
 st.divider()
 
-# Fetch metrics from API
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def fetch_metrics():
+# Fetch metrics from API; `version` changes whenever the API records a new sample
+@cached("admin_metrics", ttl=60)  # Cache for 60 seconds
+def fetch_metrics(version=None):
+    try:
+        response = api.get("/admin/metrics", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return None
+    except Exception as e:
+        st.error(f"Could not connect to API: {e}")
+        return None
+
+# Fetch a metric time series (the API picks the raw/1m/1h/1d tier)
+@cached("admin_metrics:history", ttl=60)
+def fetch_metric_history(metric, hours, version=None):
     try:
-        response = requests.get(f"{API_BASE_URL}/admin/metrics", timeout=5)
+        params = {
+            "metric": metric,
+            "from": (datetime.now() - timedelta(hours=hours)).isoformat(timespec="minutes"),
+        }
+        response = api.get("/admin/metrics/history", params=params, timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -38,8 +57,11 @@ def fetch_metrics():
         st.error(f"Could not connect to API: {e}")
         return None
 
+# Rerun when the API pushes a new sample instead of polling
+live_updates("metrics")
+
 # Get metrics
-metrics = fetch_metrics()
+metrics = fetch_metrics(topic_version("metrics"))
 
 if metrics:
     # Top row - Key metrics
@@ -126,11 +148,60 @@ if metrics:
 
     st.divider()
 
+    # Trends section
+    st.markdown("### 📈 Trends")
+    trend_col1, trend_col2 = st.columns([2, 1])
+
+    with trend_col1:
+        trend_metric = st.selectbox(
+            "Metric",
+            ["api_requests", "api_latency_avg_ms", "api_latency_max_ms", "api_errors",
+             "db_ping_ms", "db_queries_per_sec", "db_threads_connected",
+             "servers_offline", "eventlog_errors"]
+        )
+
+    with trend_col2:
+        ranges = {"Last hour": 1, "Last 24 hours": 24, "Last 7 days": 24 * 7, "Last 90 days": 24 * 90}
+        trend_range = st.selectbox("Range", list(ranges.keys()))
+
+    history = fetch_metric_history(trend_metric, ranges[trend_range], topic_version("metrics"))
+    if history and history.get("points"):
+        trend_df = pd.DataFrame(history["points"])
+        trend_df["t"] = pd.to_datetime(trend_df["t"])
+        for column in ["avg", "min", "max"]:
+            trend_df[column] = pd.to_numeric(trend_df[column])
+
+        fig = px.line(
+            trend_df,
+            x="t",
+            y=["avg", "max"],
+            labels={"t": "Time", "value": history.get("unit") or trend_metric, "variable": ""},
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Served from the {history['tier']} tier, one point per {history['step']}s")
+    else:
+        st.info("No samples recorded for this metric in the selected range yet")
+
+    # Frontend cache and API client, as seen by this Streamlit server
+    with st.expander("Frontend cache and API calls"):
+        stats = cache_stats()
+        st.caption(f"{stats['entries']} cached entries")
+        if stats["namespaces"]:
+            cache_df = pd.DataFrame.from_dict(stats["namespaces"], orient="index")
+            cache_df["hit_rate"] = (pd.to_numeric(cache_df["hit_rate"]) * 100).round(1)
+            st.dataframe(cache_df.rename_axis("namespace"), use_container_width=True)
+        timings = api.get_client().timings()
+        if timings:
+            st.dataframe(pd.DataFrame.from_dict(timings, orient="index").rename_axis("endpoint"),
+                         use_container_width=True)
+
+    st.divider()
+
     # Refresh button
     col_refresh1, col_refresh2, col_refresh3 = st.columns([1, 1, 2])
     with col_refresh1:
         if st.button("🔄 Refresh Metrics", use_container_width=True):
-            st.cache_data.clear()
+            invalidate("admin_metrics")
             st.rerun()
 
     # System status indicator
@@ -144,9 +215,9 @@ if metrics:
 else:
     st.error("Unable to load system metrics. Please check if the API is running.")
     if st.button("Retry"):
-        st.cache_data.clear()
+        invalidate("admin_metrics")
         st.rerun()
 
 # Footer
 st.divider()
-st.markdown("*Metrics are updated every 60 seconds. Click Refresh for latest data.*")
+st.markdown("*Metrics update live as the API records new samples.*")
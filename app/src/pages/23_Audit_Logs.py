@@ -1,7 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -9,9 +10,6 @@ st.set_page_config(
     page_icon="📋",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🖥️ David's Pages")
 st.sidebar.markdown("**Current:** Audit Logs")
@@ -27,73 +25,106 @@ st.title("📋 Audit Logs Viewer")
 st.markdown("Review system authentication, event activity, and system action logs")
 st.divider()
 
-# Fetch audit logs from API
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def fetch_audit_logs():
+# Fetch audit logs from API (one page, filtered server-side)
+@cached("audit_logs", ttl=60)  # Cache for 60 seconds
+def fetch_audit_logs(severity=None, status=None, server_id=None, search=None, cursor=None, limit=100):
+    params = {"limit": limit}
+    if severity:
+        params["severity"] = severity
+    if status:
+        params["status"] = status
+    if server_id:
+        params["serverID"] = server_id
+    if search:
+        params["q"] = search
+    if cursor:
+        params["cursor"] = cursor
     try:
-        response = requests.get(f"{API_BASE_URL}/admin/audit-logs", timeout=5)
+        response = api.get("/admin/audit-logs", params=params, timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
-            return []
+            return None
     except Exception as e:
         st.error(f"Could not connect to API: {e}")
-        return []
-
-# Get logs
-logs = fetch_audit_logs()
-
-if logs:
-    # Convert to DataFrame
-    df = pd.DataFrame(logs)
-
-    # Filter row
-    st.markdown("### 🔍 Filters")
-    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
-
-    # Get unique values for filters
-    severities = ['All Severities'] + sorted(df['severity'].dropna().unique().tolist()) if 'severity' in df.columns else ['All Severities']
-    statuses = ['All Statuses'] + sorted(df['status'].dropna().unique().tolist()) if 'status' in df.columns else ['All Statuses']
-    server_ids = ['All Servers'] + sorted([str(x) for x in df['serverID'].dropna().unique().tolist()]) if 'serverID' in df.columns else ['All Servers']
+        return None
 
-    with col1:
-        severity_filter = st.selectbox("⚠️ Severity", severities)
+# Fetch the distinct filter values (with counts) for the dropdowns
+@cached("audit_logs:facets", ttl=300)
+def fetch_audit_log_facets():
+    try:
+        response = api.get("/admin/audit-logs/facets", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return {}
+    except Exception as e:
+        st.error(f"Could not connect to API: {e}")
+        return {}
 
-    with col2:
-        status_filter = st.selectbox("📊 Status", statuses)
+facets = fetch_audit_log_facets()
 
-    with col3:
-        server_filter = st.selectbox("🖥️ Server", server_ids)
+# Filter row
+st.markdown("### 🔍 Filters")
+col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
 
-    with col4:
-        st.markdown("<br>", unsafe_allow_html=True)  # spacing
-        if st.button("Clear Filters", use_container_width=True):
-            st.rerun()
+# Get unique values for filters
+severities = ['All Severities'] + [str(f['value']) for f in facets.get('severity', []) if f['value'] is not None]
+statuses = ['All Statuses'] + [str(f['value']) for f in facets.get('status', []) if f['value'] is not None]
+server_ids = ['All Servers'] + [str(f['value']) for f in facets.get('serverID', []) if f['value'] is not None]
 
-    # Search bar
-    search_query = st.text_input("🔍 Search logs...", placeholder="Search by any field...")
+with col1:
+    severity_filter = st.selectbox("⚠️ Severity", severities)
 
-    st.divider()
+with col2:
+    status_filter = st.selectbox("📊 Status", statuses)
 
-    # Apply filters
-    filtered_df = df.copy()
+with col3:
+    server_filter = st.selectbox("🖥️ Server", server_ids)
 
-    if severity_filter != 'All Severities':
-        filtered_df = filtered_df[filtered_df['severity'] == severity_filter]
+with col4:
+    st.markdown("<br>", unsafe_allow_html=True)  # spacing
+    if st.button("Clear Filters", use_container_width=True):
+        st.rerun()
 
-    if status_filter != 'All Statuses':
-        filtered_df = filtered_df[filtered_df['status'] == status_filter]
+# Search bar
+search_query = st.text_input("🔍 Search logs...", placeholder="Search log messages...")
 
-    if server_filter != 'All Servers':
-        filtered_df = filtered_df[filtered_df['serverID'].astype(str) == server_filter]
+st.divider()
 
-    if search_query:
-        # Search across all columns
-        mask = filtered_df.astype(str).apply(lambda row: row.str.contains(search_query, case=False).any(), axis=1)
-        filtered_df = filtered_df[mask]
+filters = {
+    "severity": None if severity_filter == 'All Severities' else severity_filter,
+    "status": None if status_filter == 'All Statuses' else status_filter,
+    "server_id": None if server_filter == 'All Servers' else server_filter,
+    "search": search_query or None,
+}
+
+# Start over from the first page whenever the filters change
+if st.session_state.get("audit_log_filters") != filters:
+    st.session_state["audit_log_filters"] = filters
+    st.session_state["audit_log_cursors"] = [None]
+
+# Get logs: every page loaded so far, newest first
+logs = []
+total = None
+next_cursor = None
+api_ok = True
+for page_cursor in st.session_state["audit_log_cursors"]:
+    page = fetch_audit_logs(cursor=page_cursor, **filters)
+    if page is None:
+        api_ok = False
+        break
+    logs.extend(page.get("logs", []))
+    if page.get("total") is not None:
+        total = page["total"]
+    next_cursor = page.get("next_cursor")
+
+if api_ok:
+    # Convert to DataFrame (already filtered by the API)
+    filtered_df = pd.DataFrame(logs)
 
     # Display summary
-    st.markdown(f"### 📊 Showing {len(filtered_df)} of {len(df)} logs")
+    st.markdown(f"### 📊 Showing {len(filtered_df)} of {total if total is not None else len(filtered_df)} logs")
 
     # Summary metrics
     if len(filtered_df) > 0:
@@ -120,10 +151,6 @@ if logs:
         # Display logs
         st.markdown("### 📜 Log Entries")
 
-        # Sort by timestamp descending
-        if 'logTimestamp' in filtered_df.columns:
-            filtered_df = filtered_df.sort_values('logTimestamp', ascending=False)
-
         # Display each log entry
         for idx, log in filtered_df.iterrows():
             with st.container(border=True):
@@ -177,6 +204,11 @@ if logs:
                     except:
                         st.markdown(f"📅 **Server Last Updated:** {server_updated}")
 
+        if next_cursor:
+            if st.button("⬇️ Load more", use_container_width=True):
+                st.session_state["audit_log_cursors"].append(next_cursor)
+                st.rerun()
+
     else:
         st.info("No logs match the selected filters")
 
@@ -187,11 +219,11 @@ if logs:
 
     with export_col1:
         if st.button("🔄 Refresh Logs", use_container_width=True):
-            st.cache_data.clear()
+            invalidate("audit_logs")
             st.rerun()
 
     with export_col2:
-        # Convert to CSV for download
+        # Convert the loaded pages to CSV for download
         csv = filtered_df.to_csv(index=False)
         st.download_button(
             label="📥 Download CSV",
@@ -201,10 +233,27 @@ if logs:
             use_container_width=True
         )
 
+    with export_col3:
+        # Full export of every matching log: the browser downloads the API's
+        # streamed CSV directly, so it never passes through this process
+        export_params = {
+            "severity": filters["severity"],
+            "status": filters["status"],
+            "serverID": filters["server_id"],
+            "q": filters["search"],
+            "format": "csv",
+        }
+        st.link_button(
+            "📦 Download All Matching Logs",
+            api.public_url("/admin/audit-logs/export",
+                           params={k: v for k, v in export_params.items() if v}),
+            use_container_width=True
+        )
+
 else:
     st.error("Unable to load audit logs. Please check if the API is running.")
     if st.button("Retry"):
-        st.cache_data.clear()
+        invalidate("audit_logs")
         st.rerun()
 
 # Footer
@@ -1,7 +1,9 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
+from modules.push import topic_version, live_updates
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -9,9 +11,6 @@ st.set_page_config(
     page_icon="🚨",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🖥️ David's Pages")
 st.sidebar.markdown("**Current:** Alert Management")
@@ -27,34 +26,45 @@ st.title("🚨 Alert Management")
 st.markdown("View and resolve system alerts")
 st.divider()
 
-# Fetch alerts from API
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def fetch_alerts():
+# Fetch alerts from API (first page plus totals per type);
+# `version` changes whenever alerts are opened or resolved
+@cached("alerts", ttl=60)  # Cache for 60 seconds
+def fetch_alerts(version=None):
     try:
-        response = requests.get(f"{API_BASE_URL}/admin/alerts", timeout=5)
+        response = api.get("/admin/alerts", params={"limit": 200}, timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
-            return []
+            return {}
     except Exception as e:
         st.error(f"Could not connect to API: {e}")
-        return []
+        return {}
 
-# Function to resolve an alert
-def resolve_alert(alert_id):
+# Resolve several alerts in one request, by ID list or by filter
+def resolve_alerts(alert_ids=None, alert_filter=None):
+    payload = {"alert_ids": alert_ids} if alert_ids else {"filter": alert_filter}
     try:
-        response = requests.put(f"{API_BASE_URL}/admin/alerts/{alert_id}", timeout=5)
+        response = api.post("/admin/alerts/resolve", json=payload, timeout=5)
         if response.status_code == 200:
-            return True, "Alert resolved successfully!"
-        elif response.status_code == 404:
-            return False, "Alert not found"
+            resolved = response.json().get("resolved", 0)
+            return True, f"{resolved} alert(s) resolved successfully!"
         else:
             return False, f"Error: Status {response.status_code}"
     except Exception as e:
         return False, f"Could not connect to API: {e}"
 
+# Only alert data (this list and the admin dashboard) is stale after a resolve
+def refresh_alerts():
+    invalidate("alerts")
+    st.rerun()
+
+# Rerun when alerts change instead of polling
+live_updates("alerts")
+
 # Get alerts
-alerts = fetch_alerts()
+page = fetch_alerts(topic_version("alerts"))
+alerts = page.get("alerts", [])
+counts_by_type = page.get("counts_by_type") or []
 
 if alerts:
     # Summary metrics
@@ -62,17 +72,12 @@ if alerts:
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        total_alerts = len(alerts)
+        total_alerts = page.get("total") or len(alerts)
         st.metric("Total Unresolved Alerts", total_alerts)
 
     with col2:
         # Count by alert type
-        if total_alerts > 0:
-            df = pd.DataFrame(alerts)
-            alert_types = df['alertType'].nunique() if 'alertType' in df.columns else 0
-            st.metric("Alert Types", alert_types)
-        else:
-            st.metric("Alert Types", 0)
+        st.metric("Alert Types", len(counts_by_type))
 
     with col3:
         # Count alerts with eventID
@@ -92,9 +97,8 @@ if alerts:
 
         with col_viz1:
             st.markdown("### Alert Type Distribution")
-            df = pd.DataFrame(alerts)
-            if 'alertType' in df.columns:
-                type_counts = df['alertType'].value_counts().reset_index()
+            type_counts = pd.DataFrame(counts_by_type)
+            if not type_counts.empty:
                 type_counts.columns = ['Alert Type', 'Count']
 
                 fig = px.bar(
@@ -111,7 +115,7 @@ if alerts:
 
         with col_viz2:
             st.markdown("### Alert Category Breakdown")
-            if 'alertType' in df.columns:
+            if not type_counts.empty:
                 fig = px.pie(
                     type_counts,
                     values='Count',
@@ -128,6 +132,39 @@ if alerts:
     st.markdown("### 🚨 Unresolved Alerts")
 
     if total_alerts > 0:
+        # Bulk actions
+        bulk_col1, bulk_col2, bulk_col3 = st.columns([2, 1, 1])
+
+        with bulk_col1:
+            bulk_type = st.selectbox(
+                "Alert type",
+                [row['alertType'] for row in counts_by_type],
+                label_visibility="collapsed"
+            )
+
+        with bulk_col2:
+            if st.button("✓ Resolve All of Type", use_container_width=True):
+                success, message = resolve_alerts(alert_filter={"alertType": bulk_type})
+                if success:
+                    st.success(message)
+                    refresh_alerts()
+                else:
+                    st.error(message)
+
+        with bulk_col3:
+            selected_ids = [
+                alert['alertID'] for alert in alerts
+                if st.session_state.get(f"select_{alert['alertID']}")
+            ]
+            if st.button(f"✓ Resolve Selected ({len(selected_ids)})",
+                         use_container_width=True, disabled=not selected_ids):
+                success, message = resolve_alerts(alert_ids=selected_ids)
+                if success:
+                    st.success(message)
+                    refresh_alerts()
+                else:
+                    st.error(message)
+
         # Display alerts
         for alert in alerts:
             with st.container(border=True):
@@ -152,15 +189,8 @@ if alerts:
                     st.markdown(f"*Alert ID: {alert_id}*")
 
                 with col_header3:
-                    # Resolve button
-                    if st.button("✓ Resolve", key=f"resolve_{alert_id}", use_container_width=True):
-                        success, message = resolve_alert(alert_id)
-                        if success:
-                            st.success(message)
-                            st.cache_data.clear()
-                            st.rerun()
-                        else:
-                            st.error(message)
+                    # Select for bulk resolve
+                    st.checkbox("Select", key=f"select_{alert_id}")
 
                 # Description
                 description = alert.get('description', 'No description available')
@@ -186,16 +216,14 @@ if alerts:
 
     # Refresh button
     if st.button("🔄 Refresh Alerts", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
+        refresh_alerts()
 
 else:
     # Check if it's because there are no alerts or API error
     st.success("✓ No unresolved alerts found. System is healthy!")
     st.info("If you expect to see alerts, please check if the API is running.")
     if st.button("Retry"):
-        st.cache_data.clear()
-        st.rerun()
+        refresh_alerts()
 
 # Footer
 st.divider()
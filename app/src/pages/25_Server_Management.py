@@ -1,8 +1,9 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -10,9 +11,6 @@ st.set_page_config(
     page_icon="🖥️",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🖥️ David's Pages")
 st.sidebar.markdown("**Current:** Server Management")
@@ -28,37 +26,19 @@ st.title("🖥️ Server Management")
 st.markdown("Monitor individual server health and activity")
 st.divider()
 
-# Fetch audit logs to get server information
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def fetch_audit_logs():
-    try:
-        response = requests.get(f"{API_BASE_URL}/admin/audit-logs", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return []
-    except Exception as e:
-        st.error(f"Could not connect to API: {e}")
-        return []
-
-# Fetch metrics to get server counts
-@st.cache_data(ttl=60)
-def fetch_metrics():
-    try:
-        response = requests.get(f"{API_BASE_URL}/admin/metrics", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except Exception as e:
-        st.error(f"Could not connect to API: {e}")
-        return None
+# Fetch servers (with their per-server log counts) and the server counts, both at once
+@cached("servers", ttl=60)  # Cache for 60 seconds
+def fetch_server_overview():
+    results = api.fetch_all({"servers": "/admin/servers", "metrics": "/admin/metrics"}, timeout=5)
+    errors = [f"{name}: {result.error}" for name, result in results.items() if result.error]
+    return results["servers"].data or [], results["metrics"].data, errors
 
 # Get data
-logs = fetch_audit_logs()
-metrics = fetch_metrics()
+servers, metrics, fetch_errors = fetch_server_overview()
+for error in fetch_errors:
+    st.error(f"Could not load from API - {error}")
 
-if logs or metrics:
+if servers or metrics:
     # Summary from metrics
     if metrics:
         st.markdown("### 📊 Server Overview")
@@ -78,19 +58,12 @@ if logs or metrics:
 
         st.divider()
 
-    # Process logs to get server information
-    if logs:
-        df = pd.DataFrame(logs)
+    # Server information (log counts are computed over all of EventLog by the API)
+    if servers:
+        df = pd.DataFrame(servers)
 
-        # Get unique servers
         if 'serverID' in df.columns:
-            # Group by server to get latest info
-            server_info = df.groupby('serverID').agg({
-                'ipAddress': 'first',
-                'serverStatus': 'first',
-                'serverLastUpdated': 'first',
-                'logID': 'count'  # Count logs per server
-            }).reset_index()
+            server_info = df[['serverID', 'ipAddress', 'status', 'lastUpdated', 'log_count']].copy()
             server_info.columns = ['Server ID', 'IP Address', 'Status', 'Last Updated', 'Log Count']
 
             # Sort by Server ID
@@ -129,13 +102,13 @@ if logs or metrics:
             )
 
         else:
-            st.info("No server information available in audit logs")
+            st.info("No server information available")
 
     st.divider()
 
     # Refresh button
     if st.button("🔄 Refresh Server Data", use_container_width=True):
-        st.cache_data.clear()
+        invalidate("servers")
         st.rerun()
 
     # Warnings
@@ -147,7 +120,7 @@ if logs or metrics:
 else:
     st.error("Unable to load server information. Please check if the API is running.")
     if st.button("Retry"):
-        st.cache_data.clear()
+        invalidate("servers")
         st.rerun()
 
 # Footer
@@ -1,7 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 import altair as alt
+from modules import api
+from modules.cache import cached
 
 # Page config
 st.set_page_config(
@@ -10,9 +11,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎒 Ruth's Pages")
 st.sidebar.page_link("pages/1_Ruth_Event_Discovery.py", label="Event Discovery")
@@ -29,10 +27,10 @@ st.markdown("Try comparing your clubs side-by-side to find the best fit 🧐")
 st.divider()
 
 # Fetch all clubs
-@st.cache_data(ttl=60)
+@cached("clubs", ttl=60)
 def fetch_all_clubs():
     try:
-        response = requests.get(f"{API_BASE_URL}/clubs/clubs", timeout=5)
+        response = api.get("/clubs/clubs", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -45,7 +43,7 @@ def fetch_all_clubs():
 def fetch_club_comparison(club_ids):
     try:
         ids_str = ','.join(map(str, club_ids))
-        response = requests.get(f"{API_BASE_URL}/clubs/clubs/compare?ids={ids_str}", timeout=5)
+        response = api.get(f"/clubs/clubs/compare?ids={ids_str}", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -54,6 +52,21 @@ def fetch_club_comparison(club_ids):
         st.error(f"Could not fetch comparison: {e}")
         return []
 
+# Club names matching what the user typed, best first
+@cached("clubs:search", ttl=60)
+def search_club_names(query):
+    try:
+        response = api.get(
+            "/autocomplete",
+            params={"q": query, "kinds": "clubs", "limit": 20},
+            timeout=5)
+        if response.status_code == 200:
+            return [s["name"] for s in response.json().get("clubs", [])]
+        else:
+            return []
+    except Exception as e:
+        return []
+
 # Get all clubs
 all_clubs = fetch_all_clubs()
 
@@ -66,10 +79,20 @@ else:
     # Create a mapping of club names to IDs
     club_options = {club['club_name']: club['club_id'] for club in all_clubs}
     
+    # Narrow the choices with the search box; clubs already picked stay selectable
+    club_query = st.text_input("🔍 Find clubs", placeholder="Type a club name...")
+    if club_query.strip():
+        already_selected = st.session_state.get("compare_clubs", [])
+        suggested = [name for name in search_club_names(club_query.strip()) if name in club_options]
+        visible_clubs = list(dict.fromkeys(already_selected + suggested))
+    else:
+        visible_clubs = list(club_options.keys())
+
     # Multi-select for clubs
     selected_club_names = st.multiselect(
         "Choose clubs:",
-        options=list(club_options.keys()),
+        options=visible_clubs,
+        key="compare_clubs",
         max_selections=4,
         help="Select 2-4 clubs to compare"
     )
@@ -91,24 +114,38 @@ else:
                 
                 # Create comparison table
                 comparison_df = pd.DataFrame(comparison_data)
+                comparison_df['top_keywords'] = comparison_df['top_keywords'].apply(', '.join)
                 
                 # Rename columns for display
                 column_names = {
                     'club_name': 'Club Name',
-                    'curriculum': 'Curator',
+                    'category': 'Category',
+                    'type': 'Type',
+                    'adviser': 'Adviser',
                     'budget': 'Budget ($)',
                     'number_of_members': 'Members',
-                    'benefits': 'Benefits',
+                    'events_per_month': 'Events / Month',
+                    'avg_attendance': 'Avg Attendance',
+                    'rsvp_conversion': 'RSVP Conversion',
+                    'upcoming_events': 'Upcoming Events',
+                    'top_keywords': 'Top Keywords',
                     'competitiveness_level': 'Competitiveness'
                 }
                 
-                comparison_df = comparison_df.rename(columns=column_names)
+                comparison_df = comparison_df[list(column_names)].rename(columns=column_names)
+                numeric_columns = ['Budget ($)', 'Members', 'Events / Month', 'Avg Attendance',
+                                   'RSVP Conversion', 'Upcoming Events', 'Competitiveness']
+                comparison_df[numeric_columns] = comparison_df[numeric_columns].apply(pd.to_numeric)
+                comparison_df['RSVP Conversion'] = (comparison_df['RSVP Conversion'] * 100).round(1)
                 
                 # Display as table
                 st.dataframe(
                     comparison_df,
                     use_container_width=True,
-                    hide_index=True
+                    hide_index=True,
+                    column_config={
+                        'RSVP Conversion': st.column_config.NumberColumn('RSVP Conversion', format='%.1f%%'),
+                    }
                 )
                 
                 # Visual comparison charts
@@ -149,6 +186,28 @@ else:
     
                     st.altair_chart(members_chart, use_container_width=True)
                 
+                col3, col4 = st.columns(2)
+                
+                with col3:
+                    st.markdown("**Average Attendance per Event**")
+                    attendance_chart = alt.Chart(comparison_df).mark_bar().encode(
+                        x=alt.X('Club Name:N', sort='-y', title='Club'),
+                        y=alt.Y('Avg Attendance:Q', title='Attendees'),
+                        tooltip=['Club Name', 'Avg Attendance', 'RSVP Conversion']
+                    ).properties(height=400)
+    
+                    st.altair_chart(attendance_chart, use_container_width=True)
+                
+                with col4:
+                    st.markdown("**Events per Month**")
+                    events_chart = alt.Chart(comparison_df).mark_bar().encode(
+                        x=alt.X('Club Name:N', sort='-y', title='Club'),
+                        y=alt.Y('Events / Month:Q', title='Events / Month'),
+                        tooltip=['Club Name', 'Events / Month', 'Upcoming Events']
+                    ).properties(height=400)
+    
+                    st.altair_chart(events_chart, use_container_width=True)
+                
                 # Highlight best/worst
                 st.divider()
                 st.markdown("### 💡 Quick Insights")
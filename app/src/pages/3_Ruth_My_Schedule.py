@@ -1,6 +1,7 @@
 import streamlit as st
-import requests
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -9,9 +10,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Hardcoded student ID (will come from auth later)
 STUDENT_ID = 10000001
 
@@ -30,11 +28,11 @@ st.title("📅 My Schedule")
 st.divider()
 
 # Fetch user's RSVPs
-@st.cache_data(ttl=30)  # Cache for 30 seconds (shorter since this changes often)
+@cached(f"my_rsvps:{STUDENT_ID}", ttl=30)  # Cache for 30 seconds (shorter since this changes often)
 def fetch_my_rsvps():
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/students/students/{STUDENT_ID}/rsvps", 
+        response = api.get(
+            f"/students/students/{STUDENT_ID}/rsvps", 
             timeout=5
         )
         if response.status_code == 200:
@@ -118,11 +116,11 @@ else:
                 if st.button("❌ Cancel RSVP", key=f"cancel_{event.get('rsvp_id')}", use_container_width=True):
                     rsvp_id = event.get('rsvp_id')
                     try:
-                        resp = requests.delete(
-                            f"{API_BASE_URL}/students/students/{STUDENT_ID}/rsvps/{rsvp_id}", timeout=5)
+                        resp = api.delete(
+                            f"/students/students/{STUDENT_ID}/rsvps/{rsvp_id}", timeout=5)
                         if resp.status_code == 200:
                             st.success("RSVP cancelled.")
-                            st.cache_data.clear()
+                            invalidate(f"my_rsvps:{STUDENT_ID}", "events", f"recommendations:{STUDENT_ID}")
                             st.rerun()
                         elif resp.status_code == 404:
                             st.error("RSVP not found. It may have already been cancelled.")
@@ -144,7 +142,7 @@ with col_a:
 
 with col_b:
     if st.button("🔄 Refresh Schedule", use_container_width=True):
-        st.cache_data.clear()
+        invalidate(f"my_rsvps:{STUDENT_ID}")
         st.rerun()
 
 st.markdown("*Your schedule syncs automatically with ClubHub*")
\ No newline at end of file
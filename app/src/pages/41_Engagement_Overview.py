@@ -1,11 +1,11 @@
 import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
-import requests
 from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
+from modules import api
 
 SideBarLinks()
 
@@ -21,7 +21,7 @@ st.markdown("Comprehensive view of platform engagement metrics")
 st.divider()
 
 #API endpoint
-API_URL = "http://web-api:4000/analytics/engagement"
+API_URL = "/analytics/engagement"
 
 events, rsvps, checkins, active_users = 0, 0, 0, 0
 past_events, past_rsvps, past_checkins, past_active_users = 0, 0, 0, 0
@@ -29,82 +29,51 @@ engagement = 0
 events_by_month_df = pd.DataFrame()
 top_clubs_df = pd.DataFrame()
 
-try:
-    response = requests.get(f"{API_URL}/current-metrics")
-    if response.status_code == 200:
-        current_metrics = response.json()
-        events = current_metrics.get("total_events", 0)
-        rsvps = current_metrics.get("total_rsvps", 0)
-        checkins = current_metrics.get("total_checkins", 0)
-        active_users = current_metrics.get("active_users", 0)
-    else:
-        st.error("Failed to fetch current period metrics.")
-        current_metrics = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching current period metrics: {e}")
-    current_metrics = {}
-
-
-try:
-    response = requests.get(f"{API_URL}/previous-metrics")
-    if response.status_code == 200:
-        previous_metrics = response.json()
-        past_events = previous_metrics.get("total_events", 0)
-        past_rsvps = previous_metrics.get("total_rsvps", 0)
-        past_checkins = previous_metrics.get("total_checkins", 0)
-        past_active_users = previous_metrics.get("active_users", 0)
-    else:
-        st.error(f"Failed to fetch previous metrics. Status: {response.status_code}")
-        previous_metrics = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching previous metrics: {e}")
-    previous_metrics = {}
-
-try:
-    response = requests.get(f"{API_URL}/events-by-month")
-    if response.status_code == 200:
-        events_by_month_data = response.json()
-        if events_by_month_data:
-            # Store as DataFrame
-            events_by_month_df = pd.DataFrame(events_by_month_data)
-        else:
-            st.info("No event data available")
-    else:
-        st.error("Failed to fetch events by month.")
-        events_by_month_data = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching events by month: {e}")
-    events_by_month_data = {}
-
-try:
-    response = requests.get(f'{API_URL}/top-clubs')
-    if response.status_code == 200:
-        top_clubs_data = response.json()
-        if top_clubs_data:
-            top_clubs_df = pd.DataFrame(top_clubs_data)
-        else:
-            st.info("No top clubs data available")
-    else:
-        st.error("Failed to fetch top clubs data.")
-        top_clubs_data = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching top clubs data: {e}")
-    top_clubs_data = {}
-
-try:
-    response = requests.get(f'{API_URL}/engagement-rate')
-    if response.status_code == 200:
-        engagement_rate = response.json()
-        if engagement_rate:
-            engagement = engagement_rate.get("engagement_rate", 0)
-        else:
-            st.info("No engagement trends data available")
-    else:
-        st.error("Failed to fetch engagement trends data.")
-        engagement_trends_data = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching engagement trends data: {e}")
-    engagement_trends_data = {}
+# All five calls run at once; a failed one only blanks its own section
+results = api.fetch_all({
+    "current": f"{API_URL}/current-metrics",
+    "previous": f"{API_URL}/previous-metrics",
+    "events_by_month": f"{API_URL}/events-by-month",
+    "top_clubs": f"{API_URL}/top-clubs",
+    "engagement_rate": f"{API_URL}/engagement-rate",
+})
+
+current_metrics = results["current"].data or {}
+if results["current"].error:
+    st.error(f"Error fetching current period metrics: {results['current'].error}")
+events = current_metrics.get("total_events", 0)
+rsvps = current_metrics.get("total_rsvps", 0)
+checkins = current_metrics.get("total_checkins", 0)
+active_users = current_metrics.get("active_users", 0)
+
+previous_metrics = results["previous"].data or {}
+if results["previous"].error:
+    st.error(f"Error fetching previous metrics: {results['previous'].error}")
+past_events = previous_metrics.get("total_events", 0)
+past_rsvps = previous_metrics.get("total_rsvps", 0)
+past_checkins = previous_metrics.get("total_checkins", 0)
+past_active_users = previous_metrics.get("active_users", 0)
+
+if results["events_by_month"].error:
+    st.error(f"Error fetching events by month: {results['events_by_month'].error}")
+elif results["events_by_month"].data:
+    events_by_month_df = pd.DataFrame(results["events_by_month"].data)
+else:
+    st.info("No event data available")
+
+if results["top_clubs"].error:
+    st.error(f"Error fetching top clubs data: {results['top_clubs'].error}")
+elif results["top_clubs"].data:
+    top_clubs_df = pd.DataFrame(results["top_clubs"].data)
+else:
+    st.info("No top clubs data available")
+
+if results["engagement_rate"].error:
+    st.error(f"Error fetching engagement trends data: {results['engagement_rate'].error}")
+elif results["engagement_rate"].data:
+    engagement = results["engagement_rate"].data.get("engagement_rate", 0)
+else:
+    st.info("No engagement trends data available")
 
 if past_events == 0:
     past_events = 1
@@ -1,10 +1,10 @@
 import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
-import requests
 from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
+from modules import api
 
 SideBarLinks()
 
@@ -20,51 +20,29 @@ st.markdown("Analyze user search behavior and popular keywords")
 st.divider()
 
 #API endpoint
-API_URL = "http://web-api:4000/analytics/search"
+API_URL = "/analytics/search"
 
-no_result_searches = 0
-total_searches = 0
-unique_queries = 0
-try:
-    response = requests.get(f"{API_URL}/summary")
-    if response.status_code == 200:
-        search_summary = response.json()
-        total_searches = search_summary.get("total_searches", 0)
-        no_result_searches = search_summary.get("no_result_searches", 0)
-        unique_queries = search_summary.get("unique_queries", 0)
-    else:
-        st.error(f"Failed to fetch summary data. Status: {response.status_code}")
-        search_summary = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching summary data: {e}")
-    search_summary = {}
+# The three calls run at once; a failed one only blanks its own section
+results = api.fetch_all({
+    "summary": f"{API_URL}/summary",
+    "top_keywords": f"{API_URL}/top-keywords",
+    "no_results": f"{API_URL}/no-results",
+})
 
-top_keywords_df = pd.DataFrame()
+search_summary = results["summary"].data or {}
+if results["summary"].error:
+    st.error(f"Error fetching summary data: {results['summary'].error}")
+total_searches = search_summary.get("total_searches", 0)
+no_result_searches = search_summary.get("no_result_searches", 0)
+unique_queries = search_summary.get("unique_queries", 0)
 
-try:
-    response = requests.get(f"{API_URL}/top-keywords")
-    if response.status_code == 200:
-        top_keywords_data = response.json()
-        top_keywords_df = pd.DataFrame(top_keywords_data)
-    else:
-        st.error(f"Failed to fetch top keywords. Status: {response.status_code}")
-        top_keywords_df = pd.DataFrame()
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching top keywords: {e}")
-    top_keywords_df = pd.DataFrame()
+top_keywords_df = pd.DataFrame(results["top_keywords"].data or [])
+if results["top_keywords"].error:
+    st.error(f"Error fetching top keywords: {results['top_keywords'].error}")
 
-no_results_df = pd.DataFrame()
-try:
-    response = requests.get(f'{API_URL}/no-results')
-    if response.status_code == 200:
-        no_results_data = response.json()
-        no_results_df = pd.DataFrame(no_results_data)
-    else:
-        st.error(f"Failed to fetch no-results searches. Status: {response.status_code}")
-        no_results_df = pd.DataFrame()
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching no-results searches: {e}")
-    no_results_df = pd.DataFrame()
+no_results_df = pd.DataFrame(results["no_results"].data or [])
+if results["no_results"].error:
+    st.error(f"Error fetching no-results searches: {results['no_results'].error}")
 
 st.subheader("Search Summary")
 col1, col2, col3 = st.columns(3)
@@ -1,11 +1,11 @@
 import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
-import requests
 from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
+from modules import api
 
 SideBarLinks()
 
@@ -19,60 +19,31 @@ st.title("🎓 Student Demographics Dashboard")
 st.markdown("Explore demographic data of the student population")
 st.divider()
 
-API_URL = "http://web-api:4000/analytics/demographics"
+API_URL = "/analytics/demographics"
 
-by_year_df = pd.DataFrame()
-by_major_df = pd.DataFrame()
-event_pref_df = pd.DataFrame()
-underserved_df = pd.DataFrame()
+# The four calls run at once; a failed one only blanks its own section
+results = api.fetch_all({
+    "by_year": f"{API_URL}/by-year",
+    "by_major": f"{API_URL}/by-major",
+    "event_preferences": f"{API_URL}/event-preferences",
+    "underserved": f"{API_URL}/underserved",
+})
 
-try:
-    response = requests.get(f"{API_URL}/by-year")
-    if response.status_code == 200:
-        year_data = response.json()
-        by_year_df = pd.DataFrame(year_data)
-    else:
-        st.error(f"Failed to fetch demographics summary. Status: {response.status_code}")
-        demographics_summary = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching demographics summary: {e}")
-    demographics_summary = {}
-
-try:
-    response = requests.get(f"{API_URL}/by-major")
-    if response.status_code == 200:
-        major_data = response.json()
-        by_major_df = pd.DataFrame(major_data)
-    else:
-        st.error(f"Failed to fetch demographics summary. Status: {response.status_code}")
-        demographics_summary = {}
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching demographics summary: {e}")
-    demographics_summary = {}
-
-try:
-    response = requests.get(f"{API_URL}/event-preferences")
-    if response.status_code == 200:
-        event_pref_data = response.json()
-        event_pref_df = pd.DataFrame(event_pref_data)
-    else:
-        st.error(f"Failed to fetch event preferences. Status: {response.status_code}")
-        event_pref_df = pd.DataFrame()
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching event preferences: {e}")
-    event_pref_df = pd.DataFrame()
-
-try:
-    response = requests.get(f"{API_URL}/underserved")
-    if response.status_code == 200:
-        underserved_data = response.json()
-        underserved_df = pd.DataFrame(underserved_data)
-    else:
-        st.error(f"Failed to fetch underserved data. Status: {response.status_code}")
-        underserved_df = pd.DataFrame()
-except requests.exceptions.RequestException as e:
-    st.error(f"Error fetching underserved data: {e}")
-    underserved_df = pd.DataFrame()
+by_year_df = pd.DataFrame(results["by_year"].data or [])
+if results["by_year"].error:
+    st.error(f"Error fetching demographics by year: {results['by_year'].error}")
+
+by_major_df = pd.DataFrame(results["by_major"].data or [])
+if results["by_major"].error:
+    st.error(f"Error fetching demographics by major: {results['by_major'].error}")
+
+event_pref_df = pd.DataFrame(results["event_preferences"].data or [])
+if results["event_preferences"].error:
+    st.error(f"Error fetching event preferences: {results['event_preferences'].error}")
+
+underserved_df = pd.DataFrame(results["underserved"].data or [])
+if results["underserved"].error:
+    st.error(f"Error fetching underserved data: {results['underserved'].error}")
 
 st.subheader("Engagement by Year")
 col1, col2 = st.columns(2)
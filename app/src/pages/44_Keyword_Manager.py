@@ -6,6 +6,8 @@ from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
+from modules import api
+from modules.cache import invalidate
 
 SideBarLinks()
 
@@ -20,11 +22,11 @@ st.markdown("Manage and analyze keywords for content optimization")
 
 st.divider()
 
-API_URL = "http://web-api:4000/events"
+API_URL = "/events"
 
 df = pd.DataFrame()
 try:
-    response = requests.get(API_URL)
+    response = api.get(API_URL)
     response.raise_for_status()
     data = response.json()
     df = pd.DataFrame(data)
@@ -41,7 +43,7 @@ if not df.empty:
     
     keywords_df = pd.DataFrame()
     try:
-        response = requests.get(f"{API_URL}/{event_id}/keywords")
+        response = api.get(f"{API_URL}/{event_id}/keywords")
         response.raise_for_status()
         keywords_data = response.json()
         keywords_df = pd.DataFrame(keywords_data)
@@ -59,12 +61,12 @@ if not df.empty:
                 st.write(f"Searches: {row['search_count']}")
             with col3:
                 if st.button("🗑️ Remove", key=f"remove_{row['keywordID']}"):
-                    response = requests.delete(
+                    response = api.delete(
                         f"{API_URL}/{event_id}/keywords?keyword_id={row['keywordID']}"
                     )
                     if response.status_code == 200:
                         st.success("Keyword removed!")
-                        st.cache_data.clear()
+                        invalidate("event_search")
                         st.experimental_rerun()
                     else:
                         st.error("Failed to remove keyword")
@@ -74,13 +76,13 @@ if not df.empty:
         if new_keyword.strip() == "":
             st.error("Keyword cannot be empty")
         else:
-            response = requests.post(
+            response = api.post(
                 f"{API_URL}/{event_id}/keywords",
                 json={"keyword": new_keyword.strip()}
             )
             if response.status_code == 201:
                 st.success("Keyword added!")
-                st.cache_data.clear()
+                invalidate("event_search")
                 st.rerun()
             else:
                 st.error("Failed to add keyword")
@@ -6,6 +6,8 @@ from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
+from modules import api
+from modules.cache import cached
 
 SideBarLinks()
 
@@ -19,25 +21,35 @@ st.title("📊 Club Analytics")
 st.markdown("Analyze club event performance and member engagement")
 st.divider()
 
-API_URL = "http://web-api:4000/clubs/performance"
+API_URL = "/clubs/performance"
 
-try:
-    response = requests.get(API_URL)
+WINDOWS = {"Last 30 days": 30, "Last 90 days": 90, "Last 180 days": 180, "Last year": 365}
+
+# One cached table per window, shared by every session
+@cached("club_performance:{days}", ttl=300)
+def fetch_performance(days):
+    response = api.get(API_URL, params={"days": days}, timeout=10)
     response.raise_for_status()
-    data = response.json()
-    df = pd.DataFrame(data)
+    return response.json()
+
+window = st.selectbox("Time window", list(WINDOWS.keys()), index=1)
+
+try:
+    df = pd.DataFrame(fetch_performance(WINDOWS[window]))
 except requests.exceptions.RequestException as e:
     st.error(f"Error fetching data: {e}")
     logger.error(f"Error fetching data from API: {e}")
     df = pd.DataFrame()
 
 if not df.empty:
+    for column in ('avg_attendance_per_event', 'avg_capacity_utilization'):
+        df[column] = pd.to_numeric(df[column], errors='coerce')
     df = df.sort_values('avg_attendance_per_event', ascending=True)
     fig = px.bar(
         df,
         x='avg_attendance_per_event',
         y='club_name',
-        title='Club Performance Leaderboard',
+        title=f'Club Performance Leaderboard ({window.lower()})',
         labels={'club_name': 'Club Name', 'avg_attendance_per_event': 'Average Attendance per Event'},
         orientation='h'
     )
@@ -47,7 +59,6 @@ if not df.empty:
     st.subheader("All Clubs Performance Data")
     st.dataframe(df)
     st.divider()
-    df['avg_attendance_per_event'] = pd.to_numeric(df['avg_attendance_per_event'], errors='coerce')
     avg_attendance = df['avg_attendance_per_event'].mean()
     st.subheader("Clubs Performing Below Average Attendance")
     below_avg_df = df[df['avg_attendance_per_event'] < avg_attendance]
@@ -6,6 +6,7 @@ from modules.nav import SideBarLinks
 from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
+from modules import api
 
 SideBarLinks()
 st.set_page_config(
@@ -18,11 +19,11 @@ st.title("📅 Weekly Report")
 st.markdown("Analyze weekly event data and trends")
 st.divider()
 
-API_URL = "http://web-api:4000/analytics/reports"
+API_URL = "/analytics/reports"
 
 df = pd.DataFrame()
 try:
-    response = requests.get(API_URL)
+    response = api.get(API_URL)
     response.raise_for_status()
     data = response.json()
     df = pd.DataFrame(data)
@@ -34,7 +35,7 @@ except requests.exceptions.RequestException as e:
 st.subheader("Generate Weekly Report")
 if st.button("Generate Report"):
     try:
-        response = requests.post(f"{API_URL}")
+        response = api.post(f"{API_URL}")
         response.raise_for_status()
         st.success("Weekly report generated successfully!")
     except requests.exceptions.RequestException as e:
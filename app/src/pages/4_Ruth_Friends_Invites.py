@@ -1,5 +1,7 @@
 import streamlit as st
-import requests
+import time
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -7,9 +9,6 @@ st.set_page_config(
     page_icon="👥",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 STUDENT_ID = 10000001
 
 # Sidebar navigation
@@ -27,27 +26,33 @@ st.title("👥 Friends & Invitations")
 st.markdown("Invite others to events and manage your invitations")
 st.divider()
 
-# Fetch incoming invitations
-def fetch_invitations():
+EMPTY_BOX = {"invitations": [], "next_cursor": None, "counts": {}}
+
+# Fetch the invitation inbox, already split into sent and received with per-status counts
+def fetch_inbox(box=None, status=None, limit=20):
+    params = {"limit": limit}
+    if box:
+        params["box"] = box
+    if status:
+        params["status"] = status
     try:
-        response = requests.get(
-            #f"{API_BASE_URL}/students/students/{STUDENT_ID}/invitations",
-            #f"{API_BASE_URL}/students/{STUDENT_ID}/invitations/all",
-            f"{API_BASE_URL}/students/students/{STUDENT_ID}/invitations/all", 
+        response = api.get(
+            f"/students/students/{STUDENT_ID}/inbox",
+            params=params,
             timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
-            return []
+            return {}
     except Exception as e:
         st.error(f"Could not fetch invitations: {e}")
-        return []
+        return {}
 
 # Fetch my RSVPs
-@st.cache_data(ttl=30)
+@cached(f"my_rsvps:{STUDENT_ID}", ttl=30)
 def fetch_my_events():
     try:
-        response = requests.get(f"{API_BASE_URL}/students/students/{STUDENT_ID}/rsvps", timeout=5)
+        response = api.get(f"/students/students/{STUDENT_ID}/rsvps", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -56,25 +61,32 @@ def fetch_my_events():
         # we can skip showing an error here to avoid double messages on the page
         return []
 
-# Fetch all students (for suggested students dropdown)
-@st.cache_data(ttl=60)
-def fetch_all_students():
+# Search students for the invite picker; the API returns only the top matches.
+# Typed names go to the in-memory autocomplete index, an empty box lists A-Z.
+@cached("students:search", ttl=60)
+def search_students(query, limit=20):
     try:
-        response = requests.get(f"{API_BASE_URL}/students/students", timeout=5)
-        if response.status_code == 200:
-            students = response.json()
-            # Filter out current user
-            return [s for s in students if s.get('studentID') != STUDENT_ID]
+        if query:
+            response = api.get(
+                "/autocomplete",
+                params={"q": query, "kinds": "students", "exclude": STUDENT_ID, "limit": limit},
+                timeout=5)
+            if response.status_code == 200:
+                return response.json().get("students", [])
         else:
-            return []
+            params = {"mode": "typeahead", "exclude": STUDENT_ID, "limit": limit}
+            response = api.get("/students/students", params=params, timeout=5)
+            if response.status_code == 200:
+                return response.json()
+        return []
     except Exception as e:
         return []
 
 # Update invitation status
 def update_invitation(invitation_id, new_status):
     try:
-        response = requests.put(
-            f"{API_BASE_URL}/students/students/{STUDENT_ID}/invitations/{invitation_id}",
+        response = api.put(
+            f"/students/students/{STUDENT_ID}/invitations/{invitation_id}",
             json={"status": new_status},
             timeout=5
         )
@@ -86,8 +98,8 @@ def update_invitation(invitation_id, new_status):
 # Send invitation
 def send_invitation(event_id, recipient_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/invitations/invitations",
+        response = api.post(
+            "/invitations/invitations",
             json={
                 "event_id": event_id,
                 "sender_student_id": STUDENT_ID,
@@ -102,37 +114,78 @@ def send_invitation(event_id, recipient_id):
         st.error(f"Error sending invitation: {e}")
         return False
 
+# Fetch clubs (for inviting a whole club)
+@cached("clubs", ttl=300)
+def fetch_clubs():
+    try:
+        response = api.get("/clubs/clubs", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return []
+    except Exception as e:
+        return []
+
+# Send a group invitation; the API answers with a job that runs in the background
+def send_group_invitation(event_id, recipient_ids=None, club_id=None):
+    payload = {"event_id": event_id, "sender_student_id": STUDENT_ID}
+    if club_id is not None:
+        payload["club_id"] = club_id
+    else:
+        payload["recipient_student_ids"] = recipient_ids
+    try:
+        response = api.post("/invitations/invitations/group", json=payload, timeout=5)
+        if response.status_code != 202:
+            st.error(f"Send failed: status {response.status_code}, body: {response.text}")
+            return None
+        return response.json()
+    except Exception as e:
+        st.error(f"Error sending invitations: {e}")
+        return None
+
+# Wait briefly for a group invitation job to finish
+def wait_for_job(job_id, timeout=10):
+    deadline = time.time() + timeout
+    job = None
+    while time.time() < deadline:
+        try:
+            response = api.get(f"/invitations/invitations/jobs/{job_id}", timeout=5)
+            if response.status_code != 200:
+                return None
+            job = response.json()
+        except Exception:
+            return job
+        if job.get("status") in ("done", "failed"):
+            return job
+        time.sleep(0.5)
+    return job
+
 # Get data
-invitations = fetch_invitations()
+inbox = fetch_inbox()
+sent_box = inbox.get("sent", EMPTY_BOX)
+received_box = inbox.get("received", EMPTY_BOX)
 my_events = fetch_my_events()
-all_students = fetch_all_students()
 
 # Section 1: Invitation Status
 st.markdown("### 📊 Invitation Status")
 
-# Split sent vs received
-sent_invitations = [inv for inv in invitations if inv.get('sender_student_id') == STUDENT_ID]
-received_invitations = [inv for inv in invitations if inv.get('recipient_student_id') == STUDENT_ID]
-
-sent_pending   = [inv for inv in sent_invitations if inv.get('invitation_status') == 'pending']
-sent_accepted  = [inv for inv in sent_invitations if inv.get('invitation_status') == 'accepted']
-sent_declined  = [inv for inv in sent_invitations if inv.get('invitation_status') == 'declined']
+sent_counts = sent_box.get("counts") or {}
 
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Sent", len(sent_invitations))
+    st.metric("Sent", sent_counts.get("total", 0))
 with col2:
-    st.metric("Pending", len(sent_pending))
+    st.metric("Pending", sent_counts.get("pending", 0))
 with col3:
-    st.metric("Accepted", len(sent_accepted))
+    st.metric("Accepted", sent_counts.get("accepted", 0))
 with col4:
-    st.metric("Declined", len(sent_declined))
+    st.metric("Declined", sent_counts.get("declined", 0))
 
 # Optional: only show incoming list if there is actually something to act on
-pending_incoming = [
-    inv for inv in received_invitations
-    if inv.get('invitation_status') == 'pending'
-]
+pending_incoming = []
+if (received_box.get("counts") or {}).get("pending"):
+    pending_incoming = fetch_inbox(box="received", status="pending", limit=50) \
+        .get("received", EMPTY_BOX)["invitations"]
 
 if pending_incoming:
     st.markdown("### 📬 Incoming Invitations")
@@ -157,7 +210,7 @@ if pending_incoming:
                              use_container_width=True):
                     if update_invitation(invitation.get('invitation_id'), 'accepted'):
                         st.success("Accepted!")
-                        st.cache_data.clear()
+                        invalidate(f"my_rsvps:{STUDENT_ID}", "events")
                         st.rerun()
 
                 if st.button("❌ Decline",
@@ -165,7 +218,6 @@ if pending_incoming:
                              use_container_width=True):
                     if update_invitation(invitation.get('invitation_id'), 'declined'):
                         st.warning("Declined")
-                        st.cache_data.clear()
                         st.rerun()
 
 st.divider()
@@ -190,16 +242,17 @@ else:
         selected_event_id = event_options[selected_event_name]
         
         # Select student to invite
-        if not all_students:
-            st.warning("No other students found in the database.")
+        student_query = st.text_input("Search students by name:")
+        matches = search_students(student_query.strip())
+        student_options = {f"{s.get('name', '')} (#{s.get('id')})": s.get('id') for s in matches}
+
+        if not matches:
+            st.warning("No other students match your search.")
         else:
-            student_options = {f"{s.get('firstName', '')} {s.get('lastName', '')} ({s.get('email', '')})": s.get('studentID') 
-                              for s in all_students}
-            
             selected_student_name = st.selectbox(
                 "Select a student to invite:",
                 options=list(student_options.keys()),
-                help="These are suggested students based on campus activity")
+                help="Top matches for your search")
             
             if selected_student_name:
                 selected_student_id = student_options[selected_student_name]
@@ -211,7 +264,6 @@ else:
                         if send_invitation(selected_event_id, selected_student_id):
                             st.success(f"Invitation sent to {selected_student_name.split('(')[0].strip()}!")
                             st.balloons()
-                            st.cache_data.clear()
                         else:
                             st.error("Failed to send invitation. Please try again.")
                 
@@ -219,18 +271,51 @@ else:
                     if st.button("Cancel", use_container_width=True):
                         st.rerun()
 
+        # Invite many people at once: picked students or a whole club
+        with st.expander("👥 Invite a group"):
+            group_mode = st.radio("Invite", ["Selected students", "All members of a club"], horizontal=True)
+
+            recipient_ids = None
+            club_id = None
+            if group_mode == "Selected students":
+                picked = st.multiselect("Students", list(student_options.keys()))
+                recipient_ids = [student_options[name] for name in picked]
+            else:
+                clubs = fetch_clubs()
+                club_options = {c.get('club_name'): c.get('club_id') for c in clubs}
+                club_name = st.selectbox("Club", list(club_options.keys()))
+                club_id = club_options.get(club_name)
+
+            ready = bool(recipient_ids) or club_id is not None
+            if st.button("📨 Send Group Invitation", disabled=not ready, use_container_width=True):
+                job = send_group_invitation(selected_event_id, recipient_ids=recipient_ids, club_id=club_id)
+                if job:
+                    with st.spinner("Sending invitations..."):
+                        job = wait_for_job(job["job_id"]) or job
+                    if job.get("status") == "done":
+                        st.success(f"Invited {job.get('invited', 0)} student(s); "
+                                   f"{job.get('skipped', 0)} already invited or attending")
+                    elif job.get("status") == "failed":
+                        st.error(f"Group invitation failed: {job.get('error')}")
+                    else:
+                        st.info("Invitations are still being sent in the background")
+
 st.divider()
 
 # Section 3: Invitation History
 st.markdown("### 🗣️ Invitation History")
 
-accepted_invitations = [inv for inv in invitations if inv.get('invitation_status') == 'accepted']
-declined_invitations = [inv for inv in invitations if inv.get('invitation_status') == 'declined']
+recent_invitations = sent_box["invitations"] + received_box["invitations"]
+accepted_invitations = [inv for inv in recent_invitations if inv.get('invitation_status') == 'accepted']
+declined_invitations = [inv for inv in recent_invitations if inv.get('invitation_status') == 'declined']
+received_counts = received_box.get("counts") or {}
+accepted_total = sent_counts.get("accepted", 0) + received_counts.get("accepted", 0)
+declined_total = sent_counts.get("declined", 0) + received_counts.get("declined", 0)
 
 col_a, col_b = st.columns(2)
 
 with col_a:
-    st.markdown(f"**Accepted ({len(accepted_invitations)})**")
+    st.markdown(f"**Accepted ({accepted_total})**")
     if accepted_invitations:
         for inv in accepted_invitations[:5]:  # Show max 5
             st.markdown(f"✅ {inv.get('event_name', 'Event')}")
@@ -238,7 +323,7 @@ with col_a:
         st.caption("No accepted invitations")
 
 with col_b:
-    st.markdown(f"**Declined ({len(declined_invitations)})**")
+    st.markdown(f"**Declined ({declined_total})**")
     if declined_invitations:
         for inv in declined_invitations[:5]:  # Show max 5
             st.markdown(f"❌ {inv.get('event_name', 'Event')}")
@@ -1,7 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 import altair as alt
+from modules import api
+from modules.cache import cached
 
 # Page config
 st.set_page_config(
@@ -9,9 +10,6 @@ st.set_page_config(
     page_icon="🏆",
     layout="wide")
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎒 Ruth's Pages")
 st.sidebar.page_link("pages/1_Ruth_Event_Discovery.py", label="Event Discovery")
@@ -34,7 +32,7 @@ with col1:
     st.markdown("### 📊 Rank By:")
     rank_by = st.radio(
         "Select ranking metric:",
-        options=["Budget", "Members", "Events", "Competitiveness"],
+        options=["Budget", "Members", "Events", "Upcoming Events", "Attendance (30 days)", "Competitiveness"],
         horizontal=True,
         label_visibility="collapsed"
     )
@@ -55,21 +53,30 @@ def wrap_label(text, width=12):
     text = text.strip()
     return "\n".join(text[i:i+width] for i in range(0, len(text), width))
 
-# Fetch clubs data
-@st.cache_data(ttl=60)
-def fetch_clubs_for_ranking():
+# Map ranking type to the API's metric name
+ranking_map = {
+    "Budget": "budget",
+    "Members": "member_count",
+    "Events": "event_count",
+    "Upcoming Events": "upcoming_events",
+    "Attendance (30 days)": "attendance_30d",
+    "Competitiveness": "competitiveness_level"}
+
+# Fetch the top clubs for one metric, already ranked by the API
+@cached("club_rankings:{metric}", ttl=60)
+def fetch_ranked_clubs(metric, limit=50):
     try:
-        # ✅ use the new API that already includes member_count & event_count
-        clubs_response = requests.get(
-            f"{API_BASE_URL}/clubs/clubs/with-metrics",
+        response = api.get(
+            "/clubs/clubs/ranked",
+            params={"metric": metric, "limit": limit},
             timeout=5
         )
-        if clubs_response.status_code != 200:
+        if response.status_code != 200:
             return []
 
-        clubs = clubs_response.json()
+        clubs = response.json().get("clubs", [])
 
-        # (optional but nice) make sure numeric fields are numeric
+        # DECIMAL budgets arrive as strings
         for club in clubs:
             if "budget" in club and isinstance(club["budget"], str):
                 try:
@@ -83,33 +90,22 @@ def fetch_clubs_for_ranking():
         st.error(f"Could not fetch clubs: {e}")
         return []
 
+sort_column = ranking_map[rank_by]
+
 # Get clubs data
-clubs_data = fetch_clubs_for_ranking()
+clubs_data = fetch_ranked_clubs(sort_column)
 
 if not clubs_data:
     st.warning("No clubs available. Check your database connection.")
 else:
-    # Create DataFrame for easier manipulation
-    df = pd.DataFrame(clubs_data)
-    
-    # Map ranking type to column
-    ranking_map = {
-        "Budget": "budget",
-        "Members": "member_count",
-        "Events": "event_count",
-        "Competitiveness": "competitiveness_level"}
-    
-    sort_column = ranking_map[rank_by]
-    
+    # Rows arrive sorted by the selected metric with their rank
+    df_sorted = pd.DataFrame(clubs_data)
+
     # Check if column exists, if not, show warning
-    if sort_column not in df.columns:
+    if sort_column not in df_sorted.columns:
         st.error(f"⚠️ {rank_by} data not available yet. Database schema may need updating.")
-        st.info(f"Expected column '{sort_column}' in clubs data. Available columns: {list(df.columns)}")
+        st.info(f"Expected column '{sort_column}' in clubs data. Available columns: {list(df_sorted.columns)}")
     else:
-        # Sort by selected metric (descending)
-        df_sorted = df.sort_values(by=sort_column, ascending=False).reset_index(drop=True)
-        df_sorted['rank'] = range(1, len(df_sorted) + 1)
-
         # 🥇🥈🥉 add medal indicator for top 3
         df_sorted['medal'] = df_sorted['rank'].map({1: "🥇", 2: "🥈", 3: "🥉"}).fillna("")
 
@@ -153,7 +149,8 @@ else:
         st.markdown("### 📋 Detailed Rankings")
         
         # Select columns to display
-        display_columns = ['rank', 'club_name', 'budget', 'member_count', 'event_count']
+        display_columns = ['rank', 'club_name', 'budget', 'member_count', 'event_count',
+                           'upcoming_events', 'attendance_30d']
         
         # Add competitiveness if it exists
         if 'competitiveness_level' in df_sorted.columns:
@@ -169,6 +166,8 @@ else:
             'budget': 'Budget ($)',
             'member_count': 'Members',
             'event_count': 'Events',
+            'upcoming_events': 'Upcoming',
+            'attendance_30d': 'Attendance (30d)',
             'competitiveness_level': 'Competitiveness (1-10)'}
         
         display_df = df_sorted[available_columns].rename(columns=column_names)
@@ -183,6 +182,8 @@ else:
                 "Budget ($)": st.column_config.NumberColumn(format="$%.2f"),
                 "Members": st.column_config.NumberColumn(format="%d"),
                 "Events": st.column_config.NumberColumn(format="%d"),
+                "Upcoming": st.column_config.NumberColumn(format="%d"),
+                "Attendance (30d)": st.column_config.NumberColumn(format="%d"),
                 "Competitiveness (1-10)": st.column_config.NumberColumn(format="%d")})
         
         # Show top 3 highlights
@@ -229,6 +230,31 @@ else:
                     else:
                         st.markdown(f"{rank_by}: **{int(value)}**")
 
+# Quarterly composite rankings computed by the API
+@cached("club_rankings:quarterly", ttl=300)
+def fetch_quarter_rankings(period):
+    try:
+        response = api.get("/clubs/rankings", params={"period": period}, timeout=5)
+        if response.status_code == 200:
+            return [r for r in response.json() if r.get("ranking_score") is not None]
+        return []
+    except Exception as e:
+        return []
+
+st.divider()
+st.markdown("### 📈 Quarterly Composite Ranking")
+st.caption("Attendance, membership growth, RSVP conversion, capacity utilization and collaborations")
+today = pd.Timestamp.today()
+recent_periods = [f"{p.year}-Q{p.quarter}" for p in pd.period_range(end=today, periods=4, freq="Q")][::-1]
+period = st.selectbox("Quarter", recent_periods)
+quarter_rankings = fetch_quarter_rankings(period)
+if quarter_rankings:
+    quarter_df = pd.DataFrame(quarter_rankings)[['rank_position', 'club_name', 'ranking_score']]
+    quarter_df.columns = ['Rank', 'Club Name', 'Score (0-100)']
+    st.dataframe(quarter_df, use_container_width=True, hide_index=True)
+else:
+    st.info(f"No rankings computed for {period} yet")
+
 # Footer
 st.divider()
 st.markdown("*Rankings update every quarter based on club activity and metrics*")
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
-import requests
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -11,9 +12,6 @@ st.set_page_config(
 CLUB_ID = 101  # Latin American Student Union
 USER_ID = 98765  # Sofia's user ID
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎭 Sofia's Pages")
 st.sidebar.markdown("**Current:** My Events")
@@ -33,11 +31,11 @@ st.divider()
 tab1, tab2 = st.tabs(["📆 Upcoming Events", "📜 Past Events"])
 
 # Fetch events from API
-@st.cache_data(ttl=60)
+@cached("club_events:{club_id}", ttl=60)
 def fetch_club_events(club_id):
     try:
         # Get all events and filter by clubID
-        response = requests.get(f"{API_BASE_URL}/events", timeout=5)
+        response = api.get("/events", timeout=5)
         if response.status_code == 200:
             all_events = response.json()
             # Filter for this club's events
@@ -52,7 +50,7 @@ def fetch_club_events(club_id):
 # Delete event function
 def delete_event(event_id):
     try:
-        response = requests.delete(f"{API_BASE_URL}/events/{event_id}", timeout=5)
+        response = api.delete(f"/events/{event_id}", timeout=5)
         return response.status_code == 200
     except:
         return False
@@ -146,7 +144,7 @@ with tab1:
                     if st.button("🗑️ Delete", key=f"delete_{event.get('eventID')}", use_container_width=True):
                         if delete_event(event.get('eventID')):
                             st.success("Event deleted!")
-                            st.cache_data.clear()
+                            invalidate("events", f"club_events:{CLUB_ID}")
                             st.rerun()
                         else:
                             st.error("Failed to delete event")
@@ -1,6 +1,7 @@
 import streamlit as st
-import requests
 from datetime import datetime, date, time
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -11,9 +12,6 @@ st.set_page_config(
 CLUB_ID = 101  # Latin American Student Union
 USER_ID = 98765  # Sofia's user ID
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎭 Sofia's Pages")
 st.sidebar.markdown("**Current:** Create Event")
@@ -30,11 +28,11 @@ st.markdown("Publish your event to the centralized platform")
 st.divider()
 
 # Fetch conflicting events
-@st.cache_data(ttl=60)
+@cached("events:conflicts", ttl=60)
 def fetch_conflicting_events(start_dt, end_dt, club_id):
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/events/conflicts",
+        response = api.get(
+            "/events/conflicts",
             params={
                 "start_datetime": start_dt,
                 "end_datetime": end_dt,
@@ -166,8 +164,8 @@ if submit_draft or submit_publish:
         
         # Submit to API
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/events",
+            response = api.post(
+                "/events",
                 json=event_data,
                 timeout=5
             )
@@ -179,7 +177,7 @@ if submit_draft or submit_publish:
                 else:
                     st.success("💾 Event saved as draft!")
                 
-                st.cache_data.clear()
+                invalidate("events", f"club_events:{CLUB_ID}")
                 
                 if st.button("← Back to My Events"):
                     st.switch_page("pages/6_Sofia_My_Events.py")
@@ -1,7 +1,9 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime
+from modules.push import topic_version, live_updates
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -12,9 +14,6 @@ st.set_page_config(
 CLUB_ID = 101  # Latin American Student Union
 USER_ID = 98765  # Sofia's user ID
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎭 Sofia's Pages")
 st.sidebar.markdown("**Current:** RSVPs")
@@ -30,11 +29,11 @@ st.title("✅ RSVP Management")
 st.markdown("View and manage RSVPs with real-time headcount updates")
 st.divider()
 
-# Fetch events with RSVP data
-@st.cache_data(ttl=30)  # Shorter cache for real-time updates
-def fetch_events_with_rsvps(club_id):
+# Fetch events with RSVP data; `version` changes whenever an RSVP is created or cancelled
+@cached("club_events:{club_id}:rsvps", ttl=30)  # Shorter cache for real-time updates
+def fetch_events_with_rsvps(club_id, version=None):
     try:
-        response = requests.get(f"{API_BASE_URL}/clubs/{club_id}/events/rsvps", timeout=5)
+        response = api.get(f"/clubs/clubs/{club_id}/events/rsvps", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -43,11 +42,11 @@ def fetch_events_with_rsvps(club_id):
         st.error(f"Could not connect to API: {e}")
         return []
 
-# Fetch detailed RSVPs for an event
-@st.cache_data(ttl=30)
-def fetch_event_rsvps(event_id):
+# Fetch detailed RSVPs for an event; `version` covers its RSVPs and check-ins
+@cached("event_rsvps:{event_id}", ttl=30)
+def fetch_event_rsvps(event_id, version=None):
     try:
-        response = requests.get(f"{API_BASE_URL}/events/{event_id}/rsvps", timeout=5)
+        response = api.get(f"/events/{event_id}/rsvps", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -58,8 +57,8 @@ def fetch_event_rsvps(event_id):
 # Check in student
 def check_in_student(event_id, student_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/events/{event_id}/attendance",
+        response = api.post(
+            f"/events/{event_id}/attendance",
             json={
                 "student_id": student_id,
                 "checked_in_by_user_id": USER_ID
@@ -71,7 +70,7 @@ def check_in_student(event_id, student_id):
         return False
 
 # Get events
-events_data = fetch_events_with_rsvps(CLUB_ID)
+events_data = fetch_events_with_rsvps(CLUB_ID, topic_version("rsvps"))
 
 if not events_data:
     st.info("No events found or no RSVPs yet")
@@ -101,6 +100,9 @@ else:
         
         selected_event_name = st.selectbox("📅 Select Event", list(event_options.keys()))
         selected_event_id = event_options[selected_event_name]
+
+        # Rerun when RSVPs or check-ins change instead of polling
+        live_updates("rsvps", f"event:{selected_event_id}:attendance")
         
         # Get selected event data
         selected_event = next((e for e in upcoming_events if e.get('event_id') == selected_event_id), None)
@@ -149,7 +151,11 @@ else:
             # Detailed RSVP list
             st.markdown("### 📋 RSVP List")
             
-            rsvps = fetch_event_rsvps(selected_event_id)
+            rsvps = fetch_event_rsvps(
+                selected_event_id,
+                (topic_version(f"event:{selected_event_id}:rsvps"),
+                 topic_version(f"event:{selected_event_id}:attendance"))
+            )
             
             if not rsvps:
                 st.info("No RSVPs for this event yet")
@@ -193,7 +199,7 @@ else:
                                         if st.button("Check In", key=f"checkin_{student_id}", use_container_width=True):
                                             if check_in_student(selected_event_id, student_id):
                                                 st.success("Checked in!")
-                                                st.cache_data.clear()
+                                                invalidate(f"event_rsvps:{selected_event_id}", f"club_events:{CLUB_ID}")
                                                 st.rerun()
                                             else:
                                                 st.error("Check-in failed")
@@ -226,7 +232,7 @@ else:
             
             with col_action1:
                 if st.button("🔄 Refresh Data", use_container_width=True):
-                    st.cache_data.clear()
+                    invalidate(f"event_rsvps:{selected_event_id}", f"club_events:{CLUB_ID}")
                     st.rerun()
             
             with col_action2:
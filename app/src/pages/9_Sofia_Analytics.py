@@ -1,9 +1,10 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from modules import api
+from modules.cache import cached, invalidate
 
 # Page config
 st.set_page_config(
@@ -13,9 +14,6 @@ st.set_page_config(
 
 CLUB_ID = 101  # Latin American Student Union
 
-# API Base URL
-API_BASE_URL = "http://web-api:4000"
-
 # Sidebar navigation
 st.sidebar.title("🎭 Sofia's Pages")
 st.sidebar.markdown("**Current:** Analytics")
@@ -32,10 +30,10 @@ st.markdown("Understand which event types, times, and formats are most successfu
 st.divider()
 
 # Fetch analytics data
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@cached("club_events:{club_id}:analytics", ttl=300)  # Cache for 5 minutes
 def fetch_event_analytics(club_id):
     try:
-        response = requests.get(f"{API_BASE_URL}/clubs/{club_id}/analytics", timeout=5)
+        response = api.get(f"/clubs/clubs/{club_id}/analytics", timeout=5)
         if response.status_code == 200:
             return response.json()
         else:
@@ -51,6 +49,9 @@ if not analytics_data:
     st.info("No past events to analyze yet. Host some events to see analytics!")
 else:
     df = pd.DataFrame(analytics_data)
+    # Rates arrive as decimal strings; events without RSVPs have no rate
+    for column in ('total_rsvps', 'actual_attendance', 'attendance_rate', 'capacity_utilization'):
+        df[column] = pd.to_numeric(df[column]).fillna(0)
     
     # Overall metrics
     st.markdown("### 📊 Overall Performance")
@@ -250,7 +251,7 @@ col_action1, col_action2, col_action3 = st.columns([1, 1, 2])
 
 with col_action1:
     if st.button("🔄 Refresh Analytics", use_container_width=True):
-        st.cache_data.clear()
+        invalidate(f"club_events:{CLUB_ID}:analytics")
         st.rerun()
 
 with col_action2:
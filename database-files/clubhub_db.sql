@@ -3,13 +3,16 @@ CREATE DATABASE ClubHub;
 USE ClubHub;
 
 -- Students Table
+-- The name indexes keep the ordered, prefix-searched GET /students a range scan.
 CREATE TABLE Students (
    studentID INT PRIMARY KEY,
    email VARCHAR(100) UNIQUE NOT NULL,
    firstName VARCHAR(50) NOT NULL,
    lastName VARCHAR(50) NOT NULL,
    year INT,
-   major VARCHAR(100)
+   major VARCHAR(100),
+   KEY idx_students_last_name (lastName, firstName),
+   KEY idx_students_first_name (firstName, lastName)
 );
 
 -- Majors Table
@@ -60,7 +63,10 @@ CREATE TABLE Events (
    mapCoordinates VARCHAR(100),
    eventType VARCHAR(50),
    lastUpdated DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-   FOREIGN KEY (clubID) REFERENCES Clubs(clubID)
+   FOREIGN KEY (clubID) REFERENCES Clubs(clubID),
+   KEY idx_events_room_time (buildingName, roomNumber, startDateTime),
+   KEY idx_events_club_start (clubID, startDateTime),
+   KEY idx_events_last_updated (lastUpdated)
 );
 
 -- Club Memberships Table
@@ -98,15 +104,41 @@ CREATE TABLE Keywords (
 );
 
 -- EventLog Table
+-- Partitioned by month on logTimestamp (see backend/admin/partitions.py).
+-- MySQL does not allow foreign keys on partitioned tables, so serverID is
+-- only indexed here, and the timestamp has to be part of the primary key.
 CREATE TABLE EventLog (
-   logID INT PRIMARY KEY,
+   logID INT NOT NULL AUTO_INCREMENT,
    logTimestamp DATETIME NOT NULL,
    status VARCHAR(50),
    severity VARCHAR(50),
    serverID INT,
-   FOREIGN KEY (serverID) REFERENCES Servers(serverID)
+   PRIMARY KEY (logID, logTimestamp),
+   KEY idx_eventlog_timestamp (logTimestamp),
+   KEY idx_eventlog_server (serverID, logTimestamp),
+   KEY idx_eventlog_filters (severity, status, serverID, logTimestamp)
+)
+PARTITION BY RANGE COLUMNS (logTimestamp) (
+   PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+   PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
+-- EventLog full-text side table
+-- Partitioned tables cannot carry FULLTEXT indexes, so the log message is
+-- copied here by the trigger below and searched with MATCH ... AGAINST.
+CREATE TABLE EventLog_Search (
+   logID INT NOT NULL,
+   logTimestamp DATETIME NOT NULL,
+   message VARCHAR(255),
+   PRIMARY KEY (logID, logTimestamp),
+   FULLTEXT KEY ft_eventlog_message (message)
+);
+
+CREATE TRIGGER eventlog_search_insert AFTER INSERT ON EventLog
+FOR EACH ROW
+   INSERT INTO EventLog_Search (logID, logTimestamp, message)
+   VALUES (NEW.logID, NEW.logTimestamp, NEW.status);
+
 -- Administrators Table
 CREATE TABLE Administrators (
    adminID INT PRIMARY KEY,
@@ -162,6 +194,154 @@ CREATE TABLE Events_Event_Keywords (
    FOREIGN KEY (keywordID) REFERENCES Keywords(keywordID) ON DELETE CASCADE
 );
 
+-- Event full-text side table
+-- FULLTEXT indexes cannot span a join, so each event's searchable text
+-- (its own columns, its club's name and its keywords) is copied into one
+-- row here by the triggers below and searched with MATCH ... AGAINST.
+CREATE TABLE Event_Search (
+   eventID INT PRIMARY KEY,
+   name VARCHAR(100) NOT NULL,
+   body TEXT,
+   clubName VARCHAR(100),
+   keywords TEXT,
+   FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE,
+   FULLTEXT KEY ft_event_search_all (name, body, clubName, keywords),
+   FULLTEXT KEY ft_event_search_name (name),
+   FULLTEXT KEY ft_event_search_keywords (keywords)
+);
+
+CREATE TRIGGER event_search_insert AFTER INSERT ON Events
+FOR EACH ROW
+   INSERT INTO Event_Search (eventID, name, body, clubName)
+   VALUES (NEW.eventID, NEW.name, CONCAT_WS(' ', NEW.description, NEW.searchDescription),
+           (SELECT name FROM Clubs WHERE clubID = NEW.clubID));
+
+CREATE TRIGGER event_search_update AFTER UPDATE ON Events
+FOR EACH ROW
+   UPDATE Event_Search
+   SET name = NEW.name,
+       body = CONCAT_WS(' ', NEW.description, NEW.searchDescription),
+       clubName = (SELECT name FROM Clubs WHERE clubID = NEW.clubID)
+   WHERE eventID = NEW.eventID;
+
+CREATE TRIGGER event_search_club_update AFTER UPDATE ON Clubs
+FOR EACH ROW
+   UPDATE Event_Search es
+   JOIN Events e ON e.eventID = es.eventID
+   SET es.clubName = NEW.name
+   WHERE e.clubID = NEW.clubID;
+
+CREATE TRIGGER event_search_keyword_insert AFTER INSERT ON Events_Event_Keywords
+FOR EACH ROW
+   UPDATE Event_Search
+   SET keywords = (SELECT GROUP_CONCAT(k.keyword SEPARATOR ' ')
+                   FROM Events_Event_Keywords eek
+                   JOIN Keywords k ON k.keywordID = eek.keywordID
+                   WHERE eek.eventID = NEW.eventID)
+   WHERE eventID = NEW.eventID;
+
+CREATE TRIGGER event_search_keyword_delete AFTER DELETE ON Events_Event_Keywords
+FOR EACH ROW
+   UPDATE Event_Search
+   SET keywords = (SELECT GROUP_CONCAT(k.keyword SEPARATOR ' ')
+                   FROM Events_Event_Keywords eek
+                   JOIN Keywords k ON k.keywordID = eek.keywordID
+                   WHERE eek.eventID = OLD.eventID)
+   WHERE eventID = OLD.eventID;
+
+-- Club metrics materialization
+-- One row per club with the figures the club listings, rankings and the
+-- comparison page read. Counts are kept exact by the triggers below; the
+-- time-based columns (upcoming events, 30/90-day attendance) drift as time
+-- passes and, with the comparison facts (events per month, average
+-- attendance, RSVP conversion, top keywords), are recomputed by the
+-- club-metrics-refresh job. Every rankable column has a (column, clubID)
+-- index so a top-N page is read in index order.
+CREATE TABLE Club_Metrics (
+   clubID INT PRIMARY KEY,
+   memberCount INT NOT NULL DEFAULT 0,
+   eventCount INT NOT NULL DEFAULT 0,
+   upcomingEvents INT NOT NULL DEFAULT 0,
+   attendance30d INT NOT NULL DEFAULT 0,
+   attendance90d INT NOT NULL DEFAULT 0,
+   budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+   competitivenessLevel INT NOT NULL DEFAULT 0,
+   eventsPerMonth DECIMAL(8,2) NOT NULL DEFAULT 0,
+   avgAttendance DECIMAL(8,2) NOT NULL DEFAULT 0,
+   rsvpConversion DECIMAL(5,4) NOT NULL DEFAULT 0,
+   -- Up to TOP_KEYWORDS (5) Keywords.keyword values of 100 chars, ", "-separated
+   topKeywords VARCHAR(520),
+   refreshedAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+   FOREIGN KEY (clubID) REFERENCES Clubs(clubID) ON DELETE CASCADE,
+   KEY idx_club_metrics_members (memberCount, clubID),
+   KEY idx_club_metrics_events (eventCount, clubID),
+   KEY idx_club_metrics_upcoming (upcomingEvents, clubID),
+   KEY idx_club_metrics_attendance30 (attendance30d, clubID),
+   KEY idx_club_metrics_attendance90 (attendance90d, clubID),
+   KEY idx_club_metrics_budget (budget, clubID),
+   KEY idx_club_metrics_competitiveness (competitivenessLevel, clubID)
+);
+
+CREATE TRIGGER club_metrics_club_insert AFTER INSERT ON Clubs
+FOR EACH ROW
+   INSERT INTO Club_Metrics (clubID, budget, competitivenessLevel)
+   VALUES (NEW.clubID, COALESCE(NEW.budget, 0), COALESCE(NEW.competitiveness_level, 0));
+
+CREATE TRIGGER club_metrics_club_update AFTER UPDATE ON Clubs
+FOR EACH ROW
+   UPDATE Club_Metrics
+   SET budget = COALESCE(NEW.budget, 0),
+       competitivenessLevel = COALESCE(NEW.competitiveness_level, 0)
+   WHERE clubID = NEW.clubID;
+
+CREATE TRIGGER club_metrics_member_insert AFTER INSERT ON club_memberships
+FOR EACH ROW
+   UPDATE Club_Metrics SET memberCount = memberCount + 1 WHERE clubID = NEW.club_id;
+
+CREATE TRIGGER club_metrics_member_delete AFTER DELETE ON club_memberships
+FOR EACH ROW
+   UPDATE Club_Metrics SET memberCount = memberCount - 1 WHERE clubID = OLD.club_id;
+
+CREATE TRIGGER club_metrics_event_insert AFTER INSERT ON Events
+FOR EACH ROW
+   UPDATE Club_Metrics
+   SET eventCount = eventCount + 1,
+       upcomingEvents = upcomingEvents + (NEW.startDateTime >= NOW())
+   WHERE clubID = NEW.clubID;
+
+-- A moved event leaves one club and joins another in the same statement
+CREATE TRIGGER club_metrics_event_update AFTER UPDATE ON Events
+FOR EACH ROW
+   UPDATE Club_Metrics
+   SET eventCount = eventCount + (clubID <=> NEW.clubID) - (clubID <=> OLD.clubID),
+       upcomingEvents = upcomingEvents
+           + (clubID <=> NEW.clubID AND NEW.startDateTime >= NOW())
+           - (clubID <=> OLD.clubID AND OLD.startDateTime >= NOW())
+   WHERE clubID IN (OLD.clubID, NEW.clubID);
+
+CREATE TRIGGER club_metrics_event_delete AFTER DELETE ON Events
+FOR EACH ROW
+   UPDATE Club_Metrics
+   SET eventCount = eventCount - 1,
+       upcomingEvents = upcomingEvents - (OLD.startDateTime >= NOW())
+   WHERE clubID = OLD.clubID;
+
+CREATE TRIGGER club_metrics_attendance_insert AFTER INSERT ON Students_Event_Attendees
+FOR EACH ROW
+   UPDATE Club_Metrics cm
+   JOIN Events e ON e.clubID = cm.clubID
+   SET cm.attendance30d = cm.attendance30d + COALESCE(NEW.timestamp >= NOW() - INTERVAL 30 DAY, 0),
+       cm.attendance90d = cm.attendance90d + COALESCE(NEW.timestamp >= NOW() - INTERVAL 90 DAY, 0)
+   WHERE e.eventID = NEW.eventID;
+
+CREATE TRIGGER club_metrics_attendance_delete AFTER DELETE ON Students_Event_Attendees
+FOR EACH ROW
+   UPDATE Club_Metrics cm
+   JOIN Events e ON e.clubID = cm.clubID
+   SET cm.attendance30d = cm.attendance30d - COALESCE(OLD.timestamp >= NOW() - INTERVAL 30 DAY, 0),
+       cm.attendance90d = cm.attendance90d - COALESCE(OLD.timestamp >= NOW() - INTERVAL 90 DAY, 0)
+   WHERE e.eventID = OLD.eventID;
+
 -- Schedule Changes
 CREATE TABLE Schedule_Changes (
    changeID INT PRIMARY KEY AUTO_INCREMENT,
@@ -174,6 +354,9 @@ CREATE TABLE Schedule_Changes (
 );
 
 -- Rankings
+-- Computed rankings hold one row per club, type ('Composite' and each of
+-- its components), year and quarter, written by the rankings-compute job
+-- with a bulk upsert on uq_rankings_club_period.
 CREATE TABLE Rankings (
    rankID INT PRIMARY KEY AUTO_INCREMENT,
    clubID INT NOT NULL,
@@ -181,7 +364,11 @@ CREATE TABLE Rankings (
    rankingType VARCHAR(50),
    rankingYear INT,
    rankingQuarter INT,
-   FOREIGN KEY (clubID) REFERENCES Clubs(clubID) ON DELETE CASCADE
+   rankPosition INT,
+   computedAt DATETIME,
+   FOREIGN KEY (clubID) REFERENCES Clubs(clubID) ON DELETE CASCADE,
+   UNIQUE KEY uq_rankings_club_period (clubID, rankingType, rankingYear, rankingQuarter),
+   KEY idx_rankings_period (rankingYear, rankingQuarter, rankingType, rankPosition)
 );
 
 -- Collaborations
@@ -202,8 +389,17 @@ CREATE TABLE Alerts (
    alertType VARCHAR(50),
    isSolved BOOLEAN DEFAULT FALSE,
    description TEXT,
+   -- System_Alerts row this alert mirrors (alert engine rules only)
+   systemAlertID INT,
    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE,
-   FOREIGN KEY (studentID) REFERENCES Students(studentID) ON DELETE CASCADE
+   FOREIGN KEY (studentID) REFERENCES Students(studentID) ON DELETE CASCADE,
+   KEY idx_alerts_system_alert (systemAlertID),
+   -- isSolved leads every index so the unresolved alerts sit in one
+   -- contiguous range (MySQL has no partial indexes)
+   KEY idx_alerts_open (isSolved, alertID),
+   KEY idx_alerts_open_type (isSolved, alertType, alertID),
+   KEY idx_alerts_open_event (isSolved, eventID, alertID),
+   KEY idx_alerts_open_student (isSolved, studentID, alertID)
 );
 
 -- Major (multivalued attribute)
@@ -231,22 +427,31 @@ CREATE TABLE RSVPs (
    eventID INT NOT NULL,
    status ENUM('confirmed', 'waitlisted', 'cancelled') DEFAULT 'confirmed',
    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+   lastUpdated DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
    FOREIGN KEY (studentID) REFERENCES Students(studentID) ON DELETE CASCADE,
    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE,
-   UNIQUE KEY unique_rsvp (studentID, eventID)
+   UNIQUE KEY unique_rsvp (studentID, eventID),
+   KEY idx_rsvps_event_status (eventID, status),
+   KEY idx_rsvps_last_updated (lastUpdated)
 );
 
 -- Event Invitations
+-- The sender/recipient indexes back the two branches of the student inbox:
+-- keyset order (sentAt, invitationID) plus status, so a page and the
+-- per-status counts are read from the index alone.
 CREATE TABLE Event_Invitations (
    invitationID INT PRIMARY KEY AUTO_INCREMENT,
    eventID INT NOT NULL,
    senderStudentID INT NOT NULL,
    recipientStudentID INT NOT NULL,
    status ENUM('pending', 'accepted', 'declined') DEFAULT 'pending',
-   sentAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+   sentAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE,
    FOREIGN KEY (senderStudentID) REFERENCES Students(studentID) ON DELETE CASCADE,
-   FOREIGN KEY (recipientStudentID) REFERENCES Students(studentID) ON DELETE CASCADE
+   FOREIGN KEY (recipientStudentID) REFERENCES Students(studentID) ON DELETE CASCADE,
+   KEY idx_invitations_event_recipient (eventID, recipientStudentID),
+   KEY idx_invitations_sender (senderStudentID, sentAt, invitationID, status),
+   KEY idx_invitations_recipient (recipientStudentID, sentAt, invitationID, status)
 );
 
 -- Feedback Table
@@ -271,23 +476,29 @@ CREATE TABLE Venues (
    FOREIGN KEY (locationID) REFERENCES Locations(locationID) ON DELETE SET NULL
 );
 
--- Audit Logs Table
+-- Audit Logs Table (partitioned by month on timestamp)
 CREATE TABLE Audit_Logs (
-   logID INT PRIMARY KEY AUTO_INCREMENT,
+   logID INT NOT NULL AUTO_INCREMENT,
    userID INT,
    actionType VARCHAR(50) NOT NULL,
    entityType VARCHAR(50),
    entityID INT,
-   timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+   timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
    details TEXT,
    ipAddress VARCHAR(45),
    userAgent TEXT,
-   status VARCHAR(50)
+   status VARCHAR(50),
+   PRIMARY KEY (logID, timestamp),
+   KEY idx_auditlogs_action_timestamp (actionType, timestamp)
+)
+PARTITION BY RANGE COLUMNS (timestamp) (
+   PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+   PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
 -- Searches table
 CREATE TABLE Searches(
-    searchID int PRIMARY KEY,
+    searchID int PRIMARY KEY AUTO_INCREMENT,
     timestamp DATETIME,
     searchQuery VARCHAR(255),
     studentID int,
@@ -295,53 +506,112 @@ CREATE TABLE Searches(
 );
 
 -- Search Results Table
+-- One row per event: appearances and clicks accumulate across searches
 CREATE TABLE Search_Result(
-    resultID int PRIMARY KEY,
-    clicks int,
-    appearances int,
+    resultID int PRIMARY KEY AUTO_INCREMENT,
+    clicks int DEFAULT 0,
+    appearances int DEFAULT 0,
     eventID int,
-    FOREIGN KEY (eventID) REFERENCES Events(eventID)
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE,
+    UNIQUE KEY uq_search_result_event (eventID)
 );
 
 -- Searches-Search Results bridge table
 CREATE TABLE Searches_Search_Results(
     searchID int,
     resultID int,
-    FOREIGN KEY (searchID) REFERENCES Searches(searchID),
-    FOREIGN KEY (resultID) REFERENCES Search_Result(resultID)
+    FOREIGN KEY (searchID) REFERENCES Searches(searchID) ON DELETE CASCADE,
+    FOREIGN KEY (resultID) REFERENCES Search_Result(resultID) ON DELETE CASCADE
 );
 
--- Search Logs Table
+-- Search Logs Table (partitioned by month on timestamp, so no foreign key)
 CREATE TABLE Search_Logs (
-   searchLogID INT PRIMARY KEY AUTO_INCREMENT,
+   searchLogID INT NOT NULL AUTO_INCREMENT,
    studentID INT,
    searchQuery VARCHAR(255) NOT NULL,
    resultsCount INT DEFAULT 0,
-   timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-   FOREIGN KEY (studentID) REFERENCES Students(studentID) ON DELETE SET NULL
+   timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   PRIMARY KEY (searchLogID, timestamp),
+   KEY idx_searchlogs_student (studentID, timestamp)
+)
+PARTITION BY RANGE COLUMNS (timestamp) (
+   PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+   PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
--- System Metrics Table 
+-- System Metrics Table (partitioned by month on timestamp)
 CREATE TABLE System_Metrics (
-   metricID INT PRIMARY KEY AUTO_INCREMENT,
+   metricID INT NOT NULL AUTO_INCREMENT,
    metricName VARCHAR(100) NOT NULL,
    metricValue DECIMAL(10,2),
    metricUnit VARCHAR(50),
-   timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+   timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
    status VARCHAR(50),
    thresholdWarning DECIMAL(10,2),
-   thresholdCritical DECIMAL(10,2)
+   thresholdCritical DECIMAL(10,2),
+   PRIMARY KEY (metricID, timestamp),
+   KEY idx_metrics_name_timestamp (metricName, timestamp)
+)
+PARTITION BY RANGE COLUMNS (timestamp) (
+   PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+   PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- System Metrics Rollups Table
+-- Downsampled tiers of System_Metrics ('1m', '1h', '1d'), maintained by
+-- backend/admin/metrics_store.py. Raw samples stay in System_Metrics.
+CREATE TABLE System_Metrics_Rollups (
+   metricName VARCHAR(100) NOT NULL,
+   resolution ENUM('1m', '1h', '1d') NOT NULL,
+   bucketStart DATETIME NOT NULL,
+   sampleCount INT NOT NULL,
+   sumValue DECIMAL(16,2),
+   minMetricValue DECIMAL(10,2),
+   maxMetricValue DECIMAL(10,2),
+   PRIMARY KEY (metricName, resolution, bucketStart),
+   KEY idx_rollups_resolution_bucket (resolution, bucketStart)
 );
 
 -- System Alerts Table 
+-- alertKey identifies the condition (e.g. 'capacity:70000001'); openKey is
+-- only set while the alert is unresolved, so the unique key allows a single
+-- open alert per condition and any number of resolved ones.
 CREATE TABLE System_Alerts (
    alertID INT PRIMARY KEY AUTO_INCREMENT,
    alertType VARCHAR(50) NOT NULL,
+   alertKey VARCHAR(150),
+   eventID INT,
    severity ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
    message TEXT,
    triggeredAt DATETIME DEFAULT CURRENT_TIMESTAMP,
    resolved BOOLEAN DEFAULT FALSE,
-   resolvedAt DATETIME
+   resolvedAt DATETIME,
+   openKey VARCHAR(150) GENERATED ALWAYS AS (IF(resolved, NULL, alertKey)) STORED,
+   UNIQUE KEY uq_system_alerts_open (openKey),
+   KEY idx_system_alerts_type_resolved (alertType, resolved)
+);
+
+-- Alert Engine Watermarks
+-- Last row each alert rule has evaluated, so every run only reads new data.
+CREATE TABLE Alert_Watermarks (
+   source VARCHAR(50) PRIMARY KEY,
+   lastID BIGINT,
+   lastTimestamp DATETIME
+);
+
+-- Change Outbox
+-- Written in the same transaction as the change it describes when
+-- CHANGE_OUTBOX_ENABLED is set (backend/changes). Rows still undispatched
+-- after a crash or a full queue are re-published by the outbox relay.
+CREATE TABLE Change_Outbox (
+   changeID BIGINT PRIMARY KEY AUTO_INCREMENT,
+   entity VARCHAR(50) NOT NULL,
+   entityID VARCHAR(64),
+   operation ENUM('insert', 'update', 'delete') NOT NULL,
+   changedFields JSON,
+   occurredAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   dispatchedAt DATETIME,
+   KEY idx_change_outbox_pending (dispatchedAt, changeID)
 );
 
 -- Documentation Table